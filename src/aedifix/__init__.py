@@ -19,7 +19,7 @@ from .cmake import (
 from .main import basic_configure
 from .manager import ConfigurationManager
 from .package import MainPackage, Package
-from .util.argument_parser import ArgSpec, ConfigArgument
+from .util.argument_parser import ArgSpec, ConfigArgument, DeferredDefault
 
 __all__ = (
     "CMAKE_VARIABLE",
@@ -34,6 +34,7 @@ __all__ = (
     "CMaker",
     "ConfigArgument",
     "ConfigurationManager",
+    "DeferredDefault",
     "MainPackage",
     "Package",
     "__version__",
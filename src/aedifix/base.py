@@ -5,7 +5,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, ParamSpec, TypeVar
 
-from .logger import Logger
+from .logger import Logger, LogLevel
 
 if TYPE_CHECKING:
     from argparse import Namespace
@@ -98,14 +98,20 @@ class Configurable:
     def log(
         self,
         msg: str | list[str] | tuple[str, ...],
-        *,
+        *args: object,
+        level: LogLevel = LogLevel.INFO,
         tee: bool = False,
         caller_context: bool = True,
         keep: bool = False,
     ) -> None:
         r"""See `ConfigurationManager.log`."""
         return self.manager.log(
-            msg, tee=tee, caller_context=caller_context, keep=keep
+            msg,
+            *args,
+            level=level,
+            tee=tee,
+            caller_context=caller_context,
+            keep=keep,
         )
 
     @Logger.log_passthrough
@@ -141,10 +147,23 @@ class Configurable:
 
     @Logger.log_passthrough
     def log_execute_command(
-        self, command: Sequence[_T], *, live: bool = False
+        self,
+        command: Sequence[_T],
+        *,
+        live: bool = False,
+        outputs: Sequence[Path] = (),
     ) -> CompletedProcess[str]:
         r"""See `ConfigurationManager.log_execute_command`."""
-        return self.manager.log_execute_command(command, live=live)
+        return self.manager.log_execute_command(
+            command, live=live, outputs=outputs
+        )
+
+    @Logger.log_passthrough
+    def log_execute_probe(
+        self, command: Sequence[_T]
+    ) -> CompletedProcess[str]:
+        r"""See `ConfigurationManager.log_execute_probe`."""
+        return self.manager.log_execute_probe(command)
 
     def setup(self) -> None:
         r"""Setup a `Configurable` for later configuration. By default,
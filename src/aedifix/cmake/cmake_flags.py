@@ -3,13 +3,14 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
-import shutil
 from abc import ABC, abstractmethod
 from pathlib import Path
 from shlex import quote as shlex_quote
 from types import GeneratorType
 from typing import TYPE_CHECKING, Any, Final
 
+from ..util.path_index import which
+
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
@@ -377,7 +378,7 @@ class CMakeExecutable(CMakeFlagBase):
             if value.is_dir():
                 msg = f"Got a directory as an executable: {value}"
                 raise ValueError(msg)
-        elif valtmp := shutil.which(value):
+        elif valtmp := which(value):
             value = Path(valtmp)
         return value
 
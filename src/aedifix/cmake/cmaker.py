@@ -3,15 +3,32 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import copy
 import json
 import shlex
-from typing import TYPE_CHECKING, Any, TypedDict, TypeVar
-
-from ..util.exception import CMakeConfigureError, WrongOrderError
-from .cmake_flags import CMakeList
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Final, TypedDict, TypeVar
+
+from ..logger import LogLevel
+from ..timing_db import format_duration
+from ..util.exception import (
+    CMakeConfigureError,
+    UnsatisfiableConfigurationError,
+    WrongOrderError,
+)
+from ..util.utility import dest_to_flag, read_cmake_cache
+from ..util.write_if_changed import write_if_changed
+from .cmake_flags import CMakeExecutable, CMakeList, CMakePath
+from .rebuild_impact import RebuildImpact, estimate_rebuild
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import (
+        Callable,
+        Container,
+        Iterable,
+        Mapping,
+        Sequence,
+    )
     from pathlib import Path
 
     from ..manager import ConfigurationManager
@@ -20,6 +37,16 @@ if TYPE_CHECKING:
 
     _T = TypeVar("_T")
 
+# The span recording the CMake configuration, used to estimate its duration
+_SPAN_CATEGORY: Final = "cmake"
+_SPAN_NAME: Final = "configure"
+# The maximum number of commands kept in the command spec. Merging keeps a
+# single entry per variable or option, so this only bounds the commands left
+# over from previous configurations.
+_MAX_SPEC_COMMANDS: Final = 4096
+# Lists the cache entries defined by the last configuration
+_CACHE_VARIABLES_FILE: Final = "aedifix_cache_variables.txt"
+
 
 class CMakeCommandSpec(TypedDict):
     CMAKE_EXECUTABLE: str
@@ -29,12 +56,345 @@ class CMakeCommandSpec(TypedDict):
     CMAKE_COMMANDS: list[str]
 
 
+def _cmake_command_key(command: str) -> str:
+    # -DNAME[:TYPE]=VALUE and -UNAME share the key of the variable, so that the
+    # last definition (or removal) wins, whatever its type. Options with a
+    # value are keyed by the option, and everything else by itself.
+    if command.startswith(("-D", "-U")):
+        return "-D" + command[2:].partition("=")[0].partition(":")[0]
+    if command.startswith("--") and "=" in command:
+        return command.partition("=")[0]
+    return command
+
+
+def _join_cmake_commands(commands: Sequence[str]) -> list[str]:
+    # Turn '-D', 'FOO=1' into '-DFOO=1'
+    ret: list[str] = []
+    it = iter(commands)
+    for command in it:
+        if command in {"-D", "-U"}:
+            ret.append(command + next(it, ""))
+        else:
+            ret.append(command)
+    return ret
+
+
+def merge_cmake_commands(
+    old: Sequence[str], new: Sequence[str], max_size: int = _MAX_SPEC_COMMANDS
+) -> list[str]:
+    r"""Merge the CMake commands of a previous configuration with new ones.
+
+    Parameters
+    ----------
+    old : Sequence[str]
+        The previous commands.
+    new : Sequence[str]
+        The new commands.
+    max_size : int, optional
+        The maximum number of commands to return.
+
+    Returns
+    -------
+    merged : list[str]
+        The merged commands.
+
+    Notes
+    -----
+    Commands are keyed by the variable they define (or undefine), or the
+    option they set, and the last one wins. So ``-DFOO:STRING=1`` is replaced
+    by a later ``-DFOO:STRING=2``. The new commands are always kept, preceded
+    by those previous commands which they do not replace. If there are more
+    than `max_size`, the oldest of the latter are dropped.
+    """
+
+    def dedup(commands: Sequence[str], skip: Container[str]) -> list[str]:
+        ret: dict[str, str] = {}
+        for cmd in _join_cmake_commands(commands):
+            if (key := _cmake_command_key(cmd)) not in skip:
+                # Re-insert, so that the last one also comes last
+                ret.pop(key, None)
+                ret[key] = cmd
+        return list(ret.values())
+
+    new_cmds = dedup(new, ())
+    old_cmds = dedup(old, set(map(_cmake_command_key, new_cmds)))
+    num_old = max(min(len(old_cmds), max_size - len(new_cmds)), 0)
+    return old_cmds[len(old_cmds) - num_old :] + new_cmds
+
+
+def _unquote(value: str) -> str:
+    # Like CMake does for -D, strip one level of quotes
+    if len(value) > 1 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+
+def _cmake_quote(value: str) -> str:
+    for char in ("\\", '"', "$"):
+        value = value.replace(char, f"\\{char}")
+    return f'"{value}"'
+
+
+def _parse_definition(definition: str) -> tuple[str, str, str]:
+    # Split -DNAME:TYPE=VALUE into its name, type and (unquoted) value
+    if not definition.startswith("-D"):
+        msg = f"Not a cache definition: {definition!r}"
+        raise ValueError(msg)
+    name_type, _, value = definition[2:].partition("=")
+    name, _, var_type = name_type.partition(":")
+    return name, var_type or "STRING", _unquote(value)
+
+
+def make_initial_cache(
+    definitions: Sequence[str], export_vars_file: Path
+) -> str:
+    r"""Create a CMake initial-cache script, for use with ``cmake -C``.
+
+    Parameters
+    ----------
+    definitions : Sequence[str]
+        The cache definitions, in the form passed to ``cmake -D``, i.e.
+        ``-DNAME:TYPE=VALUE``.
+    export_vars_file : Path
+        The file listing the variables whose values CMake should export, one
+        per line. Read into ``AEDIFIX_EXPORT_VARIABLES`` by the script,
+        overriding any definition of it in `definitions`.
+
+    Returns
+    -------
+    script : str
+        The contents of the script.
+
+    Raises
+    ------
+    ValueError
+        If any of `definitions` is not a cache definition.
+
+    Notes
+    -----
+    Every entry is forced, so that, like with ``-D``, it replaces any
+    existing value in the cache.
+    """
+    lines = [
+        "# Generated by aedifix, do not edit. Any changes will be lost on the",
+        "# next configuration.",
+    ]
+    for definition in definitions:
+        name, var_type, value = _parse_definition(definition)
+        if name == "AEDIFIX_EXPORT_VARIABLES":
+            continue
+        lines.append(
+            f'set({name} {_cmake_quote(value)} CACHE {var_type} "" FORCE)'
+        )
+    lines.extend(
+        (
+            "file(STRINGS "
+            f"{_cmake_quote(str(export_vars_file))} _aedifix_export_vars)",
+            'set(AEDIFIX_EXPORT_VARIABLES "${_aedifix_export_vars}" CACHE '
+            'STRING "" FORCE)',
+            "unset(_aedifix_export_vars)",
+            "",
+        )
+    )
+    return "\n".join(lines)
+
+
+@dataclass(slots=True, frozen=True)
+class CMakeCacheDelta:
+    r"""The difference between the definitions of a configuration and an
+    existing CMake cache.
+    """
+
+    definitions: list[str]
+    """The definitions of the entries which are new or whose value changed,
+    i.e. those which must be passed to CMake."""
+
+    changed: dict[str, tuple[str | None, str]]
+    """The previous value (or None if new) and the new value of each of those
+    entries, by name."""
+
+    removed: list[str]
+    """The entries to remove from the cache."""
+
+    unchanged: int
+    """The number of definitions whose value is already in the cache."""
+
+    def summary(self) -> str:
+        r"""Summarize the changes for humans.
+
+        Returns
+        -------
+        summary : str
+            The names of the changed, new and removed entries.
+        """
+        new = [name for name, (old, _) in self.changed.items() if old is None]
+        changed = [name for name in self.changed if name not in new]
+        lines = [
+            f"{title}: {', '.join(names)}"
+            for title, names in (
+                ("Changed", changed),
+                ("New", new),
+                ("Removed", self.removed),
+            )
+            if names
+        ]
+        if not lines:
+            lines.append("No changes")
+        lines.append(f"({self.unchanged} unchanged, not passed to CMake)")
+        return "\n".join(lines)
+
+
+def diff_cmake_cache(
+    definitions: Sequence[str],
+    cache: Mapping[str, str],
+    owned: Iterable[str] = (),
+) -> CMakeCacheDelta:
+    r"""Compute the minimal changes to apply to an existing CMake cache.
+
+    Parameters
+    ----------
+    definitions : Sequence[str]
+        The cache definitions of the configuration, in the form passed to
+        ``cmake -D``. Later definitions of the same entry override earlier
+        ones, as they would on the command line.
+    cache : Mapping[str, str]
+        The values of the existing cache entries, by name, see
+        `read_cmake_cache()`.
+    owned : Iterable[str], ()
+        The entries defined by the previous configuration. Those no longer
+        defined are removed from the cache, so that CMake recomputes them.
+
+    Returns
+    -------
+    delta : CMakeCacheDelta
+        The changes.
+
+    Raises
+    ------
+    ValueError
+        If any of `definitions` is not a cache definition.
+
+    Notes
+    -----
+    Only the values are compared, since CMake keeps the type of existing
+    entries.
+    """
+    new: dict[str, tuple[str, str]] = {}
+    for definition in definitions:
+        name, _, value = _parse_definition(definition)
+        new.pop(name, None)
+        new[name] = (definition, value)
+
+    changed = {
+        name: (cache.get(name), value)
+        for name, (_, value) in new.items()
+        if cache.get(name) != value
+    }
+    return CMakeCacheDelta(
+        definitions=[new[name][0] for name in changed],
+        changed=changed,
+        removed=sorted(
+            {name for name in owned if name in cache and name not in new}
+        ),
+        unchanged=len(new) - len(changed),
+    )
+
+
 class CMaker:
-    __slots__ = ("_args",)
+    __slots__ = "_args", "_journal"
 
     def __init__(self) -> None:
         r"""Construct a CMaker."""
         self._args: dict[str, CMakeFlagBase] = {}
+        self._journal: (
+            list[tuple[Callable[..., Any], tuple[Any, ...]]] | None
+        ) = None
+
+    def fork(self) -> CMaker:
+        r"""Create a journaling copy of this CMaker.
+
+        Returns
+        -------
+        fork : CMaker
+            A copy of this CMaker which records every modification made to it,
+            so that they may later be applied to the original by `commit()`.
+
+        Notes
+        -----
+        This allows packages to be configured concurrently. Each package
+        modifies its own fork, and the forks are then committed in the same
+        order that the packages would have run serially. Since the
+        modifications (rather than their results) are replayed, the end result
+        is identical to the serial one, provided each package only reads
+        variables set by itself or its dependencies.
+        """
+        ret = CMaker()
+        ret._args = copy.deepcopy(self._args)
+        ret._journal = []
+        return ret
+
+    def commit(self, fork: CMaker) -> None:
+        r"""Apply the modifications made to a fork.
+
+        Parameters
+        ----------
+        fork : CMaker
+            The fork, previously created by `fork()`.
+
+        Raises
+        ------
+        ValueError
+            If `fork` is not a fork, or if one of the modifications conflicts
+            with the current state of this CMaker.
+        """
+        journal = fork._journal
+        if journal is None:
+            msg = f"{fork} is not a fork"
+            raise ValueError(msg)
+        for op, args in journal:
+            op(self, *args)
+        journal.clear()
+
+    def _record(self, op: Callable[..., Any], *args: Any) -> None:
+        if self._journal is not None:
+            self._journal.append((op, copy.deepcopy(args)))
+
+    def _register(self, var: CMakeFlagBase) -> bool:
+        name = var.name
+        if name not in self._args:
+            self._record(CMaker._register, var)
+            self._args[name] = var
+            return True
+
+        prev_reg = self._args[name]
+        if not isinstance(prev_reg, type(var)):
+            msg = (
+                f"Variable {name} already registered as kind "
+                f"{type(prev_reg)}, cannot overwrite it!"
+            )
+            raise ValueError(msg)  # noqa: TRY004
+        return False
+
+    def _set(self, name: str, value: object) -> None:
+        self._record(CMaker._set, name, value)
+        self._args[name].value = value
+
+    def _append(self, name: str, values: Sequence[object]) -> None:
+        self._record(CMaker._append, name, values)
+        cmake_var = self._args[name]
+        cur_values = cmake_var.value
+        # Need "was_none" since the getter/setter for cmake_var may perform a
+        # copy on assignment, so cmake_var.value = cur_values = [] wouldn't
+        # work, since cmake_var.value would not contain the same list object as
+        # cur_values.
+        if was_none := (cur_values is None):
+            cur_values = []
+        else:
+            assert isinstance(cur_values, list)
+
+        cur_values.extend(values)
+        if was_none:
+            cmake_var.value = cur_values
 
     def register_variable(
         self, manager: ConfigurationManager, var: CMakeFlagBase
@@ -55,20 +415,26 @@ class CMaker:
         """
         kind = type(var)
         name = var.name
-        manager.log(f"Trying to register {name} as kind {kind}")
-        if name not in self._args:
-            self._args[name] = var
-            manager.log(f"Successfully registered {name} as kind {kind}")
-            return
-
-        prev_reg = self._args[name]
-        if not isinstance(prev_reg, kind):
-            msg = (
-                f"Variable {name} already registered as kind "
-                f"{type(prev_reg)}, cannot overwrite it!"
+        manager.log(
+            "Trying to register %s as kind %s",
+            name,
+            kind,
+            level=LogLevel.DEBUG,
+        )
+        if self._register(var):
+            manager.log(
+                "Successfully registered %s as kind %s",
+                name,
+                kind,
+                level=LogLevel.DEBUG,
             )
-            raise ValueError(msg)  # noqa: TRY004
-        manager.log(f"{name} already registered as kind {kind}")
+            return
+        manager.log(
+            "%s already registered as kind %s",
+            name,
+            kind,
+            level=LogLevel.DEBUG,
+        )
 
     def _ensure_registered(self, name: str) -> None:
         if name not in self._args:
@@ -96,9 +462,13 @@ class CMaker:
         """
         self._ensure_registered(name)
         manager.log(
-            f"Setting value {name} to {value} (current: {self._args[name]})"
+            "Setting value %s to %s (current: %s)",
+            name,
+            value,
+            self._args[name],
+            level=LogLevel.DEBUG,
         )
-        self._args[name].value = value
+        self._set(name, value)
 
     def get_value(self, manager: ConfigurationManager, name: str) -> Any:
         r"""Get a CMake variable's value.
@@ -122,7 +492,7 @@ class CMaker:
         """
         self._ensure_registered(name)
         value = self._args[name].value
-        manager.log(f"Value for {name}: {value}")
+        manager.log("Value for %s: %s", name, value, level=LogLevel.DEBUG)
         return value
 
     def append_value(
@@ -147,9 +517,11 @@ class CMaker:
             If the CMake variable is not a list-type.
         """
         self._ensure_registered(name)
-        manager.log(f"Appending values {values} to {name}")
+        manager.log(
+            "Appending values %s to %s", values, name, level=LogLevel.DEBUG
+        )
         if not values:
-            manager.log("No values to append, bailing")
+            manager.log("No values to append, bailing", level=LogLevel.DEBUG)
             return
 
         cmake_var = self._args[name]
@@ -157,20 +529,35 @@ class CMaker:
             msg = f"Cannot append to {type(cmake_var)}"
             raise TypeError(msg)
         cur_values = cmake_var.value
-        # Need "was_none" since the getter/setter for cmake_var may perform a
-        # copy on assignment, so cmake_var.value = cur_values = [] wouldn't
-        # work, since cmake_var.value would not contain the same list object as
-        # cur_values.
-        if was_none := (cur_values is None):
-            cur_values = []
-        else:
-            assert isinstance(cur_values, list)
+        manager.log(
+            "Current values for %s: %s",
+            name,
+            [] if cur_values is None else cur_values,
+            level=LogLevel.DEBUG,
+        )
+        self._append(name, values)
+        manager.log(
+            "New values for %s: %s",
+            name,
+            cmake_var.value,
+            level=LogLevel.DEBUG,
+        )
 
-        manager.log(f"Current values for {name}: {cur_values}")
-        cur_values.extend(values)
-        manager.log(f"New values for {name}: {cur_values}")
-        if was_none:
-            cmake_var.value = cur_values
+    def toolchain_files(self) -> list[Path]:
+        r"""Get the files referred to by executable and path variables.
+
+        Returns
+        -------
+        files : list[Path]
+            The (existing) files, e.g. the compilers or the cmake executable.
+        """
+        ret = []
+        for arg in self._args.values():
+            if not isinstance(arg, (CMakeExecutable, CMakePath)):
+                continue
+            if (value := arg.value) is not None and value.is_file():
+                ret.append(value)
+        return ret
 
     def _canonical_args(self) -> dict[str, CMakeFlagBase]:
         ret = {}
@@ -187,21 +574,195 @@ class CMaker:
         cmd_spec: CMakeCommandSpec,
         cmd_file: Path,
     ) -> None:
-        if cmd_file.exists():
-            manager.log(f"Command file {cmd_file} already exists, loading it")
-            with cmd_file.open() as fd:
-                old_cmds = json.load(fd)["CMAKE_COMMANDS"]
-
+        try:
+            old_cmds = json.loads(cmd_file.read_text())["CMAKE_COMMANDS"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            manager.log(f"Ignoring unreadable command file {cmd_file}: {e}")
+        else:
+            manager.log(f"Command file {cmd_file} already exists, merging it")
             new_cmds = cmd_spec["CMAKE_COMMANDS"]
-            # De-deuplicate keys. Note this won't catch everything,
-            # i.e. --foo=1 --foo=2 won't get deduplicated, but at least the
-            # ordering is kept.
-            new_cmds[:] = list(dict.fromkeys(old_cmds + new_cmds))
-            manager.log(f"Merged and de-duplicated cmake commands: {new_cmds}")
+            new_cmds[:] = merge_cmake_commands(old_cmds, new_cmds)
+            manager.log(f"Merged cmake commands: {new_cmds}")
+
+        if write_if_changed(
+            cmd_file, json.dumps(cmd_spec, sort_keys=True, indent=4)
+        ):
+            manager.log(f"Saved configure command to {cmd_file}")
+        else:
+            manager.log(f"Configure command in {cmd_file} is unchanged")
+
+    @staticmethod
+    def _cmake_options(manager: ConfigurationManager) -> list[str]:
+        ret = ["--log-context", "--log-level=DEBUG"]
+        debug_value: DebugConfigureValue = (
+            manager.cl_args.debug_configure.value
+        )
+        ret.extend(debug_value.to_flags())
+        return ret
 
-        manager.log(f"Saving configure command to {cmd_file}")
-        with cmd_file.open("w") as fd:
-            json.dump(cmd_spec, fd, sort_keys=True, indent=4)
+    @staticmethod
+    def _cmake_definitions(
+        manager: ConfigurationManager,
+        args: Iterable[CMakeFlagBase],
+        export_vars: Sequence[str],
+        *,
+        quote: bool,
+    ) -> list[str]:
+        ret = [
+            "-DAEDIFIX:BOOL=ON",
+            f"-D{manager.project_arch_name}:STRING='{manager.project_arch}'",
+            f"-D{manager.project_dir_name}:PATH='{manager.project_dir}'",
+            f"-D{manager.project_name_upper}_CONFIGURE_OPTIONS:STRING="
+            f"{shlex.join(manager._orig_argv)}",  # noqa: SLF001
+            f"-DAEDIFIX_EXPORT_VARIABLES:STRING='{';'.join(export_vars)}'",
+            "-DAEDIFIX_EXPORT_CONFIG_PATH:FILEPATH="
+            f"'{manager.project_export_config_path}'",
+        ]
+        ret.extend(value.to_command_line(quote=quote) for value in args)
+        return ret
+
+    @staticmethod
+    def _write_initial_cache(
+        manager: ConfigurationManager,
+        build_dir: Path,
+        definitions: Sequence[str],
+        export_vars: Sequence[str],
+    ) -> Path:
+        export_vars_file = build_dir / "aedifix_export_variables.txt"
+        initial_cache = build_dir / "aedifix_initial_cache.cmake"
+        for path, content in (
+            (export_vars_file, "".join(f"{var}\n" for var in export_vars)),
+            (initial_cache, make_initial_cache(definitions, export_vars_file)),
+        ):
+            if write_if_changed(path, content):
+                manager.log(f"Wrote {path}")
+            else:
+                manager.log(f"{path} is unchanged, not rewriting it")
+        return initial_cache
+
+    @staticmethod
+    def _diff_cmake_cache(
+        manager: ConfigurationManager,
+        build_dir: Path,
+        definitions: Sequence[str],
+    ) -> tuple[CMakeCacheDelta, bool]:
+        cmake_cache = build_dir / "CMakeCache.txt"
+        try:
+            cache = read_cmake_cache(cmake_cache)
+        except FileNotFoundError:
+            manager.log(f"{cmake_cache} does not exist, defining everything")
+            cache = {}
+        except OSError as e:
+            manager.log(f"Ignoring unreadable {cmake_cache}: {e}")
+            cache = {}
+        try:
+            owned = (build_dir / _CACHE_VARIABLES_FILE).read_text().split()
+        except OSError:
+            owned = []
+
+        delta = diff_cmake_cache(definitions, cache, owned)
+        for name, (old, new) in delta.changed.items():
+            manager.log(f"Cache entry {name}: {old!r} -> {new!r}")
+        for name in delta.removed:
+            manager.log(f"Cache entry {name}: removed")
+        return delta, bool(cache)
+
+    @classmethod
+    def _apply_cmake_cache_delta(
+        cls,
+        manager: ConfigurationManager,
+        build_dir: Path,
+        delta: CMakeCacheDelta,
+        definitions: Sequence[str],
+        export_vars: Sequence[str],
+    ) -> list[str]:
+        # Record the entries defined by this configuration, so that those no
+        # longer defined by the next one can be removed. Entries created by
+        # CMake itself, or by the user, are never removed.
+        names = dict.fromkeys(_parse_definition(d)[0] for d in definitions)
+        write_if_changed(
+            build_dir / _CACHE_VARIABLES_FILE,
+            "".join(f"{name}\n" for name in names),
+        )
+        initial_cache = cls._write_initial_cache(
+            manager, build_dir, delta.definitions, export_vars
+        )
+        ret: list[str] = []
+        for name in delta.removed:
+            ret.extend(("-U", name))
+        ret.extend(("-C", str(initial_cache)))
+        return ret
+
+    @staticmethod
+    def _check_rebuild_impact(
+        manager: ConfigurationManager,
+        build_dir: Path,
+        delta: CMakeCacheDelta,
+        *,
+        reconfiguring: bool,
+    ) -> bool:
+        dry_run = manager.cl_args.dry_run.value
+        if not reconfiguring:
+            if dry_run:
+                manager.log_boxed(
+                    "There is no existing CMake cache, so this would be a "
+                    "fresh configuration, and everything would be built",
+                    title="Dry run",
+                )
+            return not dry_run
+
+        estimate = estimate_rebuild(
+            [*delta.changed, *delta.removed],
+            build_dir / "compile_commands.json",
+            inert={
+                manager.project_arch_name,
+                f"{manager.project_name_upper}_CONFIGURE_OPTIONS",
+            },
+        )
+        manager.log_boxed(
+            f"{delta.summary()}\n\nRebuild impact:\n{estimate.summary()}",
+            title="CMake cache changes" + (" (dry run)" if dry_run else ""),
+            align="left",
+        )
+        if dry_run:
+            return False
+        if estimate.impact < RebuildImpact.FULL or not estimate.built:
+            return True
+
+        force = manager.cl_args.force
+        if force.value:
+            manager.log(f"{dest_to_flag(force.name)} given, recompiling all")
+            return True
+        if manager.confirm(
+            f"This recompiles all {estimate.built} built translation units. "
+            "Continue?"
+        ):
+            return True
+        msg = (
+            "Not reconfiguring, since this would recompile all "
+            f"{estimate.built} built translation units. Re-run with "
+            f"{dest_to_flag(force.name)} to reconfigure anyway, or with "
+            f"{dest_to_flag(manager.cl_args.dry_run.name)} to only report "
+            "the changes"
+        )
+        raise UnsatisfiableConfigurationError(msg)
+
+    @staticmethod
+    def _merge_cmake_profile(
+        manager: ConfigurationManager, profile_path: Path, start: int, end: int
+    ) -> None:
+        try:
+            events = json.loads(profile_path.read_text())
+        except (OSError, ValueError) as e:
+            # CMake does not finish the file if it fails
+            manager.log(f"Failed to load CMake profile {profile_path}: {e}")
+            return
+        manager.log(f"Merging CMake profile {profile_path}")
+        manager.tracer.merge(
+            events, process_name="cmake", start=start, end=end
+        )
 
     def _load_cmake_export_conf(self, manager: ConfigurationManager) -> None:
         conf_path = manager.project_export_config_path
@@ -224,7 +785,7 @@ class CMaker:
         source_dir: Path,
         build_dir: Path,
         extra_argv: list[str] | None = None,
-    ) -> None:
+    ) -> bool:
         r"""Execute the CMake configuration.
 
         Parameters
@@ -239,8 +800,16 @@ class CMaker:
         extra_argv : list[str], optional
             Additional verbatim commands to pass to CMake.
 
+        Returns
+        -------
+        configured : bool
+            True if CMake was executed, False if this is a dry run.
+
         Raises
         ------
+        UnsatisfiableConfigurationError
+            If the changes would recompile the entire existing build, and the
+            user neither forced nor confirmed the reconfiguration.
         CMakeConfigureError
             If the CMake configuration fails.
         """
@@ -251,8 +820,6 @@ class CMaker:
         manager.log(f"Using source dir: {source_dir}")
         manager.log(f"Using build dir: {build_dir}")
         manager.log(f"Using extra commands: {extra_argv}")
-        if not build_dir.exists():
-            build_dir.mkdir(parents=True)
         args = self._canonical_args()
         cmake_exe = args.pop("CMAKE_COMMAND").value
         generator = args.pop("CMAKE_GENERATOR")
@@ -268,38 +835,17 @@ class CMaker:
             generator.value,
         ]
 
+        export_vars = [arg.name for arg in self._args.values()]
+
         def create_cmake_commands(*, quote: bool) -> list[str]:
             # These are the commands should go in the cmake_command.txt since
             # they are general for any invocation
-            ret = ["--log-context", "--log-level=DEBUG"]
-            debug_value: DebugConfigureValue = (
-                manager.cl_args.debug_configure.value
-            )
-            ret.extend(debug_value.to_flags())
+            ret = self._cmake_options(manager)
             ret.extend(
-                (
-                    "-DAEDIFIX:BOOL=ON",
-                    f"-D{manager.project_arch_name}:STRING"
-                    f"='{manager.project_arch}'",
-                    f"-D{manager.project_dir_name}:PATH="
-                    f"'{manager.project_dir}'",
-                    f"-D{manager.project_name_upper}_CONFIGURE_OPTIONS:STRING="
-                    f"{shlex.join(manager._orig_argv)}",  # noqa: SLF001
+                self._cmake_definitions(
+                    manager, args.values(), export_vars, quote=quote
                 )
             )
-            export_vars = ";".join(arg.name for arg in self._args.values())
-
-            ret.extend(
-                (
-                    f"-DAEDIFIX_EXPORT_VARIABLES:STRING='{export_vars}'",
-                    "-DAEDIFIX_EXPORT_CONFIG_PATH:FILEPATH="
-                    f"'{manager.project_export_config_path}'",
-                )
-            )
-
-            ret.extend(
-                value.to_command_line(quote=quote) for value in args.values()
-            )
 
             # mypy is confused? We massage extra_argv into a list above
             assert isinstance(extra_argv, list)
@@ -307,7 +853,42 @@ class CMaker:
 
             return ret
 
-        cmake_extra_command = create_cmake_commands(quote=False)
+        tracer = manager.tracer
+        profile_path = build_dir / "cmake_profile.json"
+        profile = manager.cl_args.profile_configure.value
+        if profile:
+            cmake_base_command.extend(
+                (
+                    "--profiling-format=google-trace",
+                    f"--profiling-output={profile_path}",
+                )
+            )
+
+        # Only the entries which differ from the existing cache are passed,
+        # so that small reconfigurations stay cheap
+        definitions = self._cmake_definitions(
+            manager, args.values(), export_vars, quote=False
+        )
+        delta, reconfiguring = self._diff_cmake_cache(
+            manager, build_dir, definitions
+        )
+        if not self._check_rebuild_impact(
+            manager, build_dir, delta, reconfiguring=reconfiguring
+        ):
+            return False
+
+        if not build_dir.exists():
+            build_dir.mkdir(parents=True)
+
+        # The user's extra arguments come last, so that they may override
+        # any of the definitions in the initial cache
+        cmake_extra_command = [
+            *self._cmake_options(manager),
+            *self._apply_cmake_cache_delta(
+                manager, build_dir, delta, definitions, export_vars
+            ),
+            *extra_argv,
+        ]
         cmake_command = list(
             map(str, cmake_base_command + cmake_extra_command)
         )
@@ -326,15 +907,35 @@ class CMaker:
             manager, cmd_spec, build_dir / "aedifix_cmake_command_spec.json"
         )
 
+        eta = manager.estimate_duration(_SPAN_CATEGORY, _SPAN_NAME)
         manager.log_boxed(
-            "This may take a few minutes",
+            "This may take a few minutes"
+            if eta is None
+            else "Based on previous runs, this should take about "
+            + format_duration(eta),
             title=f"Configuring {manager.project_name}",
         )
+        start = tracer.now()
         try:
-            manager.log_execute_command(cmake_command, live=True)
+            with tracer.span(_SPAN_NAME, category=_SPAN_CATEGORY):
+                manager.log_execute_command(
+                    cmake_command,
+                    live=True,
+                    outputs=(
+                        build_dir / "CMakeCache.txt",
+                        manager.project_export_config_path,
+                        profile_path,
+                    ),
+                )
         except Exception as e:
             msg = f"CMake failed to configure {manager.project_name}"
             raise CMakeConfigureError(msg) from e
+        finally:
+            if profile:
+                self._merge_cmake_profile(
+                    manager, profile_path, start, tracer.now()
+                )
 
         manager.log_divider(tee=True)
         self._load_cmake_export_conf(manager)
+        return True
@@ -0,0 +1,256 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Estimate how much of an existing build a reconfiguration would rebuild.
+
+Changes to the CMake cache are classified by the variable they touch. Some
+(e.g. ``CMAKE_CXX_FLAGS`` or ``CMAKE_BUILD_TYPE``) change the compile command
+of every translation unit, others (e.g. ``CMAKE_INSTALL_PREFIX``) none at
+all. The number of translation units already built is read from the
+``compile_commands.json`` of the build directory.
+"""
+
+from __future__ import annotations
+
+import re
+import json
+import shlex
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Container, Iterable
+
+
+class RebuildImpact(IntEnum):
+    r"""The effect of a change on an existing build, from least to most
+    expensive.
+    """
+
+    NONE = 0
+    RELINK = 1
+    UNKNOWN = 2
+    FULL = 3
+
+    def __str__(self) -> str:
+        return self.name.casefold()
+
+
+# Checked in order, the first match wins. Anything else is a project option,
+# whose effect is unknown.
+_IMPACTS: Final = tuple(
+    (re.compile(pattern), impact)
+    for pattern, impact in (
+        (r"CMAKE_INSTALL_\w+", RebuildImpact.NONE),
+        (r"CMAKE_EXPORT_COMPILE_COMMANDS", RebuildImpact.NONE),
+        (r"CMAKE_VERBOSE_MAKEFILE", RebuildImpact.NONE),
+        (r"CMAKE_MESSAGE_\w+", RebuildImpact.NONE),
+        (r"AEDIFIX(_\w+)?", RebuildImpact.NONE),
+        (
+            r"CMAKE_(EXE|SHARED|MODULE|STATIC)_LINKER_FLAGS(_\w+)?",
+            RebuildImpact.RELINK,
+        ),
+        (r"CMAKE_\w+_LINKER_LAUNCHER", RebuildImpact.RELINK),
+        (r"CMAKE_BUILD_TYPE", RebuildImpact.FULL),
+        (r"CMAKE_TOOLCHAIN_FILE", RebuildImpact.FULL),
+        (r"CMAKE_SYSROOT", RebuildImpact.FULL),
+        (r"CMAKE_OSX_\w+", RebuildImpact.FULL),
+        (r"CMAKE_POSITION_INDEPENDENT_CODE", RebuildImpact.FULL),
+        (r"CMAKE_INTERPROCEDURAL_OPTIMIZATION", RebuildImpact.FULL),
+        (r"CMAKE_\w+_COMPILER(_\w+)?", RebuildImpact.FULL),
+        (r"CMAKE_\w+_FLAGS(_\w+)?", RebuildImpact.FULL),
+        (r"CMAKE_\w+_STANDARD(_REQUIRED)?", RebuildImpact.FULL),
+        (r"CMAKE_\w+_EXTENSIONS", RebuildImpact.FULL),
+        (r"CMAKE_\w+_ARCHITECTURES", RebuildImpact.FULL),
+    )
+)
+
+
+def classify_variable(
+    name: str, *, inert: Container[str] = ()
+) -> RebuildImpact:
+    r"""Classify the effect of changing a cache variable.
+
+    Parameters
+    ----------
+    name : str
+        The name of the variable.
+    inert : Container[str], ()
+        Additional variables known not to affect the build, e.g. those
+        recording the configure options.
+
+    Returns
+    -------
+    impact : RebuildImpact
+        The effect of changing the variable.
+    """
+    if name in inert:
+        return RebuildImpact.NONE
+    for pattern, impact in _IMPACTS:
+        if pattern.fullmatch(name):
+            return impact
+    return RebuildImpact.UNKNOWN
+
+
+def _object_file(entry: dict[str, Any]) -> Path | None:
+    if (output := entry.get("output")) is None:
+        if (args := entry.get("arguments")) is None:
+            args = shlex.split(entry.get("command", ""))
+        for prev, arg in zip(["", *args], args, strict=False):
+            if prev == "-o":
+                output = arg
+                break
+            if arg.startswith("-o") and len(arg) > 2:  # noqa: PLR2004
+                output = arg[2:]
+                break
+        else:
+            return None
+    return Path(entry.get("directory", "."), output)
+
+
+def count_built_translation_units(
+    compile_commands: Path,
+) -> tuple[int, int] | None:
+    r"""Count the translation units already built in a build directory.
+
+    Parameters
+    ----------
+    compile_commands : Path
+        The ``compile_commands.json`` of the build directory.
+
+    Returns
+    -------
+    counts : tuple[int, int] | None
+        The number of translation units whose object file exists, and the
+        total number of translation units, or None if `compile_commands`
+        could not be read.
+
+    Notes
+    -----
+    Translation units whose object file cannot be determined are counted as
+    built.
+    """
+    try:
+        entries = json.loads(compile_commands.read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entries, list):
+        return None
+
+    built = 0
+    for entry in entries:
+        obj = _object_file(entry) if isinstance(entry, dict) else None
+        if obj is None or obj.exists():
+            built += 1
+    return built, len(entries)
+
+
+@dataclass(slots=True, frozen=True)
+class RebuildEstimate:
+    r"""The estimated effect of a reconfiguration on an existing build."""
+
+    impacts: dict[str, RebuildImpact]
+    """The effect of each changed (or removed) variable, by name."""
+
+    built: int | None
+    """The number of translation units already built, or None if unknown."""
+
+    total: int | None
+    """The total number of translation units, or None if unknown."""
+
+    @property
+    def impact(self) -> RebuildImpact:
+        r"""Get the overall effect of the reconfiguration.
+
+        Returns
+        -------
+        impact : RebuildImpact
+            The most expensive effect of any of the changes.
+        """
+        return max(self.impacts.values(), default=RebuildImpact.NONE)
+
+    @property
+    def rebuilt(self) -> int | None:
+        r"""Get the number of translation units which would be recompiled.
+
+        Returns
+        -------
+        rebuilt : int | None
+            The number of already built translation units which would be
+            recompiled, or None if unknown.
+        """
+        match self.impact:
+            case RebuildImpact.NONE | RebuildImpact.RELINK:
+                return 0
+            case RebuildImpact.FULL:
+                return self.built
+            case _:
+                return None
+
+    def summary(self) -> str:
+        r"""Summarize the estimate for humans.
+
+        Returns
+        -------
+        summary : str
+            The effect of each change, and the number of translation units
+            to recompile.
+        """
+        lines = [
+            f"{impact}: {', '.join(names)}"
+            for impact in sorted(RebuildImpact, reverse=True)
+            if (
+                names := [
+                    name
+                    for name, name_impact in self.impacts.items()
+                    if name_impact == impact
+                ]
+            )
+        ]
+        if self.built is None:
+            lines.append(
+                "Number of built translation units unknown (no "
+                "compile_commands.json)"
+            )
+        elif (rebuilt := self.rebuilt) is None:
+            lines.append(
+                f"Recompiles an unknown number of the {self.built} built "
+                f"(of {self.total}) translation units"
+            )
+        else:
+            lines.append(
+                f"Recompiles {rebuilt} of the {self.built} built (of "
+                f"{self.total}) translation units"
+            )
+        return "\n".join(lines)
+
+
+def estimate_rebuild(
+    changed: Iterable[str],
+    compile_commands: Path,
+    *,
+    inert: Container[str] = (),
+) -> RebuildEstimate:
+    r"""Estimate the effect of changing cache variables on an existing build.
+
+    Parameters
+    ----------
+    changed : Iterable[str]
+        The names of the changed, new or removed variables.
+    compile_commands : Path
+        The ``compile_commands.json`` of the build directory.
+    inert : Container[str], ()
+        Additional variables known not to affect the build, see
+        `classify_variable()`.
+
+    Returns
+    -------
+    estimate : RebuildEstimate
+        The estimate.
+    """
+    impacts = {name: classify_variable(name, inert=inert) for name in changed}
+    counts = count_built_translation_units(compile_commands)
+    built, total = (None, None) if counts is None else counts
+    return RebuildEstimate(impacts=impacts, built=built, total=total)
@@ -5,11 +5,11 @@ from __future__ import annotations
 
 import re
 import sys
-from typing import TYPE_CHECKING, Final
+from typing import TYPE_CHECKING
 
 from .base import Configurable
 from .util.exception import UnsatisfiableConfigurationError
-from .util.utility import cmake_configure_file
+from .util.utility import cmake_configure_file, read_cmake_cache
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -100,22 +100,7 @@ class ConfigFile(Configurable):
         list[str]
             A list of CMake command line arguments.
         """
-
-        def keep_line(line: str) -> bool:
-            line = line.strip()
-            if not line:
-                return False
-            return not line.startswith(("//", "#"))
-
-        cmake_variable_re: Final = re.compile(
-            r"(?P<name>[A-Za-z_0-9\-]+):(?P<type>[A-Z]+)\s*=\s*(?P<value>.*)"
-        )
-        with cmake_cache.open() as fd:
-            line_gen = (
-                cmake_variable_re.match(line.lstrip())
-                for line in filter(keep_line, fd)
-            )
-            return {m.group("name"): m.group("value") for m in line_gen if m}
+        return read_cmake_cache(cmake_cache)
 
     def _make_aedifix_substitutions(self, text: str) -> dict[str, str]:
         r"""Read the template file and find any aedifix-specific variable
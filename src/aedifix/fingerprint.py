@@ -0,0 +1,282 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import sys
+import json
+import hashlib
+import inspect
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, TypedDict
+
+from .base import Configurable
+from .util.utility import CMAKE_TEMPLATES_DIR
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from .manager import ConfigurationManager
+    from .package.main_package import MainPackage
+
+# Bump this whenever the set of inputs, or the way they are digested, changes
+# so that old fingerprints are never considered up to date.
+_FINGERPRINT_VERSION: Final = 1
+
+# Environment variables which routinely differ between otherwise identical
+# shell sessions, and which cannot affect the configuration.
+_ENV_IGNORE_PATTERNS: Final = (
+    "_",
+    "COLUMNS",
+    "DBUS_SESSION_BUS_ADDRESS",
+    "DISPLAY",
+    "GPG_TTY",
+    "HISTFILE",
+    "ITERM_*",
+    "KITTY_*",
+    "LINES",
+    "LS_COLORS",
+    "OLDPWD",
+    "PROMPT_COMMAND",
+    "PS1",
+    "PWD",
+    "PYTEST_*",
+    "SHLVL",
+    "SSH_*",
+    "STY",
+    "TERM_PROGRAM*",
+    "TERM_SESSION_ID",
+    "TMUX*",
+    "VSCODE_*",
+    "WINDOWID",
+    "XDG_RUNTIME_DIR",
+    "XDG_SESSION_*",
+)
+
+
+class FingerprintData(TypedDict):
+    VERSION: int
+    ARGV: list[str]
+    INPUTS: dict[str, str]
+    TOOLCHAIN: list[str]
+    OUTPUTS: list[str]
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class Fingerprint(Configurable):
+    r"""Records a digest of every input to a configuration, so that
+    reconfiguring with unchanged inputs can be skipped entirely.
+    """
+
+    __slots__ = "_environ", "_file", "_main_package_files"
+
+    def __init__(
+        self, manager: ConfigurationManager, main_package: MainPackage
+    ) -> None:
+        r"""Construct a Fingerprint.
+
+        Parameters
+        ----------
+        manager : ConfigurationManager
+            The configuration manager to manage this object.
+        main_package : MainPackage
+            The main package.
+
+        Notes
+        -----
+        The environment is snapshotted on construction, before the
+        configuration has a chance to modify it.
+        """
+        super().__init__(manager=manager)
+        self._file = self.project_arch_dir / "aedifix_fingerprint.json"
+        main_package_files = [main_package.project_configure_file_template]
+        if (src := inspect.getsourcefile(type(main_package))) is not None:
+            main_package_files.append(Path(src).resolve())
+        self._main_package_files = main_package_files
+        ignored = (self.project_arch_name, self.project_dir_name)
+        self._environ = {
+            key: value
+            for key, value in os.environ.items()
+            if key not in ignored
+            and not any(fnmatchcase(key, pat) for pat in _ENV_IGNORE_PATTERNS)
+        }
+
+    @property
+    def fingerprint_file(self) -> Path:
+        r"""Get the path to the fingerprint file.
+
+        Returns
+        -------
+        file : Path
+            The path to the fingerprint file.
+        """
+        return self._file
+
+    def _input_files(self) -> Iterator[Path]:
+        aedifix_dir = Path(__file__).resolve().parent
+        yield from sorted(aedifix_dir.rglob("*.py"))
+        yield from sorted(CMAKE_TEMPLATES_DIR.iterdir())
+        yield from self._main_package_files
+
+    @staticmethod
+    def _stat_digest(path: Path) -> str:
+        try:
+            st = path.stat()
+        except OSError:
+            return "<missing>"
+        return f"{st.st_size}:{st.st_mtime_ns}:{st.st_ino}"
+
+    def _compute_inputs(
+        self, argv: Sequence[str], toolchain: Iterable[str]
+    ) -> dict[str, str]:
+        inputs = {
+            "argv": _digest(json.dumps(list(argv)).encode()),
+            "python": _digest(f"{sys.executable}\n{sys.version}".encode()),
+        }
+        inputs.update(
+            (f"env:{key}", _digest(value.encode()))
+            for key, value in self._environ.items()
+        )
+        for path in self._input_files():
+            try:
+                inputs[f"file:{path}"] = _digest(path.read_bytes())
+            except OSError:
+                inputs[f"file:{path}"] = "<missing>"
+        # Toolchain binaries may be hundreds of MB, so these are tracked by
+        # their metadata rather than their contents.
+        inputs.update(
+            (f"tool:{path}", self._stat_digest(Path(path)))
+            for path in toolchain
+        )
+        return inputs
+
+    @staticmethod
+    def _describe(key: str) -> str:
+        kind, _, name = key.partition(":")
+        match kind:
+            case "argv":
+                return "command-line arguments"
+            case "python":
+                return "Python interpreter"
+            case "env":
+                return f"environment variable {name}"
+            case "file":
+                return f"file {name}"
+            case "tool":
+                return f"toolchain executable {name}"
+            case _:
+                return key
+
+    def _load(self) -> FingerprintData | None:
+        try:
+            data = json.loads(self.fingerprint_file.read_text())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict):
+            return None
+        if data.get("VERSION") != _FINGERPRINT_VERSION:
+            return None
+        return data  # type: ignore[return-value]
+
+    def recorded_digest(self) -> str | None:
+        r"""Get a digest of the recorded fingerprint.
+
+        Returns
+        -------
+        digest : str | None
+            A digest of all recorded inputs, or None if no fingerprint was
+            recorded.
+        """
+        if (data := self._load()) is None:
+            return None
+        return _digest(json.dumps(data["INPUTS"], sort_keys=True).encode())
+
+    def changed_inputs(self, argv: Sequence[str]) -> list[str]:
+        r"""Determine which inputs have changed since the fingerprint was
+        recorded.
+
+        Parameters
+        ----------
+        argv : Sequence[str]
+            The current command-line arguments.
+
+        Returns
+        -------
+        changed : list[str]
+            A description of each changed input. Empty if the previous
+            configuration is up to date.
+        """
+        if (old := self._load()) is None:
+            return ["no previous configuration fingerprint"]
+
+        missing = [
+            f"output {out} (missing)"
+            for out in old["OUTPUTS"]
+            if not Path(out).exists()
+        ]
+        old_inputs = old["INPUTS"]
+        new_inputs = self._compute_inputs(argv, old["TOOLCHAIN"])
+        changed = []
+        for key in sorted(old_inputs.keys() | new_inputs.keys()):
+            old_val = old_inputs.get(key)
+            new_val = new_inputs.get(key)
+            if old_val == new_val:
+                continue
+            desc = self._describe(key)
+            if old_val is None:
+                desc += " (added)"
+            elif new_val is None:
+                desc += " (removed)"
+            changed.append(desc)
+        return missing + changed
+
+    def invalidate(self) -> None:
+        r"""Remove any previously recorded fingerprint.
+
+        Notes
+        -----
+        This must be done before starting a (re-)configuration, so that a
+        failed run is never mistaken for an up-to-date one.
+        """
+        if self.fingerprint_file.exists():
+            self.log(f"Removing stale fingerprint {self.fingerprint_file}")
+            self.fingerprint_file.unlink()
+
+    def finalize(  # type: ignore[override]
+        self,
+        argv: Sequence[str],
+        toolchain: Iterable[Path],
+        outputs: Iterable[Path],
+    ) -> None:
+        r"""Record the fingerprint of a successful configuration.
+
+        Parameters
+        ----------
+        argv : Sequence[str]
+            The command-line arguments with which a reconfiguration would be
+            invoked.
+        toolchain : Iterable[Path]
+            The toolchain executables used by the configuration.
+        outputs : Iterable[Path]
+            The files generated by the configuration, all of which must exist
+            for it to be considered up to date.
+        """
+        tools = sorted({str(path) for path in toolchain})
+        data: FingerprintData = {
+            "VERSION": _FINGERPRINT_VERSION,
+            "ARGV": list(argv),
+            "INPUTS": self._compute_inputs(argv, tools),
+            "TOOLCHAIN": tools,
+            "OUTPUTS": sorted(str(path) for path in outputs),
+        }
+        self.log(
+            f"Writing configuration fingerprint to {self.fingerprint_file}"
+        )
+        self.fingerprint_file.write_text(
+            json.dumps(data, sort_keys=True, indent=4)
+        )
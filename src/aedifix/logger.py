@@ -5,50 +5,362 @@ from __future__ import annotations
 
 import os
 import sys
+import queue
 import shutil
 import logging
 import textwrap
+import functools
+import threading
+import contextlib
 from collections import deque
+from enum import IntEnum
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, ClassVar, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Concatenate,
+    Final,
+    ParamSpec,
+    Self,
+    TypeVar,
+)
+
+from .util.log_file import LogCompression, LogFileHandler, clone_file
 
-# This must be the ONLY place that rich is imported to ensure that this error
-# message is seen when running configure on a system where it is not yet
-# installed.
-try:
-    import rich  # noqa: F401
-except ModuleNotFoundError as mnfe:
-    msg = "Please run 'python3 -m pip install rich' to continue"
-    raise RuntimeError(msg) from mnfe
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Sequence
+
+    from rich.align import AlignMethod
+    from rich.console import (
+        Console,
+        ConsoleOptions,
+        RenderableType,
+        RenderResult,
+    )
+    from rich.live import Live
+    from rich.table import Table
 
-import contextlib
-from typing import Self
+HEADLESS_ENV_VAR: Final = "AEDIFIX_HEADLESS"
+# The maximum number of log records waiting to be written to disk. Once full,
+# logging blocks until the writer catches up.
+_LOG_QUEUE_SIZE: Final = 10_000
 
-from rich.align import Align, AlignMethod
-from rich.console import Console, RenderableType
-from rich.live import Live
-from rich.panel import Panel
-from rich.rule import Rule
-from rich.table import Table
+_T = TypeVar("_T")
+_P = ParamSpec("_P")
 
-if TYPE_CHECKING:
-    from collections.abc import Sequence
+LogBuffer = list[functools.partial[None]]
 
-_T = TypeVar("_T")
+
+class LogLevel(IntEnum):
+    DEBUG = logging.DEBUG
+    INFO = logging.INFO
+    WARNING = logging.WARNING
+    ERROR = logging.ERROR
+
+    def __str__(self) -> str:
+        return self.name.casefold()
+
+    @classmethod
+    def from_string(cls, str_val: str) -> LogLevel:
+        r"""Convert a string to a LogLevel.
+
+        Parameters
+        ----------
+        str_val : str
+            The name of the level, e.g. 'debug'. Case-insensitive.
+
+        Returns
+        -------
+        LogLevel
+            The log level.
+
+        Raises
+        ------
+        ValueError
+            If `str_val` does not name a log level.
+        """
+        try:
+            return cls[str_val.strip().upper()]
+        except KeyError as ke:
+            msg = f"Unknown log level: {str_val!r}"
+            raise ValueError(msg) from ke
+
+
+class _FileWriter:
+    r"""Writes messages to a logger from a background thread."""
+
+    __slots__ = "_logger", "_queue", "_thread"
+
+    def __init__(
+        self, logger: logging.Logger, max_pending: int = _LOG_QUEUE_SIZE
+    ) -> None:
+        r"""Construct a _FileWriter.
+
+        Parameters
+        ----------
+        logger : logging.Logger
+            The logger to which to write the messages.
+        max_pending : int, optional
+            The maximum number of messages waiting to be written. Once
+            reached, `submit()` blocks until the writer catches up.
+
+        Notes
+        -----
+        The writer thread is started on construction.
+        """
+        self._logger = logger
+        self._queue: queue.Queue[tuple[int, str] | None] = queue.Queue(
+            maxsize=max_pending
+        )
+        self._thread = threading.Thread(
+            target=self._run, name="aedifix-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        get = self._queue.get
+        task_done = self._queue.task_done
+        log = self._logger.log
+        while (item := get()) is not None:
+            log(*item)
+            task_done()
+        task_done()
+
+    def submit(self, level: int, message: str) -> None:
+        r"""Queue a message to be written.
+
+        Parameters
+        ----------
+        level : int
+            The level of the message.
+        message : str
+            The message.
+        """
+        self._queue.put((level, message))
+
+    def join(self) -> None:
+        r"""Wait for all queued messages to be written."""
+        self._queue.join()
+
+    def stop(self) -> None:
+        r"""Write all queued messages, and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+
+def _import_rich() -> None:
+    # This must be the ONLY place that rich is first imported to ensure that
+    # this error message is seen when running configure on a system where it
+    # is not yet installed. rich is only needed for interactive output, so it
+    # is not imported at all in headless mode.
+    try:
+        import rich  # noqa: F401
+    except ModuleNotFoundError as mnfe:
+        msg = "Please run 'python3 -m pip install rich' to continue"
+        raise RuntimeError(msg) from mnfe
+
+
+def _detect_headless() -> bool:
+    r"""Determine whether output should be headless.
+
+    Returns
+    -------
+    headless : bool
+        The value of ``$AEDIFIX_HEADLESS`` if it is set, otherwise True if
+        stdout is not a terminal.
+    """
+    if env_val := os.environ.get(HEADLESS_ENV_VAR, "").strip():
+        return env_val.casefold() not in {"0", "false", "f", "no", "n", "off"}
+    try:
+        return not sys.stdout.isatty()
+    except (AttributeError, ValueError):
+        # Closed, or replaced by something which is not a file
+        return True
+
+
+def _bufferable(
+    func: Callable[Concatenate[Logger, _P], None],
+) -> Callable[Concatenate[Logger, _P], None]:
+    r"""Make a Logger output method thread-safe and bufferable.
+
+    Parameters
+    ----------
+    func : Callable[Concatenate[Logger, P], None]
+        The method to wrap.
+
+    Returns
+    -------
+    wrapped : Callable[Concatenate[Logger, P], None]
+        The wrapped method. If the calling thread is inside a
+        `Logger.buffered()` block, the call is deferred to the buffer,
+        otherwise it is executed under the logger lock.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self: Logger, *args: _P.args, **kwargs: _P.kwargs) -> None:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is not None:
+            buffer.append(functools.partial(func, self, *args, **kwargs))
+            return
+        with self._lock:
+            func(self, *args, **kwargs)
+
+    return wrapper
+
+
+class LiveRows:
+    r"""The rows of live output.
+
+    Rows are appended (and evicted) in constant time, and the table displaying
+    them is only built when the rows are actually drawn. Drawing happens at
+    the refresh rate of the enclosing `Live`, no matter how quickly rows are
+    appended.
+    """
+
+    __slots__ = (
+        "_evictable",
+        "_lock",
+        "_max_rows",
+        "_next_id",
+        "_rows",
+        "_table",
+    )
+
+    def __init__(self, max_rows: int) -> None:
+        r"""Construct a LiveRows.
+
+        Parameters
+        ----------
+        max_rows : int
+            The maximum number of rows to keep.
+
+        Raises
+        ------
+        ValueError
+            If `max_rows` is not positive.
+        """
+        if max_rows <= 0:
+            msg = f"Maximum number of rows must be positive, have {max_rows}"
+            raise ValueError(msg)
+        self._max_rows = max_rows
+        # Keyed by sequence number. Dicts preserve insertion order, so
+        # iterating over this yields the rows in the order they were added.
+        self._rows: dict[int, tuple[RenderableType, bool]] = {}
+        # The sequence numbers of the non-persistent rows, oldest first
+        self._evictable: deque[int] = deque()
+        self._next_id = 0
+        self._table: Table | None = None
+        # The rows are drawn from the refresh thread of the Live
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def max_rows(self) -> int:
+        r"""Get the maximum number of rows.
+
+        Returns
+        -------
+        max_rows : int
+            The maximum number of rows kept.
+        """
+        return self._max_rows
+
+    def rows(self) -> list[tuple[RenderableType, bool]]:
+        r"""Get a snapshot of the current rows.
+
+        Returns
+        -------
+        rows : list[tuple[RenderableType, bool]]
+            The current rows, oldest first, along with whether each one is
+            persistent.
+        """
+        with self._lock:
+            return list(self._rows.values())
+
+    def append(self, mess: RenderableType, *, keep: bool) -> None:
+        r"""Append a row.
+
+        Parameters
+        ----------
+        mess : RenderableType
+            The message to append.
+        keep : bool
+            True if the message should persist, False otherwise. If the
+            rows are full, the oldest non-persistent row is evicted to make
+            room for the new one.
+
+        Raises
+        ------
+        ValueError
+            If the rows are full, and every row is persistent.
+        """
+        with self._lock:
+            if len(self._rows) >= self._max_rows:
+                if not self._evictable:
+                    msg = (
+                        "Could not prune row data, every entry was marked as "
+                        "persistent"
+                    )
+                    raise ValueError(msg)
+                del self._rows[self._evictable.popleft()]
+                # Tables cannot remove rows, so it is rebuilt on next draw
+                self._table = None
+            elif self._table is not None:
+                self._table.add_row(mess)
+            seq = self._next_id
+            self._next_id += 1
+            self._rows[seq] = (mess, keep)
+            if not keep:
+                self._evictable.append(seq)
+
+    def _make_table(self) -> Table:
+        from rich.table import Table
+
+        with self._lock:
+            if (table := self._table) is None:
+                table = Table.grid(expand=True)
+                table.highlight = True
+                for data, _ in self._rows.values():
+                    table.add_row(data)
+                self._table = table
+        return table
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        yield self._make_table()
 
 
 class Logger:
     __slots__ = (
         "_console",
+        "_file_handler",
         "_file_logger",
+        "_file_writer",
+        "_headless",
         "_live",
         "_live_raii",
-        "_row_data",
-        "_table",
+        "_local",
+        "_lock",
+        "_rows",
     )
     __unique_id: ClassVar = 0
 
-    def __init__(self, path: Path, max_live_lines: int = 40) -> None:
+    def __init__(  # noqa: PLR0913
+        self,
+        path: Path,
+        max_live_lines: int = 40,
+        *,
+        refresh_per_second: float = 10,
+        console: Console | None = None,
+        headless: bool | None = None,
+        file_level: LogLevel = LogLevel.INFO,
+        file_compression: LogCompression = LogCompression.NONE,
+        max_file_size: int | None = None,
+    ) -> None:
         r"""Construct a Logger.
 
         Parameters
@@ -57,6 +369,33 @@ class Logger:
             The path at which to create the on-disk log.
         max_live_lines : 40
             The maximum number of live output lines to keep.
+        refresh_per_second : 10
+            The maximum rate at which the live output is redrawn. Messages
+            arriving in between redraws are coalesced into the next one.
+        console : Console, optional
+            The console to which to print. Defaults to a new console.
+        headless : bool, optional
+            Whether to print plain text, rather than live output. Defaults to
+            the value of ``$AEDIFIX_HEADLESS`` if set, or True if stdout is not
+            a terminal.
+        file_level : LogLevel, LogLevel.INFO
+            The minimum level of messages written to the on-disk log.
+        file_compression : LogCompression, LogCompression.NONE
+            The compression of the on-disk log. The suffix of the compression
+            is appended to `path`.
+        max_file_size : int, optional
+            The maximum (uncompressed) size of the on-disk log, in bytes, see
+            `LogFileHandler`. Unlimited if not given.
+
+        Notes
+        -----
+        In headless mode, messages are printed to stdout line by line as they
+        arrive, and rich is never imported.
+
+        While the logger is active (i.e. inside a ``with logger:`` block),
+        messages are written to the on-disk log by a background thread. Use
+        `flush()` to wait for all pending messages to be written. Outside of
+        it, they are written synchronously.
         """
 
         def make_name(base_name: str) -> str:
@@ -73,48 +412,79 @@ class Logger:
                 Logger.__unique_id += 1
             return base_name
 
-        self._file_logger = self._create_logger(
-            make_name("file_configure"),
-            logging.FileHandler,
+        self._file_handler = LogFileHandler(
             path.resolve(),
-            mode="w",
-            delay=True,
-        )
-
-        self._row_data: deque[tuple[RenderableType, bool]] = deque(
-            maxlen=max_live_lines
+            compression=file_compression,
+            max_size=max_file_size,
         )
-        self._console = Console()
-        self._table = self._make_table(self._row_data)
-        self._live = Live(
-            self._table, console=self.console, auto_refresh=False
+        self._file_handler.setFormatter(logging.Formatter("%(message)s"))
+        self._file_writer: _FileWriter | None = None
+        self._file_logger = self._create_logger(
+            make_name("file_configure"), self._file_handler, file_level
         )
+
+        self._rows = LiveRows(max_live_lines)
+        self._headless = _detect_headless() if headless is None else headless
+        self._console = console
+        self._live: Live | None = None
+        if not self.headless:
+            _import_rich()
+            from rich.live import Live
+
+            self._live = Live(
+                self._rows,
+                console=self.console,
+                refresh_per_second=refresh_per_second,
+            )
         self._live_raii: Live | None = None
+        # Re-entrant, since the output methods call each other
+        self._lock = threading.RLock()
+        self._local = threading.local()
 
         orig_hook = sys.breakpointhook
 
         def bphook(*args: Any, **kwargs: Any) -> Any:
-            self._live.stop()
+            if self._live is not None:
+                self._live.stop()
             return orig_hook(*args, **kwargs)
 
         sys.breakpointhook = bphook
 
-    @staticmethod
-    def _make_table(row_data: deque[tuple[RenderableType, bool]]) -> Table:
-        table = Table.grid(expand=True)
-        table.highlight = True
-        for data, _ in row_data:
-            table.add_row(data)
-        return table
-
     def __enter__(self) -> Self:
-        self._live_raii = self._live.__enter__()
+        self._start_file_writer()
+        if self._live is not None:
+            self._live_raii = self._live.__enter__()
         return self
 
     def __exit__(self, *args: object) -> None:
         self.flush()
-        self._live.__exit__(*args)  # type: ignore[arg-type]
+        if self._live is not None:
+            self._live.__exit__(*args)  # type: ignore[arg-type]
         self._live_raii = None
+        self._stop_file_writer()
+
+    def _start_file_writer(self) -> None:
+        with self._lock:
+            if self._file_writer is None:
+                self._file_writer = _FileWriter(self._file_logger)
+
+    def _stop_file_writer(self) -> None:
+        with self._lock:
+            if self._file_writer is not None:
+                self._file_writer.stop()
+                self._file_writer = None
+
+    @property
+    def headless(self) -> bool:
+        r"""Get whether the logger prints plain text.
+
+        Returns
+        -------
+        headless : bool
+            True if messages are printed as plain lines, False if they are
+            printed as live output.
+        """
+        return self._headless
 
     @property
     def console(self) -> Console:
@@ -124,9 +494,32 @@ class Logger:
         -------
         Console
             The current active console.
+
+        Notes
+        -----
+        In headless mode, the console is only created (and rich imported) on
+        first access.
         """
+        if self._console is None:
+            _import_rich()
+            from rich.console import Console
+
+            self._console = Console()
         return self._console
 
+    @property
+    def width(self) -> int:
+        r"""Get the width of the output.
+
+        Returns
+        -------
+        width : int
+            The width, in characters, of the terminal.
+        """
+        if self.headless:
+            return shutil.get_terminal_size().columns
+        return self.console.width
+
     @property
     def file_path(self) -> Path:
         r"""Retrieve the path to the file handler log file.
@@ -137,10 +530,37 @@ class Logger:
             The path to the file handler log file, e.g.
             '/path/to/configure.log'.
         """
-        handlers = self._file_logger.handlers
-        assert len(handlers) == 1, f"Multiple file handlers: {handlers}"
-        assert isinstance(handlers[0], logging.FileHandler)
-        return Path(handlers[0].baseFilename)
+        return Path(self._file_handler.baseFilename)
+
+    @property
+    def file_level(self) -> LogLevel:
+        r"""Get the minimum level of messages written to the on-disk log.
+
+        Returns
+        -------
+        level : LogLevel
+            The minimum log level.
+        """
+        return LogLevel(self._file_logger.level)
+
+    @file_level.setter
+    def file_level(self, level: LogLevel) -> None:
+        self._file_logger.setLevel(level)
+
+    def is_enabled_for(self, level: LogLevel) -> bool:
+        r"""Determine whether a message would be written to the on-disk log.
+
+        Parameters
+        ----------
+        level : LogLevel
+            The level of the message.
+
+        Returns
+        -------
+        enabled : bool
+            True if messages of level `level` are written, False otherwise.
+        """
+        return self._file_logger.isEnabledFor(level)
 
     @staticmethod
     def log_passthrough(func: _T) -> _T:
@@ -194,14 +614,10 @@ class Logger:
 
     @staticmethod
     def _create_logger(
-        name: str, HandlerType: type, *args: Any, **kwargs: Any
+        name: str, handler: logging.Handler, level: LogLevel
     ) -> logging.Logger:
         logger = logging.getLogger(name)
-        logger.setLevel(logging.INFO)
-        handler = HandlerType(*args, **kwargs)
-        handler.setLevel(logger.level)
-        formatter = logging.Formatter("%(message)s")
-        handler.setFormatter(formatter)
+        logger.setLevel(level)
         logger.addHandler(handler)
         return logger
 
@@ -239,7 +655,7 @@ class Logger:
             The formatted multiline message.
         """
         if length is None:
-            length = self.console.width - 1
+            length = self.width - 1
 
         kwargs.setdefault("break_on_hyphens", False)
         kwargs.setdefault("break_long_words", False)
@@ -304,42 +720,125 @@ class Logger:
 
     def flush(self) -> None:
         r"""Flush any pending log writes to disk or screen."""
-        for handler in self._file_logger.handlers:
-            with contextlib.suppress(AttributeError):
-                handler.flush()
-        self._live.refresh()
+        with self._lock:
+            # Wait for the writer thread to handle every queued record
+            if self._file_writer is not None:
+                self._file_writer.join()
+            self._file_handler.flush()
+            if self._live is None:
+                sys.stdout.flush()
+            else:
+                self._live.refresh()
+
+    def confirm(self, question: str) -> bool:
+        r"""Ask the user a yes or no question.
 
-    def _append_live_message(
-        self, mess: RenderableType, *, keep: bool
+        Parameters
+        ----------
+        question : str
+            The question to ask.
+
+        Returns
+        -------
+        answer : bool
+            True if the user answered yes, False if they answered anything
+            else, or if stdin is not interactive.
+
+        Notes
+        -----
+        The live output is suspended while waiting for the answer.
+        """
+        if not sys.stdin.isatty():
+            return False
+        with self._lock:
+            self.flush()
+            live = self._live_raii
+            if live is not None:
+                live.stop()
+            try:
+                answer = input(f"{question} [y/N] ")
+            except EOFError:
+                answer = ""
+            finally:
+                if live is not None:
+                    live.start()
+        return answer.strip().casefold() in {"y", "yes"}
+
+    @contextlib.contextmanager
+    def buffered(self) -> Iterator[LogBuffer]:
+        r"""Buffer all output of the current thread.
+
+        Yields
+        ------
+        buffer : LogBuffer
+            The buffer to which all output produced by the current thread is
+            appended while inside the block.
+
+        Notes
+        -----
+        Other threads are unaffected. Use `replay()` to emit the buffered
+        output. This allows concurrently running tasks to each produce a
+        contiguous log, instead of interleaving their output.
+        """
+        local = self._local
+        prev = getattr(local, "buffer", None)
+        buffer: LogBuffer = []
+        local.buffer = buffer
+        try:
+            yield buffer
+        finally:
+            local.buffer = prev
+
+    def replay(self, buffer: LogBuffer) -> None:
+        r"""Emit previously buffered output.
+
+        Parameters
+        ----------
+        buffer : LogBuffer
+            The buffer, as produced by `buffered()`.
+        """
+        with self._lock:
+            for entry in buffer:
+                entry()
+        buffer.clear()
+
+    @staticmethod
+    def _log_plain(
+        mess: (
+            RenderableType | list[RenderableType] | tuple[RenderableType, ...]
+        ),
     ) -> None:
-        r"""Append a new message to the live data stream.
+        match mess:
+            case list() | tuple():
+                text = "".join(f"{m}\n" for m in mess)
+            case _:
+                text = f"{mess}\n"
+        # Looked up on every call, since stdout may have been redirected
+        sys.stdout.write(text)
+
+    def escape_markup(self, text: str) -> str:
+        r"""Escape any text which would otherwise be interpreted as console
+        markup.
 
         Parameters
         ----------
-        mess : RenderableType
-            The message to append.
-        keep : bool
-            True if the message should persist, False otherwise. If the
-            message persists, then appending new data (which might otherwise
-            bump the message off the queue) will instead bump the next
-            available message off.
+        text : str
+            The text to escape.
 
+        Returns
+        -------
+        escaped : str
+            The escaped text. In headless mode, no markup is interpreted, so
+            this is `text` unchanged.
         """
-        row_data = self._row_data
-        assert row_data.maxlen is not None  # mypy
-        if len(row_data) >= (row_data.maxlen - 1):
-            for idx, (_, data_keep) in enumerate(row_data):
-                if not data_keep:
-                    del row_data[idx]
-                    break
-            else:
-                msg = (
-                    "Could not prune row data, every entry was marked as "
-                    "persistent"
-                )
-                raise ValueError(msg)
-        row_data.append((mess, keep))
+        if self.headless:
+            return text
+
+        from rich.markup import escape
+
+        return escape(text)
 
+    @_bufferable
     def log_screen(
         self,
         mess: (
@@ -359,44 +858,66 @@ class Logger:
         keep : bool, False
             Whether to keep the message permanently in live output.
         """
+        if self._live is None:
+            self._log_plain(mess)
+            return
+
         if not self._live.is_started:
-            with self:
+            with self._live:
                 self.log_screen(mess, keep=keep)
             return
 
-        def do_log(message: RenderableType, *, keep: bool) -> None:
-            self._append_live_message(message, keep=keep)
-            self._table = self._make_table(self._row_data)
-            self._live.update(self._table, refresh=True)
-
+        # No need to refresh the live display, it periodically redraws itself
         match mess:
             case list() | tuple():
                 for m in mess:
-                    do_log(m, keep=keep)
+                    self._rows.append(m, keep=keep)
             case _:
-                do_log(mess, keep=keep)
+                self._rows.append(mess, keep=keep)
 
-    def log_file(self, message: str | Sequence[str]) -> None:
+    @_bufferable
+    def log_file(
+        self, message: str | Sequence[str], *, level: LogLevel = LogLevel.INFO
+    ) -> None:
         r"""Log a message to the log file.
 
         Parameters
         ----------
         message : str | Sequence[str]
             The message, or sequence of lines to log to file.
+        level : LogLevel, LogLevel.INFO
+            The level of the message. Messages below `file_level` are
+            discarded.
         """
+        if not self._file_logger.isEnabledFor(level):
+            return
         if not isinstance(message, str):
             message = "\n".join(message)
-        self._file_logger.log(self._file_logger.level, message)
+        if self._file_writer is None:
+            self._file_logger.log(level, message)
+        else:
+            self._file_writer.submit(level, message)
 
-    def _log_boxed_file(self, message: str, title: str) -> None:
+    def _log_boxed_file(
+        self, message: str, title: str, level: LogLevel
+    ) -> None:
         file_msg = self.build_multiline_message(title, message)
-        self.log_divider(tee=False)
-        self.log_file(file_msg)
-        self.log_divider(tee=False)
+        self.log_divider(tee=False, level=level)
+        self.log_file(file_msg, level=level)
+        self.log_divider(tee=False, level=level)
 
     def _log_boxed_screen(
         self, message: str, title: str, style: str, align: AlignMethod
     ) -> None:
+        if self.headless:
+            divider = "=" * (self.width - 1)
+            text = self.build_multiline_message(title, message)
+            self.log_screen((divider, text, divider))
+            return
+
+        from rich.align import Align
+        from rich.panel import Panel
+
         def fixup_title(title: str, style: str) -> str:
             if not title:
                 return title
@@ -415,6 +936,7 @@ class Logger:
         )
         self.log_screen(screen_message, keep=True)
 
+    @_bufferable
     def log_boxed(
         self,
         message: str,
@@ -422,6 +944,7 @@ class Logger:
         title: str = "",
         title_style: str = "",
         align: AlignMethod = "center",
+        level: LogLevel = LogLevel.INFO,
     ) -> None:
         r"""Log a message surrounded by a box.
 
@@ -435,10 +958,13 @@ class Logger:
             Optional additional styling for the title.
         align : AlignMethod, 'center'
             How to align the text.
+        level : LogLevel, LogLevel.INFO
+            The level of the message in the on-disk log.
         """
-        self._log_boxed_file(message, title)
+        self._log_boxed_file(message, title, level)
         self._log_boxed_screen(message, title, title_style, align)
 
+    @_bufferable
     def log_warning(self, message: str, *, title: str = "WARNING") -> None:
         r"""Log a warning to the log.
 
@@ -453,8 +979,10 @@ class Logger:
             message,
             title=f"***** {title.strip()} *****",
             title_style="bold yellow",
+            level=LogLevel.WARNING,
         )
 
+    @_bufferable
     def log_error(self, message: str, *, title: str = "WARNING") -> None:
         r"""Log a warning to the log.
 
@@ -469,9 +997,17 @@ class Logger:
             message,
             title=f"***** {title.strip()} *****",
             title_style="bold red",
+            level=LogLevel.ERROR,
         )
 
-    def log_divider(self, *, tee: bool = False, keep: bool = True) -> None:
+    @_bufferable
+    def log_divider(
+        self,
+        *,
+        tee: bool = False,
+        keep: bool = True,
+        level: LogLevel = LogLevel.INFO,
+    ) -> None:
         r"""Append a dividing line to the logs.
 
         Parameters
@@ -482,10 +1018,20 @@ class Logger:
         keep : bool, True
            If ``tee`` is True, whether to persist the message in terminal
            output.
+        level : LogLevel, LogLevel.INFO
+           The level of the divider in the on-disk log.
         """
-        self.log_file("=" * (self.console.width - 1))
-        if tee:
-            self.log_screen(Rule(), keep=keep)
+        divider = "=" * (self.width - 1)
+        self.log_file(divider, level=level)
+        if not tee:
+            return
+        if self.headless:
+            self.log_screen(divider)
+            return
+
+        from rich.rule import Rule
+
+        self.log_screen(Rule(), keep=keep)
 
     def copy_log(self, dest: Path) -> Path:
         r"""Copy the file log to another location.
@@ -493,13 +1039,26 @@ class Logger:
         Parameters
         ----------
         dest : Path
-            The destination to copy the log to.
+            The destination to copy the log to. The suffix of the log
+            compression is appended to it, if not already present.
 
         Returns
         -------
         dest : Path
             The destination path.
+
+        Notes
+        -----
+        The log is closed before copying, so that the copy is complete even
+        if it is compressed or size-capped. Later messages are appended to
+        the log as usual.
+
+        The copy shares its data with the log where possible, see
+        `clone_file()`.
         """
+        suffix = self._file_handler.compression.suffix
+        if not dest.name.endswith(suffix):
+            dest = dest.with_name(dest.name + suffix)
         dest = dest.resolve()
         src = self.file_path
         if src == dest:
@@ -509,4 +1068,5 @@ class Logger:
             return dest
         self.log_file(f"Copying file log from {src} to {dest}")
         self.flush()
-        return Path(shutil.copy2(src, dest))
+        self._file_handler.close()
+        return clone_file(src, dest)
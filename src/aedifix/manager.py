@@ -5,54 +5,81 @@ from __future__ import annotations
 
 import os
 import sys
+import json
 import time
+import shlex
 import shutil
 import inspect
+import sqlite3
 import platform
 import textwrap
+import threading
 from argparse import (
-    SUPPRESS as ARGPARSE_SUPPRESS,
     ArgumentDefaultsHelpFormatter,
     ArgumentParser,
     Namespace,
     RawDescriptionHelpFormatter,
 )
 from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from graphlib import TopologicalSorter
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Final, ParamSpec, TypeVar
+from subprocess import CompletedProcess
+from typing import TYPE_CHECKING, Any, Final, Literal, ParamSpec, TypeVar
 
 from .cmake.cmaker import CMaker
 from .config import ConfigFile
-from .logger import Logger
+from .fingerprint import Fingerprint
+from .logger import Logger, LogLevel
+from .package.main_package import (
+    DRY_RUN_FLAG,
+    FORCE_FLAG,
+    RECORD_COMMANDS_FLAG,
+    REPLAY_COMMANDS_FLAG,
+)
+from .probe_cache import ProbeCache
 from .reconfigure import Reconfigure
+from .timing_db import TimingDB
 from .util.argument_parser import ConfigArgument
 from .util.callables import classify_callable, get_calling_function
+from .util.cassette import Cassette
 from .util.cl_arg import CLArg
 from .util.exception import (
     CommandError,
     UnsatisfiableConfigurationError,
     WrongOrderError,
 )
+from .util.log_file import LogCompression
+from .util.path_index import which
+from .util.resource_usage import ResourceUsage, format_bytes
+from .util.trace import Tracer
 from .util.utility import (
     ValueProvenance,
     dest_to_flag,
     partition_argv,
+    prune_command_line_args,
     subprocess_capture_output_live,
+    subprocess_check_returncode,
 )
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterator, Sequence
-    from subprocess import CompletedProcess
+    from concurrent.futures import Future
 
     from .cmake.cmake_flags import CMakeFlagBase
-    from .logger import AlignMethod
+    from .logger import AlignMethod, LogBuffer
     from .package.main_package import MainPackage
     from .package.package import Package
 
 _P = ParamSpec("_P")
 _T = TypeVar("_T")
 
+_Phase = Literal["setup", "configure", "finalize"]
+
+# The number of trailing output lines of a live command kept in memory (for
+# error reporting). The full output is always written to the log file.
+_LIVE_COMMAND_TAIL_LINES: Final = 1000
+
 
 class ConfigurationManager:
     r"""The god-object for a particular configuration. Holds and manages all
@@ -62,18 +89,28 @@ class ConfigurationManager:
     __slots__ = (
         "_aedifix_root_dir",
         "_argv",
+        "_cassette",
         "_cl_args",
         "_cmaker",
+        "_command_usage",
         "_config",
+        "_dependencies",
+        "_dry_run",
         "_ephemeral_args",
         "_extra_argv",
+        "_fingerprint",
         "_logger",
         "_main_package",
         "_module_map",
         "_modules",
         "_orig_argv",
+        "_probe_cache",
+        "_profile_configure",
         "_reconfigure",
+        "_timing_db",
+        "_tls",
         "_topo_sorter",
+        "_tracer",
     )
 
     def __init__(
@@ -100,16 +137,69 @@ class ConfigurationManager:
         self._extra_argv = extra_argv
         self._main_package = main_package
         self._modules: list[Package] = [main_package]
-        self._logger = Logger(self.project_dir / "configure.log")
+        preparsed = main_package.preparse(argv)
+        self._logger = Logger(
+            self.project_dir / "configure.log",
+            headless=preparsed.headless,
+            file_level=preparsed.file_log_level,
+            file_compression=(
+                preparsed.log_compression or LogCompression.NONE
+            ),
+            max_file_size=preparsed.log_max_size,
+        )
+        self._tracer = Tracer()
+        self._profile_configure = bool(preparsed.profile_configure)
+        self._dry_run = bool(preparsed.dry_run)
+        # The timings of a dry run would skew the estimates of real ones
+        self._timing_db = (
+            None if preparsed.no_timing_db or self._dry_run else TimingDB()
+        )
+        # The (name, command line, usage) of each executed command
+        self._command_usage: list[tuple[str, str, ResourceUsage]] = []
         self._cmaker = CMaker()
         self._config = ConfigFile(
             manager=self,
             config_file_template=main_package.project_configure_file_template,
         )
         self._reconfigure = Reconfigure(manager=self)
+        self._probe_cache = ProbeCache(manager=self)
+        self._cassette = self._create_cassette(
+            record=preparsed.record_commands, replay=preparsed.replay_commands
+        )
+        if self._cassette is not None:
+            # Probes must be recorded, and replayed, like any other command
+            self._probe_cache.disable()
+        self._fingerprint = Fingerprint(
+            manager=self, main_package=main_package
+        )
         self._ephemeral_args: set[str] = set()
+        self._dependencies: dict[Package, set[Package]] = {}
+        self._tls = threading.local()
 
     # Private methods
+    def _create_cassette(
+        self, *, record: Path | None, replay: Path | None
+    ) -> Cassette | None:
+        if record is not None and replay is not None:
+            msg = (
+                f"{RECORD_COMMANDS_FLAG} and {REPLAY_COMMANDS_FLAG} are "
+                "mutually exclusive"
+            )
+            raise UnsatisfiableConfigurationError(msg)
+        if (path := record or replay) is None:
+            return None
+        # The command line is passed on to CMake, but whether it is recorded
+        # or replayed must not change the command.
+        argv = prune_command_line_args(
+            self._orig_argv, {RECORD_COMMANDS_FLAG, REPLAY_COMMANDS_FLAG}
+        )
+        return Cassette(
+            path.resolve(),
+            project_dir=self.project_dir,
+            replay=replay is not None,
+            normalize={shlex.join(self._orig_argv): shlex.join(argv)},
+        )
+
     def _setup_log(self) -> None:
         r"""Output just the ~bear necessities~."""
         self.log_boxed(
@@ -142,7 +232,7 @@ class ConfigurationManager:
         r"""Log information about the current commit and branch of the
         repository.
         """
-        git_exe = shutil.which("git")
+        git_exe = which("git")
         if git_exe is None:
             self.log(
                 "'git' command not found, likely not a development repository"
@@ -248,30 +338,22 @@ class ConfigurationManager:
             self.log("", tee=True, caller_context=False)  # to undo scrolling
 
         full_args = parser.parse_args(argv)
-        # Create a dummy parser which will determine whether a particular value
-        # was passed on the command line. This is done by re-adding all of the
-        # arguments in the parsed args, but making the default
-        # value "suppressed".
-        #
-        # If an arguments default is suppressed, then if that argument does NOT
-        # appear in the command line, then it is NOT added to the resultant
-        # namespace. Thus any argument that exists in both the full args and
-        # the suppressed args implies that argument was set by the user.
-        suppress_parser = ArgumentParser(
-            argument_default=ARGPARSE_SUPPRESS, add_help=False
-        )
-        for action in parser._actions:  # noqa: SLF001
-            suppress_parser.add_argument(
-                *action.option_strings, dest=action.dest, nargs="*"
-            )
-        cli_args, _ = suppress_parser.parse_known_args(argv)
+        # Determine whether a particular value was passed on the command line
+        # by matching the option strings of each argument against the flags
+        # found while pre-parsing, rather than tokenizing argv a second time.
+        flags = self._main_package.preparse(argv).flags
+        cl_set = {
+            action.dest
+            for action in parser._actions  # noqa: SLF001
+            if not flags.isdisjoint(action.option_strings)
+        }
 
         args = Namespace()
         for name, value in vars(full_args).items():
             setattr(
                 args,
                 name,
-                CLArg(name=name, value=value, cl_set=hasattr(cli_args, name)),
+                CLArg(name=name, value=value, cl_set=name in cl_set),
             )
         return args
 
@@ -318,6 +400,32 @@ class ConfigurationManager:
         )
         environ[dir_name] = str(dir_value)
 
+    def _setup_dry_run_arch_dir(self) -> None:
+        r"""Check the arch directory of a dry run.
+
+        Raises
+        ------
+        UnsatisfiableConfigurationError
+            If --with-clean was also given.
+
+        Notes
+        -----
+        A dry run only compares against the existing configuration (if any),
+        so it may neither overwrite it nor create a new one.
+        """
+        with_clean = self.cl_args.with_clean
+        if with_clean.value:
+            msg = (
+                f"{dest_to_flag(with_clean.name)} cannot be combined with "
+                f"{DRY_RUN_FLAG}, since it would delete the existing "
+                "configuration"
+            )
+            raise UnsatisfiableConfigurationError(msg)
+        self.log(
+            f"Dry run, leaving arch directory {self.project_arch_dir} "
+            "untouched"
+        )
+
     def _setup_arch_dir(self) -> None:
         r"""Ensure the creation and validity of the project arch directory.
 
@@ -328,6 +436,10 @@ class ConfigurationManager:
         """
         arch_dir = self.project_arch_dir
         proj_name = self.project_name
+        if self._dry_run:
+            self._setup_dry_run_arch_dir()
+            return
+
         with_clean = self.cl_args.with_clean
         with_clean_val = with_clean.value
         if with_clean_val:
@@ -348,7 +460,7 @@ class ConfigurationManager:
                 raise RuntimeError(msg)
             if not with_clean_val:
                 reconfigure_file = self._reconfigure.reconfigure_file
-                if Path(sys.argv[0]).resolve() == reconfigure_file:
+                if self._is_reconfigure_invocation():
                     # The user is following our advice below and reconfiguring,
                     # so it's OK if the arch already exists.
                     self.log("User is reconfiguring, so no need to error out")
@@ -415,6 +527,138 @@ class ConfigurationManager:
         arch_dir.mkdir(parents=True)
         self.log(f"Successfully setup arch directory: {arch_dir}")
 
+    def _is_reconfigure_invocation(self) -> bool:
+        r"""Determine whether the current run was launched via the reconfigure
+        script.
+
+        Returns
+        -------
+        reconfiguring : bool
+            True if the user is reconfiguring, False otherwise.
+        """
+        return (
+            Path(sys.argv[0]).resolve() == self._reconfigure.reconfigure_file
+        )
+
+    def _is_up_to_date(self) -> bool:
+        r"""Determine whether the current reconfiguration may be skipped.
+
+        Returns
+        -------
+        up_to_date : bool
+            True if none of the inputs of the previous configuration have
+            changed, False otherwise.
+
+        Notes
+        -----
+        Only reconfigurations are ever considered up to date. Ephemeral
+        arguments (e.g. --with-clean) never appear in the recorded
+        arguments, so passing any of them always forces a full run.
+        """
+        if not self._is_reconfigure_invocation():
+            return False
+
+        changed = self._fingerprint.changed_inputs(self._orig_argv)
+        if not changed:
+            return True
+
+        self.log(
+            "Reconfiguring because the following inputs changed:\n"
+            + "\n".join(f"- {desc}" for desc in changed),
+            tee=True,
+            caller_context=False,
+        )
+        return False
+
+    def _finalize_fingerprint(self) -> None:
+        r"""Record the fingerprint of the now successful configuration."""
+        argv = self._reconfigure.sanitized_argv(
+            self.argv, self._ephemeral_args, self._extra_argv
+        )
+        outputs = (
+            self.project_cmake_dir / "CMakeCache.txt",
+            self.project_export_config_path,
+            self._config.project_variables_file,
+            self._reconfigure.reconfigure_file,
+        )
+        self._fingerprint.finalize(
+            argv=argv,
+            toolchain=self._cmaker.toolchain_files(),
+            outputs=(out for out in outputs if out.exists()),
+        )
+
+    def _write_trace(self) -> None:
+        if not self._profile_configure:
+            return
+        if not self.project_arch_dir.is_dir():
+            # Failed before the arch dir was created (or a dry run did not
+            # create it)
+            return
+        if self._dry_run:
+            self.log("Dry run, not writing the configuration trace")
+            return
+        trace_path = self.project_arch_dir / "aedifix_trace.json"
+        self.log(f"Writing configuration trace to {trace_path}")
+        try:
+            self._tracer.write(trace_path)
+        except OSError as ose:
+            self.log(f"Failed to write configuration trace: {ose}")
+
+    def _write_cassette(self) -> None:
+        if self._cassette is None or self._cassette.replaying:
+            return
+        self.log(f"Writing command recording to {self._cassette.path}")
+        try:
+            self._cassette.write()
+        except OSError as ose:
+            self.log(f"Failed to write command recording: {ose}")
+
+    def _write_resource_usage(self) -> None:
+        if not (self._command_usage and self.project_arch_dir.is_dir()):
+            return
+        if self._dry_run:
+            # A dry run leaves the arch directory untouched
+            return
+        usage_path = self.project_arch_dir / "aedifix_resources.json"
+        self.log(f"Writing resource usage to {usage_path}")
+        usage = {
+            "commands": [
+                {"name": name, "command": command, **usage.to_dict()}
+                for name, command, usage in self._command_usage
+            ],
+            "total": ResourceUsage.total(
+                usage for _, _, usage in self._command_usage
+            ).to_dict(),
+        }
+        try:
+            usage_path.write_text(json.dumps(usage, indent=2))
+        except OSError as ose:
+            self.log(f"Failed to write resource usage: {ose}")
+
+    def _record_timings(
+        self, *, started: float, wall: float, success: bool
+    ) -> None:
+        if self._timing_db is None or self._cl_args is None:
+            # Disabled, or failed (or printed --help) before doing anything
+            return
+        try:
+            self._timing_db.record(
+                self.project_name,
+                self.project_arch,
+                argv=self._orig_argv,
+                fingerprint=self._fingerprint.recorded_digest(),
+                started=started,
+                wall=wall,
+                success=success,
+                spans=self._tracer.spans,
+            )
+        except (OSError, sqlite3.Error) as e:
+            self.log(
+                f"Failed to record timings in {self._timing_db.path}: {e}"
+            )
+            return
+        self.log(f"Recorded timings in {self._timing_db.path}")
+
     def _setup_dependencies(self) -> None:
         r"""Setup the package dependency tree.
 
@@ -436,6 +680,7 @@ class ConfigurationManager:
         self._topo_sorter = TopologicalSorter(
             {conf_obj: {} for conf_obj in self._modules}
         )
+        self._dependencies = {conf_obj: set() for conf_obj in self._modules}
 
         for conf_obj in self._modules:
             self.log_execute_func(conf_obj.declare_dependencies)
@@ -457,6 +702,107 @@ class ConfigurationManager:
 
         return self._modules[ret_idx]  # should should never fail
 
+    def _execute_module(
+        self, conf_obj: Package, phase: _Phase, cmaker: CMaker
+    ) -> tuple[LogBuffer, Exception | None]:
+        # Runs on a worker thread. All output is buffered, and all CMake
+        # variable modifications are made to the (forked) cmaker, so that
+        # _execute_modules_concurrently() can apply both in a deterministic
+        # order.
+        self._tls.cmaker = cmaker
+        exn = None
+        try:
+            with self._logger.buffered() as buffer:
+                try:
+                    self.log_execute_func(getattr(conf_obj, phase))
+                except Exception as e:
+                    exn = e
+        finally:
+            del self._tls.cmaker
+        return buffer, exn
+
+    def _execute_modules_concurrently(self, phase: _Phase, jobs: int) -> None:
+        r"""Execute a phase of all modules using a pool of threads.
+
+        Parameters
+        ----------
+        phase : _Phase
+            The phase to execute.
+        jobs : int
+            The maximum number of modules to execute at once.
+
+        Raises
+        ------
+        Exception
+            Any exception raised by a module.
+
+        Notes
+        -----
+        A module is started as soon as all of its dependencies have completed.
+        The results of each module (its log output and the CMake variables it
+        modified) are however always applied in the same order as the serial
+        execution, so that the final configuration is identical.
+        """
+        modules = self._modules
+        sorter = TopologicalSorter(self._dependencies)
+        sorter.prepare()
+        order = {conf_obj: idx for idx, conf_obj in enumerate(modules)}
+        running: dict[Future[tuple[LogBuffer, Exception | None]], Package] = {}
+        forks: dict[Package, CMaker] = {}
+        finished: dict[Package, tuple[LogBuffer, Exception | None]] = {}
+        next_idx = 0
+        with ThreadPoolExecutor(
+            max_workers=jobs, thread_name_prefix="aedifix"
+        ) as pool:
+            while next_idx < len(modules):
+                for conf_obj in sorted(
+                    sorter.get_ready(), key=order.__getitem__
+                ):
+                    # Must fork on this thread, while no other commits are in
+                    # flight.
+                    fork = forks[conf_obj] = self._cmaker.fork()
+                    fut = pool.submit(
+                        self._execute_module, conf_obj, phase, fork
+                    )
+                    running[fut] = conf_obj
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    finished[running.pop(fut)] = fut.result()
+
+                while next_idx < len(modules) and (
+                    result := finished.pop(modules[next_idx], None)
+                ):
+                    conf_obj = modules[next_idx]
+                    buffer, exn = result
+                    self._logger.replay(buffer)
+                    if exn is not None:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        raise exn
+                    self._cmaker.commit(forks.pop(conf_obj))
+                    sorter.done(conf_obj)
+                    next_idx += 1
+
+    def _execute_modules(self, phase: _Phase) -> None:
+        r"""Execute a phase of all modules.
+
+        Parameters
+        ----------
+        phase : _Phase
+            The phase to execute.
+        """
+        jobs = self.cl_args.configure_jobs.value
+        if jobs > 1 and len(self._modules) > 1:
+            self.log(
+                f"Executing {phase}() of {len(self._modules)} modules using "
+                f"{jobs} threads"
+            )
+            self._execute_modules_concurrently(phase, jobs)
+            return
+
+        for conf_obj in self._modules:
+            self.log_execute_func(getattr(conf_obj, phase))
+
     def _emit_summary(self) -> None:
         def gen_summary() -> Iterator[str]:
             summary = defaultdict(list)
@@ -466,6 +812,8 @@ class ConfigurationManager:
             for conf_obj in self._modules:
                 if ret := self.log_execute_func(conf_obj.summarize):
                     summary[conf_obj.name].append(ret)
+            if ret := self._summarize_resource_usage():
+                summary["Resource Usage"].append(ret)
 
             for val_list in summary.values():
                 yield from val_list
@@ -494,6 +842,40 @@ class ConfigurationManager:
             align="left",
         )
 
+    def _summarize_resource_usage(self) -> str:
+        r"""Summarize the resources used by the commands executed so far.
+
+        Returns
+        -------
+        summary : str
+            The summary, or an empty string if no commands were executed.
+        """
+        if not self._command_usage:
+            return ""
+
+        total = ResourceUsage.total(
+            usage for _, _, usage in self._command_usage
+        )
+        slowest, _, slowest_usage = max(
+            self._command_usage, key=lambda item: item[2].wall
+        )
+        lines: list[tuple[str, Any]] = [
+            ("Commands", len(self._command_usage)),
+            ("Wall time", f"{total.wall:.2f} s"),
+            ("CPU time", f"{total.user:.2f} s user, {total.system:.2f} s sys"),
+            ("Max RSS", format_bytes(total.max_rss)),
+        ]
+        if total.read_bytes is not None:
+            lines.append(("Read", format_bytes(total.read_bytes)))
+        if total.write_bytes is not None:
+            lines.append(("Written", format_bytes(total.write_bytes)))
+        lines.append(
+            ("Slowest command", f"{slowest} ({slowest_usage.wall:.2f} s)")
+        )
+        return self._main_package.create_package_summary(
+            lines, title="Resource Usage"
+        )
+
     def _collect_deps(self) -> set[type[Package]]:
         """Collect all transitive dependencies of the main package.
 
@@ -635,6 +1017,18 @@ class ConfigurationManager:
         """
         return self._main_package.project_dir_name
 
+    @property
+    def tracer(self) -> Tracer:
+        r"""Get the configuration tracer.
+
+        Returns
+        -------
+        tracer : Tracer
+            The tracer recording the timeline of the configuration. The
+            timeline is only written to disk if profiling was requested.
+        """
+        return self._tracer
+
     @property
     def project_arch_dir(self) -> Path:
         r"""Get the the current main project arch directory.
@@ -686,33 +1080,40 @@ class ConfigurationManager:
         return name
 
     # CMake variables
+    @property
+    def _active_cmaker(self) -> CMaker:
+        # When packages are executed concurrently, each one operates on its
+        # own fork of the CMaker, see _execute_modules().
+        return getattr(self._tls, "cmaker", self._cmaker)
+
     @Logger.log_passthrough
     def register_cmake_variable(self, var: CMakeFlagBase) -> None:
-        self._cmaker.register_variable(self, var)
+        self._active_cmaker.register_variable(self, var)
 
     @Logger.log_passthrough
     def set_cmake_variable(
         self, name: str | ConfigArgument, value: Any
     ) -> None:
-        self._cmaker.set_value(self, self._sanitize_name(name), value)
+        self._active_cmaker.set_value(self, self._sanitize_name(name), value)
 
     @Logger.log_passthrough
     def get_cmake_variable(self, name: str | ConfigArgument) -> Any:
-        return self._cmaker.get_value(self, self._sanitize_name(name))
+        return self._active_cmaker.get_value(self, self._sanitize_name(name))
 
     @Logger.log_passthrough
     def append_cmake_variable(
         self, name: str | ConfigArgument, flags: Sequence[str]
     ) -> Any:
-        return self._cmaker.append_value(
+        return self._active_cmaker.append_value(
             self, self._sanitize_name(name), flags
         )
 
     # Logging
-    def log(
+    def log(  # noqa: C901
         self,
         msg: str | list[str] | tuple[str, ...],
-        *,
+        *args: object,
+        level: LogLevel = LogLevel.INFO,
         tee: bool = False,
         caller_context: bool = True,
         keep: bool = False,
@@ -723,6 +1124,11 @@ class ConfigurationManager:
         ----------
         msg : str | list[str] | tuple[str, ...]
             The message(s) to append to the log.
+        *args : object
+            Arguments merged into `msg` using the % operator. Must be empty
+            unless `msg` is a str.
+        level : LogLevel, LogLevel.INFO
+            The level of the message.
         tee : bool, False
             If True, output is printed to screen in addition to being appended
             to the on-disk log file. If False, output is only written to disk.
@@ -731,28 +1137,51 @@ class ConfigurationManager:
             function to `mess`.
         keep : bool, False
             Whether to make the message persist in live output.
+
+        Raises
+        ------
+        TypeError
+            If `args` is not empty, and `msg` is not a str.
+
+        Notes
+        -----
+        If the message is not printed to screen, and its level is below the
+        verbosity of the on-disk log, this returns immediately. In particular,
+        `args` are never formatted, so expensive debug messages should pass
+        their arguments via `args` rather than formatting them up front.
         """
-        verbose_mess = msg
-        if caller_context:
-            try:
-                caller = get_calling_function()
-            except ValueError:
-                pass
-            else:
-                caller_name, _, _ = classify_callable(
-                    caller, fully_qualify=False
-                )
-                match msg:
-                    case str():
-                        verbose_mess = f"{caller_name}(): {msg}"
-                    case list() | tuple():
-                        verbose_mess = [
-                            f"{caller_name}(): {sub}" for sub in msg
-                        ]
-                    case _:
-                        raise TypeError(msg)
-
-        self._logger.log_file(verbose_mess)
+        to_file = self._logger.is_enabled_for(level)
+        if not (to_file or tee):
+            return
+
+        if args:
+            if not isinstance(msg, str):
+                err = "Formatting arguments require a str message"
+                raise TypeError(err)
+            msg %= args
+
+        if to_file:
+            verbose_mess = msg
+            if caller_context:
+                try:
+                    caller = get_calling_function()
+                except ValueError:
+                    pass
+                else:
+                    caller_name, _, _ = classify_callable(
+                        caller, fully_qualify=False
+                    )
+                    match msg:
+                        case str():
+                            verbose_mess = f"{caller_name}(): {msg}"
+                        case list() | tuple():
+                            verbose_mess = [
+                                f"{caller_name}(): {sub}" for sub in msg
+                            ]
+                        case _:
+                            raise TypeError(msg)
+
+            self._logger.log_file(verbose_mess, level=level)
         if tee:
             # See https://github.com/python/mypy/issues/18121 for why this
             # type-check is ignored
@@ -821,8 +1250,30 @@ class ConfigurationManager:
         """
         self._logger.log_error(message, title=title)
 
+    def confirm(self, question: str) -> bool:
+        r"""Ask the user a yes or no question.
+
+        Parameters
+        ----------
+        question : str
+            The question to ask.
+
+        Returns
+        -------
+        answer : bool
+            True if the user answered yes, False otherwise, or if the user
+            cannot be asked.
+        """
+        answer = self._logger.confirm(question)
+        self.log(f"{question} {'yes' if answer else 'no'}")
+        return answer
+
     def log_execute_command(
-        self, command: Sequence[_T], *, live: bool = False
+        self,
+        command: Sequence[_T],
+        *,
+        live: bool = False,
+        outputs: Sequence[Path] = (),
     ) -> CompletedProcess[str]:
         r"""Execute a system command and return the output.
 
@@ -832,7 +1283,12 @@ class ConfigurationManager:
             The command list to execute.
         live : bool, False
             Whether to output the live output to screen as well (it is always
-            updated continuously to the log file).
+            updated continuously to the log file). If True, only the tail of
+            the output is retained in the returned object.
+        outputs : Sequence[Path], optional
+            The files written by the command which are read back by the
+            configuration. Only used when recording or replaying commands,
+            see `Cassette`.
 
         Returns
         -------
@@ -843,13 +1299,20 @@ class ConfigurationManager:
         ------
         RuntimeError
             If the command returns a non-zero errorcode
+        ReplayError
+            If replaying commands, and the command was not recorded.
+
+        Notes
+        -----
+        The resources used by the command (see `ResourceUsage`) are logged,
+        summarized at the end of the configuration, and written to
+        ``aedifix_resources.json`` in the arch directory.
         """
-        from rich.markup import escape
 
         def callback(stdout: str, stderr: str) -> None:
             if stdout := stdout.strip():
                 if live:
-                    stdout = escape(stdout)
+                    stdout = self._logger.escape_markup(stdout)
                     lines = tuple(map(str.rstrip, stdout.splitlines()))
                     self.log(lines, caller_context=False, tee=True)
                 else:
@@ -857,11 +1320,27 @@ class ConfigurationManager:
             if stderr := stderr.strip():
                 self.log(f"STDERR:\n{stderr}", caller_context=False)
 
-        self.log(f"Executing command: {' '.join(map(str, command))}")
+        str_cmd = " ".join(map(str, command))
+        name = Path(str(command[0])).name
+        self.log(f"Executing command: {str_cmd}")
+        cassette = self._cassette
         try:
-            return subprocess_capture_output_live(
-                command, callback=callback, check=True
-            )
+            with self._tracer.span(
+                name, category="command", args={"command": str_cmd}
+            ) as span_args:
+                if cassette is not None and cassette.replaying:
+                    span_args["replayed"] = True
+                    ret = cassette.replay(command)
+                    callback(ret.stdout or "", ret.stderr or "")
+                else:
+                    ret = self._run_command(
+                        command,
+                        callback,
+                        live=live,
+                        outputs=outputs,
+                        span_args=span_args,
+                    )
+                return subprocess_check_returncode(ret)
         except CommandError as ce:
             self.log(ce.summary)
             raise
@@ -869,6 +1348,119 @@ class ConfigurationManager:
             self.log(str(e))
             raise
 
+    def _run_command(
+        self,
+        command: Sequence[_T],
+        callback: Callable[[str, str], None],
+        *,
+        live: bool,
+        outputs: Sequence[Path],
+        span_args: dict[str, Any],
+    ) -> CompletedProcess[str]:
+        str_cmd = " ".join(map(str, command))
+        name = Path(str(command[0])).name
+
+        def usage_callback(usage: ResourceUsage) -> None:
+            self.log(f"Resource usage: {usage}", caller_context=False)
+            span_args.update(usage.to_dict(), cpu=usage.cpu)
+            self._command_usage.append((name, str_cmd, usage))
+
+        if (cassette := self._cassette) is None:
+            return subprocess_capture_output_live(
+                command,
+                callback=callback,
+                check=False,
+                tail_lines=_LIVE_COMMAND_TAIL_LINES if live else None,
+                usage_callback=usage_callback,
+            )
+
+        # The returned object may only hold the tail of the output, so the
+        # full output is collected for the recording.
+        chunks: list[tuple[str, str]] = []
+
+        def record_callback(stdout: str, stderr: str) -> None:
+            chunks.append((stdout, stderr))
+            callback(stdout, stderr)
+
+        start = time.perf_counter()
+        ret = subprocess_capture_output_live(
+            command,
+            callback=record_callback,
+            check=False,
+            tail_lines=_LIVE_COMMAND_TAIL_LINES if live else None,
+            usage_callback=usage_callback,
+        )
+        cassette.record(
+            command,
+            CompletedProcess(
+                ret.args,
+                ret.returncode,
+                "".join(out for out, _ in chunks),
+                "".join(err for _, err in chunks),
+            ),
+            wall=time.perf_counter() - start,
+            outputs=outputs,
+        )
+        return ret
+
+    def log_execute_probe(
+        self, command: Sequence[_T]
+    ) -> CompletedProcess[str]:
+        r"""Execute a toolchain probe, caching its output across
+        configurations.
+
+        Parameters
+        ----------
+        command : Sequence[T]
+            The probe command to execute, for example
+            ``["cmake", "--version"]``.
+
+        Returns
+        -------
+        ret : CompletedProcess
+            The completed process object.
+
+        Raises
+        ------
+        CommandError
+            If the command returns a non-zero errorcode.
+
+        Notes
+        -----
+        The probe must be side-effect free, and its output must only depend
+        on the executable and the arguments. The cached output is reused for
+        as long as the executable is unchanged. See `ProbeCache` for further
+        details.
+        """
+        return self._probe_cache.run(command)
+
+    def estimate_duration(self, category: str, name: str) -> float | None:
+        r"""Estimate the time a part of the configuration will take, based
+        on previous runs.
+
+        Parameters
+        ----------
+        category : str
+            The category of the part, as recorded by the tracer.
+        name : str
+            The name of the part, as recorded by the tracer.
+
+        Returns
+        -------
+        estimate : float | None
+            The estimated time in seconds, or None if it cannot be
+            estimated.
+        """
+        if self._timing_db is None:
+            return None
+        try:
+            return self._timing_db.estimate(
+                self.project_name, self.project_arch, category, name
+            )
+        except (OSError, sqlite3.Error) as e:
+            self.log(f"Failed to estimate duration of {name}: {e}")
+            return None
+
     def log_execute_func(
         self, fn: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs
     ) -> _T:
@@ -914,7 +1506,12 @@ class ConfigurationManager:
         else:
             # for a newline
             self.log("\n", caller_context=False)
-        return fn(*args, **kwargs)
+        with self._tracer.span(
+            qual_name,
+            category="function",
+            args={"source": f"{qual_path}:{lineno}"},
+        ):
+            return fn(*args, **kwargs)
 
     # Meat and potatoes
     def require(self, package: Package, req_package: type[Package]) -> Package:
@@ -953,6 +1550,7 @@ class ConfigurationManager:
             raise RuntimeError(msg) from ae
 
         topo_sorter.add(package, ret)
+        self._dependencies[package].add(ret)
         return ret
 
     def add_ephemeral_arg(self, arg: str) -> None:
@@ -976,7 +1574,8 @@ class ConfigurationManager:
 
         Notes
         -----
-        This routine will also ensure the creation of the arch directory.
+        This routine will also ensure the creation of the arch directory,
+        unless this is a dry run.
         """
         self._setup_log()
         self.log_execute_func(self._log_git_info)
@@ -1000,29 +1599,30 @@ class ConfigurationManager:
         self.log_execute_func(self._setup_dependencies)
         self.log_execute_func(self._config.setup)
         self.log_execute_func(self._reconfigure.setup)
+        self.log_execute_func(self._probe_cache.setup)
 
-        for conf in self._modules:
-            self.log_execute_func(conf.setup)
+        self._execute_modules("setup")
 
     def configure(self) -> None:
         r"""Configure all collected modules."""
         self.log_execute_func(self._config.configure)
         self.log_execute_func(self._reconfigure.configure)
-        for conf in self._modules:
-            self.log_execute_func(conf.configure)
+        self._execute_modules("configure")
 
     def finalize(self) -> None:
         r"""Finalize the configuration and instantiate the CMake configure."""
-        for conf_obj in self._modules:
-            self.log_execute_func(conf_obj.finalize)
+        self._execute_modules("finalize")
 
-        self.log_execute_func(
+        configured = self.log_execute_func(
             self._cmaker.finalize,
             self,
             self.project_src_dir,
             self.project_cmake_dir,
             extra_argv=self._extra_argv,
         )
+        if not configured:
+            # A dry run, nothing else to do
+            return
 
         self.log_execute_func(self._config.finalize)
         self.log_execute_func(
@@ -1033,11 +1633,39 @@ class ConfigurationManager:
         )
         self.log_execute_func(self._main_package.post_finalize)
         self.log_execute_func(self._emit_summary)
+        self.log_execute_func(self._probe_cache.finalize)
+        self.log_execute_func(self._finalize_fingerprint)
         self._logger.copy_log(self.project_arch_dir / "configure.log")
 
     def main(self) -> None:
         r"""Perform the main loop of the configuration."""
         with self._logger:
-            self.setup()
-            self.configure()
-            self.finalize()
+            if self._is_up_to_date():
+                self.log(
+                    f"{self.project_name} configuration "
+                    f"{self.project_arch!r} is up to date, nothing to do. "
+                    f"Re-run with {FORCE_FLAG} to reconfigure anyway.",
+                    tee=True,
+                    caller_context=False,
+                )
+                return
+            if not self._dry_run:
+                # A dry run leaves the previous configuration untouched
+                self._fingerprint.invalidate()
+            started = time.time()
+            start = time.perf_counter()
+            success = False
+            try:
+                for phase in (self.setup, self.configure, self.finalize):
+                    with self._tracer.span(phase.__name__, category="phase"):
+                        phase()
+                success = True
+            finally:
+                self._write_trace()
+                self._write_resource_usage()
+                self._write_cassette()
+                self._record_timings(
+                    started=started,
+                    wall=time.perf_counter() - start,
+                    success=success,
+                )
@@ -5,14 +5,14 @@ from __future__ import annotations
 
 import os
 import shlex
-import shutil
 import platform
 import multiprocessing as mp
 from abc import ABC, abstractmethod
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
+from dataclasses import dataclass
 from enum import Enum, IntEnum
 from pathlib import Path
-from typing import TYPE_CHECKING, Final, Literal
+from typing import TYPE_CHECKING, Final, Literal, TypeVar
 
 from ..cmake.cmake_flags import (
     CMAKE_VARIABLE,
@@ -23,20 +23,26 @@ from ..cmake.cmake_flags import (
     CMakePath,
     CMakeString,
 )
-from ..util.argument_parser import ArgSpec, ConfigArgument
+from ..logger import HEADLESS_ENV_VAR, LogLevel
+from ..util.argument_parser import ArgSpec, ConfigArgument, DeferredDefault
+from ..util.log_file import LogCompression, parse_size
+from ..util.path_index import which
 from ..util.utility import (
     CMAKE_TEMPLATES_DIR,
     ValueProvenance,
     cmake_configure_file,
     flag_to_dest,
+    partition_argv,
 )
 from .package import Package
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable, Sequence
+    from collections.abc import Callable, Iterable, Sequence
 
     from ..manager import ConfigurationManager
 
+_T = TypeVar("_T")
+
 _DEFAULT_BUILD_TYPE: Final = os.environ.get(
     "CMAKE_BUILD_TYPE", "release"
 ).casefold()
@@ -110,7 +116,7 @@ def _guess_c_compiler() -> str | None:
     for env_guess in ("CC", "CMAKE_C_COMPILER"):
         if guess := os.environ.get(env_guess):
             return guess
-    if guess := shutil.which("cc"):
+    if guess := which("cc"):
         return guess
     return None
 
@@ -120,15 +126,38 @@ def _guess_cxx_compiler() -> str | None:
         if guess := os.environ.get(env_guess):
             return guess
     for ccguess in ("c++", "C++", "CC", "CXX", "cxx"):
-        if guess := shutil.which(ccguess):
+        if guess := which(ccguess):
             return guess
     return None
 
 
 WITH_CLEAN_FLAG: Final = "--with-clean"
 FORCE_FLAG: Final = "--force"
+DRY_RUN_FLAG: Final = "--dry-run"
 ON_ERROR_DEBUGGER_FLAG: Final = "--on-error-debugger"
 DEBUG_CONFIGURE_FLAG: Final = "--debug-configure"
+CONFIGURE_JOBS_FLAG: Final = "--configure-jobs"
+NO_PROBE_CACHE_FLAG: Final = "--no-probe-cache"
+NO_TIMING_DB_FLAG: Final = "--no-timing-db"
+HEADLESS_FLAG: Final = "--headless"
+LOG_LEVEL_FLAG: Final = "--log-level"
+LOG_COMPRESSION_FLAG: Final = "--log-compression"
+LOG_MAX_SIZE_FLAG: Final = "--log-max-size"
+PROFILE_CONFIGURE_FLAG: Final = "--profile-configure"
+RECORD_COMMANDS_FLAG: Final = "--record-commands"
+REPLAY_COMMANDS_FLAG: Final = "--replay-commands"
+
+
+def _lenient(convert: Callable[[str], _T]) -> Callable[[str], _T | None]:
+    # Invalid values are reported by the full parse, which knows how to
+    # produce a proper error message. Pre-parsing must not fail on them.
+    def wrapper(value: str) -> _T | None:
+        try:
+            return convert(value)
+        except (ArgumentTypeError, ValueError):
+            return None
+
+    return wrapper
 
 
 def _detect_num_cpus() -> int:
@@ -199,6 +228,79 @@ class DebugConfigureValue(IntEnum):
         return [f for f in raw_flags if f]  # Need to weed out NONE
 
 
+@dataclass(slots=True, frozen=True)
+class PreparsedArgs:
+    r"""The values needed before the full command line can be parsed."""
+
+    argv: tuple[str, ...]
+    """The command line from which the values were parsed, up to (but not
+    including) any '--'."""
+
+    flags: frozenset[str]
+    """Every option string appearing in argv."""
+
+    arch: str | None
+    """The arch value, or None if neither passed nor set in the environment."""
+
+    arch_provenance: ValueProvenance
+    """Where the arch value came from."""
+
+    with_python: bool | None
+    """The value of --with-python, or None if not passed."""
+
+    with_cuda: bool | None
+    """The value of --with-cuda, or None if not passed."""
+
+    headless: bool | None
+    """The value of --headless, or None if not passed."""
+
+    debug_configure: DebugConfigureValue | None
+    """The value of --debug-configure, or None if not passed."""
+
+    log_level: LogLevel | None
+    """The value of --log-level, or None if not passed."""
+
+    log_compression: LogCompression | None
+    """The value of --log-compression, or None if not passed."""
+
+    log_max_size: int | None
+    """The value of --log-max-size, or None if not passed."""
+
+    profile_configure: bool | None
+    """The value of --profile-configure, or None if not passed."""
+
+    no_timing_db: bool | None
+    """The value of --no-timing-db, or None if not passed."""
+
+    dry_run: bool | None
+    """The value of --dry-run, or None if not passed."""
+
+    record_commands: Path | None
+    """The value of --record-commands, or None if not passed."""
+
+    replay_commands: Path | None
+    """The value of --replay-commands, or None if not passed."""
+
+    build_type: str | None
+    """The build type, or None if neither passed nor set in the environment."""
+
+    @property
+    def file_log_level(self) -> LogLevel:
+        r"""Get the minimum level of messages to write to the configure log.
+
+        Returns
+        -------
+        level : LogLevel
+            The value of --log-level if passed, otherwise the debug level if
+            --debug-configure was passed, otherwise the info level.
+        """
+        if self.log_level is not None:
+            return self.log_level
+        if self.debug_configure:
+            return LogLevel.DEBUG
+        return LogLevel.INFO
+
+
 class MainPackage(Package, ABC):
     DEBUG_CONFIGURE: Final = ConfigArgument(
         name=DEBUG_CONFIGURE_FLAG,
@@ -251,13 +353,171 @@ class MainPackage(Package, ABC):
         ),
         ephemeral=True,
     )
+    DRY_RUN: Final = ConfigArgument(
+        name=DRY_RUN_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(DRY_RUN_FLAG),
+            type=bool,
+            help=(
+                "Report the changes a reconfiguration would make to the "
+                "existing CMake cache, and how much of the existing build "
+                "they would recompile, without running CMake or modifying "
+                "the configuration"
+            ),
+        ),
+        ephemeral=True,
+    )
+    NO_PROBE_CACHE: Final = ConfigArgument(
+        name=NO_PROBE_CACHE_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(NO_PROBE_CACHE_FLAG),
+            type=bool,
+            help=(
+                "Do not use the persistent cache of toolchain probe results, "
+                "and always re-run all probes"
+            ),
+        ),
+        ephemeral=True,
+    )
+    NO_TIMING_DB: Final = ConfigArgument(
+        name=NO_TIMING_DB_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(NO_TIMING_DB_FLAG),
+            type=bool,
+            help=(
+                "Do not record the timings of this configuration in the "
+                "persistent timing database (see aedifix-timings), and do "
+                "not estimate durations from previous runs"
+            ),
+        ),
+        ephemeral=True,
+    )
+    HEADLESS: Final = ConfigArgument(
+        name=HEADLESS_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(HEADLESS_FLAG),
+            type=bool,
+            help=(
+                "Print plain text output instead of live output. Defaults to "
+                f"the value of ${HEADLESS_ENV_VAR} if set, or true if stdout "
+                "is not a terminal"
+            ),
+        ),
+        ephemeral=True,
+    )
+    LOG_LEVEL: Final = ConfigArgument(
+        name=LOG_LEVEL_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(LOG_LEVEL_FLAG),
+            type=LogLevel.from_string,
+            choices=tuple(LogLevel),
+            help=(
+                "The minimum level of messages written to the configure log. "
+                f"Defaults to '{LogLevel.DEBUG}' if {DEBUG_CONFIGURE_FLAG} is "
+                f"given, and '{LogLevel.INFO}' otherwise"
+            ),
+        ),
+        ephemeral=True,
+    )
+    LOG_COMPRESSION: Final = ConfigArgument(
+        name=LOG_COMPRESSION_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(LOG_COMPRESSION_FLAG),
+            type=LogCompression.from_string,
+            choices=tuple(LogCompression),
+            default=LogCompression.NONE,
+            help=(
+                "Compress the configure log as it is written. Useful with "
+                f"high {DEBUG_CONFIGURE_FLAG} levels, which can produce "
+                "very large logs"
+            ),
+        ),
+        ephemeral=True,
+    )
+    LOG_MAX_SIZE: Final = ConfigArgument(
+        name=LOG_MAX_SIZE_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(LOG_MAX_SIZE_FLAG),
+            type=parse_size,
+            metavar="SIZE",
+            help=(
+                "The maximum (uncompressed) size of the configure log, e.g. "
+                "'512M'. Once reached, only the first and last parts of the "
+                "log are kept"
+            ),
+        ),
+        ephemeral=True,
+    )
+    PROFILE_CONFIGURE: Final = ConfigArgument(
+        name=PROFILE_CONFIGURE_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(PROFILE_CONFIGURE_FLAG),
+            type=bool,
+            help=(
+                "Record a timeline of the configuration, including CMake's "
+                "own profiling data, and write it to aedifix_trace.json in "
+                "the arch directory. The timeline can be viewed in "
+                "chrome://tracing or https://ui.perfetto.dev"
+            ),
+        ),
+        ephemeral=True,
+    )
+    RECORD_COMMANDS: Final = ConfigArgument(
+        name=RECORD_COMMANDS_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(RECORD_COMMANDS_FLAG),
+            type=Path,
+            metavar="PATH",
+            help=(
+                "Record the command line, environment, output, return code "
+                "and timing of every command executed during configuration "
+                "to PATH, for later use with "
+                f"{REPLAY_COMMANDS_FLAG}. Disables the probe cache"
+            ),
+        ),
+        ephemeral=True,
+    )
+    REPLAY_COMMANDS: Final = ConfigArgument(
+        name=REPLAY_COMMANDS_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(REPLAY_COMMANDS_FLAG),
+            type=Path,
+            metavar="PATH",
+            help=(
+                "Serve the results of the commands executed during "
+                f"configuration from a recording made with "
+                f"{RECORD_COMMANDS_FLAG}, instead of executing them. Fails if "
+                "a command was not recorded. Disables the probe cache"
+            ),
+        ),
+        ephemeral=True,
+    )
+    CONFIGURE_JOBS: Final = ConfigArgument(
+        name=CONFIGURE_JOBS_FLAG,
+        spec=ArgSpec(
+            dest=flag_to_dest(CONFIGURE_JOBS_FLAG),
+            type=int,
+            nargs="?",
+            default=1,
+            const=DeferredDefault(_detect_num_cpus),
+            help=(
+                "Number of packages to configure concurrently. Packages are "
+                "only ever configured after all of their dependencies. The "
+                "resulting configuration is identical regardless of the "
+                "number of jobs. If given without a value, uses one less "
+                "than the number of CPUs (or $CMAKE_BUILD_PARALLEL_LEVEL, if "
+                "set)"
+            ),
+        ),
+        ephemeral=True,
+    )
     CMAKE_BUILD_PARALLEL_LEVEL: Final = ConfigArgument(
         name="--num-threads",
         spec=ArgSpec(
             dest="num_threads",
             type=int,
             nargs="?",
-            default=_detect_num_cpus(),
+            default=DeferredDefault(_detect_num_cpus),
             help="Number of threads with which to compile",
         ),
         cmake_var=CMAKE_VARIABLE("CMAKE_BUILD_PARALLEL_LEVEL", CMakeInt),
@@ -287,7 +547,7 @@ class MainPackage(Package, ABC):
         spec=ArgSpec(
             dest="CC",
             type=Path,
-            default=_guess_c_compiler(),
+            default=DeferredDefault(_guess_c_compiler),
             help="Specify C compiler",
         ),
         cmake_var=CMAKE_VARIABLE("CMAKE_C_COMPILER", CMakeExecutable),
@@ -297,7 +557,7 @@ class MainPackage(Package, ABC):
         spec=ArgSpec(
             dest="CXX",
             type=Path,
-            default=_guess_cxx_compiler(),
+            default=DeferredDefault(_guess_cxx_compiler),
             help="Specify C++ compiler",
         ),
         cmake_var=CMAKE_VARIABLE("CMAKE_CXX_COMPILER", CMakeExecutable),
@@ -341,6 +601,17 @@ class MainPackage(Package, ABC):
         "ON_ERROR_DEBUGGER",
         "WITH_CLEAN",
         "FORCE",
+        "DRY_RUN",
+        "NO_PROBE_CACHE",
+        "NO_TIMING_DB",
+        "HEADLESS",
+        "LOG_LEVEL",
+        "LOG_COMPRESSION",
+        "LOG_MAX_SIZE",
+        "PROFILE_CONFIGURE",
+        "RECORD_COMMANDS",
+        "REPLAY_COMMANDS",
+        "CONFIGURE_JOBS",
         "CMAKE_BUILD_PARALLEL_LEVEL",
         "CMAKE_BUILD_TYPE",
         "BUILD_SHARED_LIBS",
@@ -359,6 +630,7 @@ class MainPackage(Package, ABC):
         "_arch_value",
         "_arch_value_provenance",
         "_default_arch_file_path",
+        "_preparsed",
         "_proj_config_file_template",
         "_proj_dir_name",
         "_proj_dir_value",
@@ -435,6 +707,7 @@ class MainPackage(Package, ABC):
             raise ValueError(msg)
 
         self._arch_name = arch_name
+        self._preparsed: PreparsedArgs | None = None
         self._arch_value, self._arch_value_provenance = (
             self.preparse_arch_value(argv)
         )
@@ -594,6 +867,112 @@ class MainPackage(Package, ABC):
             return val, ValueProvenance.ENVIRONMENT
         return None, ValueProvenance.GENERATED  # not found
 
+    def preparse(self, argv: Sequence[str]) -> PreparsedArgs:
+        r"""Pre-parse all values needed before the full command line can be
+        parsed.
+
+        Parameters
+        ----------
+        argv : Sequence[str]
+            The command-line arguments to search.
+
+        Returns
+        -------
+        preparsed : PreparsedArgs
+            The pre-parsed values.
+
+        Notes
+        -----
+        All values are extracted in a single pass over `argv`, and the result
+        is cached, so repeated calls with the same `argv` are free. Anything
+        following a '--' in `argv` is ignored, so the original command line
+        and the partitioned one share the same result.
+        """
+        argv = tuple(partition_argv(argv)[0])
+        if (cached := self._preparsed) is not None and cached.argv == argv:
+            return cached
+
+        parser = ArgumentParser(add_help=False, allow_abbrev=False)
+        parser.add_argument(f"--{self.arch_name}", dest="arch")
+        for flag, dest in (
+            ("--with-python", "with_python"),
+            ("--with-cuda", "with_cuda"),
+            (HEADLESS_FLAG, "headless"),
+            (PROFILE_CONFIGURE_FLAG, "profile_configure"),
+            (NO_TIMING_DB_FLAG, "no_timing_db"),
+            (DRY_RUN_FLAG, "dry_run"),
+        ):
+            parser.add_argument(
+                flag,
+                nargs="?",
+                const=True,
+                default=None,
+                type=_lenient(ConfigArgument._str_to_bool),  # noqa: SLF001
+                dest=dest,
+            )
+        parser.add_argument(
+            DEBUG_CONFIGURE_FLAG,
+            nargs="?",
+            const=DebugConfigureValue.DEBUG_FIND,
+            default=None,
+            type=_lenient(DebugConfigureValue.from_string),
+            dest="debug_configure",
+        )
+        parser.add_argument(
+            LOG_LEVEL_FLAG,
+            type=_lenient(LogLevel.from_string),
+            dest="log_level",
+        )
+        parser.add_argument(
+            LOG_COMPRESSION_FLAG,
+            type=_lenient(LogCompression.from_string),
+            dest="log_compression",
+        )
+        parser.add_argument(
+            LOG_MAX_SIZE_FLAG, type=_lenient(parse_size), dest="log_max_size"
+        )
+        for flag in (RECORD_COMMANDS_FLAG, REPLAY_COMMANDS_FLAG):
+            parser.add_argument(flag, type=Path, dest=flag_to_dest(flag))
+        parser.add_argument(self.CMAKE_BUILD_TYPE.name, dest="build_type")
+        args, _ = parser.parse_known_args(argv)
+        flags = frozenset(
+            tok.partition("=")[0] for tok in argv if tok.startswith("-")
+        )
+
+        def from_environ(
+            value: str | None, environ_name: str
+        ) -> tuple[str | None, ValueProvenance]:
+            if value is not None:
+                return value, ValueProvenance.COMMAND_LINE
+            if (value := os.environ.get(environ_name)) is not None:
+                return value, ValueProvenance.ENVIRONMENT
+            return None, ValueProvenance.GENERATED
+
+        arch, arch_provenance = from_environ(args.arch, self.arch_name)
+        build_type, _ = from_environ(
+            args.build_type, str(self.CMAKE_BUILD_TYPE.cmake_var)
+        )
+        self._preparsed = PreparsedArgs(
+            argv=argv,
+            flags=flags,
+            arch=arch,
+            arch_provenance=arch_provenance,
+            with_python=args.with_python,
+            with_cuda=args.with_cuda,
+            headless=args.headless,
+            debug_configure=args.debug_configure,
+            log_level=args.log_level,
+            log_compression=args.log_compression,
+            log_max_size=args.log_max_size,
+            profile_configure=args.profile_configure,
+            no_timing_db=args.no_timing_db,
+            dry_run=args.dry_run,
+            record_commands=args.record_commands,
+            replay_commands=args.replay_commands,
+            build_type=build_type,
+        )
+        return self._preparsed
+
     def preparse_arch_value(
         self, argv: Sequence[str]
     ) -> tuple[str, ValueProvenance]:
@@ -612,26 +991,17 @@ class MainPackage(Package, ABC):
             The provenance of the arch value, detailing where the value was
             found.
         """
-        arch, provenance = self._preparse_value(
-            argv, f"--{self.arch_name}", environ_name=self.arch_name
-        )
-        if arch is not None:
+        preparsed = self.preparse(argv)
+        if preparsed.arch is not None:
             # found something
-            return arch, provenance
+            return preparsed.arch, preparsed.arch_provenance
 
         gen_arch = ["arch", platform.system().casefold()]
-        have_py, _ = self._preparse_value(argv, "--with-python", bool_opt=True)
-        if have_py:
+        if preparsed.with_python:
             gen_arch.append("py")
-        have_cuda, _ = self._preparse_value(argv, "--with-cuda", bool_opt=True)
-        if have_cuda:
+        if preparsed.with_cuda:
             gen_arch.append("cuda")
-        build_type, _ = self._preparse_value(
-            argv,
-            self.CMAKE_BUILD_TYPE.name,
-            environ_name=str(self.CMAKE_BUILD_TYPE.cmake_var),
-        )
-        if build_type is None:
+        if (build_type := preparsed.build_type) is None:
             build_type = _DEFAULT_BUILD_TYPE
         else:
             build_type = build_type.casefold()
@@ -800,7 +1170,7 @@ class MainPackage(Package, ABC):
         ) -> str:
             cc = self.manager.get_cmake_variable(compiler_var)
             if cc:
-                version = self.log_execute_command([cc, "--version"]).stdout
+                version = self.log_execute_probe([cc, "--version"]).stdout
             else:
                 version = "(unknown)"
 
@@ -7,10 +7,11 @@ import shlex
 import textwrap
 from argparse import ArgumentParser, Namespace, _ArgumentGroup as ArgumentGroup
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, TypeVar
+from typing import TYPE_CHECKING, Any, ClassVar, TypeAlias, TypeVar
 
 from ..base import Configurable
 from ..cmake.cmake_flags import _CMakeVar
+from ..logger import LogLevel
 from ..util.argument_parser import ConfigArgument, ExclusiveArgumentGroup
 from ..util.exception import WrongOrderError
 
@@ -23,6 +24,8 @@ if TYPE_CHECKING:
 
 _T = TypeVar("_T")
 
+PackageOption: TypeAlias = ConfigArgument | _CMakeVar | ExclusiveArgumentGroup
+
 
 class Dependencies(Namespace):
     def __getattr__(self, value: str) -> Package:
@@ -36,8 +39,40 @@ class Package(Configurable):
     # Other package (types) that this package depends on
     dependencies: tuple[type[Package], ...] = ()
 
+    # The options (ConfigArgument, _CMakeVar and ExclusiveArgumentGroup class
+    # members) of the package, sorted by attribute name. Populated by
+    # __init_subclass__().
+    __package_options__: ClassVar[tuple[tuple[str, PackageOption], ...]] = ()
+
     __slots__ = "_always_enabled", "_dep_types", "_deps", "_name", "_state"
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        r"""Build the option registry of a Package subclass.
+
+        Parameters
+        ----------
+        **kwargs : Any
+            Forwarded to ``super().__init_subclass__()``.
+
+        Notes
+        -----
+        The registry is built by inspecting the class dictionaries along the
+        MRO, so (unlike ``getattr()``) no properties or other descriptors are
+        ever invoked.
+        """
+        super().__init_subclass__(**kwargs)
+        members: dict[str, Any] = {}
+        for klass in reversed(cls.__mro__):
+            members.update(vars(klass))
+        cls.__package_options__ = tuple(
+            (attr_name, attr)
+            for attr_name, attr in sorted(members.items())
+            if not attr_name.startswith("__")
+            and isinstance(
+                attr, (ConfigArgument, _CMakeVar, ExclusiveArgumentGroup)
+            )
+        )
+
     @dataclass(slots=True, frozen=True)
     class EnableState:
         value: bool
@@ -150,7 +185,11 @@ class Package(Configurable):
         def handle_cmake_var(attr: _CMakeVar) -> None:
             cmake_ty = attr.__config_cmake_type__()
             self.log(
-                f'Registering CMake variable "{attr}" for {self!r}: {cmake_ty}'
+                'Registering CMake variable "%s" for %r: %s',
+                attr,
+                self,
+                cmake_ty,
+                level=LogLevel.DEBUG,
             )
             # have found a special attribute
             self.manager.register_cmake_variable(cmake_ty)
@@ -158,7 +197,9 @@ class Package(Configurable):
         def handle_config_arg(
             arg: ConfigArgument, parser: ArgumentGroup
         ) -> None:
-            self.log(f"Adding {arg.name} to parser: {arg}")
+            self.log(
+                "Adding %s to parser: %s", arg.name, arg, level=LogLevel.DEBUG
+            )
             arg.add_to_argparser(parser)
             if arg.ephemeral:
                 self.manager.add_ephemeral_arg(arg.name)
@@ -183,37 +224,25 @@ class Package(Configurable):
         # ignored_only = True, and only registers its special attributes. The
         # second time around we call it without that, and register all the
         # others.
-        attr_names = dir(self)
         ignores: set[str] = getattr(self, "__package_ignore_attrs__", set())
-        if ignored_only:
-            attr_names = [attr for attr in attr_names if attr in ignores]
-        else:
-            attr_names = [attr for attr in attr_names if attr not in ignores]
-
-        for attr_name in attr_names:
-            if attr_name.startswith("__"):
-                continue
-
-            try:
-                attr = getattr(self, attr_name)
-            except Exception as e:
-                self.log(
-                    f"Skipping attribute {attr_name!r} due to raised "
-                    f"exception: {e}"
-                )
+        for attr_name, attr in self.__package_options__:
+            if (attr_name in ignores) != ignored_only:
                 continue
 
             # attr is e.g. MainPackage.CMAKE_BUILD_TYPE
             match attr:
                 case _CMakeVar():
                     self.log(
-                        f"Attribute {attr_name!r}: detected cmake variable"
+                        "Attribute %r: detected cmake variable",
+                        attr_name,
+                        level=LogLevel.DEBUG,
                     )
                     handle_cmake_var(attr)
                 case ExclusiveArgumentGroup(required=required, group=group):
                     self.log(
-                        f"Attribute {attr_name!r}: detected exclusive "
-                        "argument group"
+                        "Attribute %r: detected exclusive argument group",
+                        attr_name,
+                        level=LogLevel.DEBUG,
                     )
                     mut_group = parser.add_mutually_exclusive_group(
                         required=required
@@ -222,7 +251,9 @@ class Package(Configurable):
                         handle_config_arg(sub_attr, mut_group)
                 case ConfigArgument():
                     self.log(
-                        f"Attribute {attr_name!r}: detected config argument"
+                        "Attribute %r: detected config argument",
+                        attr_name,
+                        level=LogLevel.DEBUG,
                     )
                     handle_config_arg(attr, parser)
 
@@ -315,12 +346,7 @@ class Package(Configurable):
 
         config_args: list[ConfigArgument] = []
         primary_attr = None
-        for attr_name in dir(self):
-            try:
-                attr = getattr(self, attr_name)
-            except Exception:  # noqa: S112
-                continue
-
+        for _, attr in self.__package_options__:
             if not isinstance(attr, ConfigArgument):
                 continue
 
@@ -4,30 +4,26 @@
 from __future__ import annotations
 
 import os
-import shutil
 from typing import TYPE_CHECKING, Final
 
 from ..cmake import CMAKE_VARIABLE, CMakePath, CMakeString
 from ..package import Package
 from ..util.argument_parser import ArgSpec, ConfigArgument
+from ..util.path_index import which
 
 if TYPE_CHECKING:
     from ..manager import ConfigurationManager
 
 
-_cmake_exe = shutil.which("cmake")
+_cmake_exe = which("cmake")
 
 
 def _determine_default_generator() -> str | None:
     if ret := os.environ.get("CMAKE_GENERATOR"):
         return ret
-    if shutil.which("ninja"):
+    if which("ninja"):
         return "Ninja"
-    if (
-        shutil.which("make")
-        or shutil.which("gmake")
-        or shutil.which("gnumake")
-    ):
+    if which("make") or which("gmake") or which("gnumake"):
         return "Unix Makefiles"
     return None
 
@@ -81,7 +77,7 @@ class CMake(Package):
         """
         cmake_exe = self.manager.get_cmake_variable(self.CMAKE_COMMAND)
         version = (
-            self.log_execute_command([cmake_exe, "--version"])
+            self.log_execute_probe([cmake_exe, "--version"])
             .stdout.splitlines()[0]  # "cmake version XX.YY.ZZ"
             .split()[2]  # ["cmake", "version", "XX.YY.ZZ"]
         )
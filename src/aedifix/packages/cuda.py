@@ -5,7 +5,6 @@ from __future__ import annotations
 
 import os
 import re
-import shutil
 from argparse import Action, ArgumentParser, Namespace
 from pathlib import Path
 from typing import TYPE_CHECKING, Final
@@ -18,7 +17,8 @@ from ..cmake import (
     CMakeSemiColonList,
 )
 from ..package import Package
-from ..util.argument_parser import ArgSpec, ConfigArgument
+from ..util.argument_parser import ArgSpec, ConfigArgument, DeferredDefault
+from ..util.path_index import which
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
@@ -29,7 +29,7 @@ def _guess_cuda_compiler() -> str | None:
         if guess := os.environ.get(env_guess):
             return guess
     for ccguess in ("nvcc", "cudac"):
-        if guess := shutil.which(ccguess):
+        if guess := which(ccguess):
             return guess
     return None
 
@@ -99,7 +99,7 @@ class CUDA(Package):
         spec=ArgSpec(
             dest="with_cuda",
             type=bool,
-            default=shutil.which("nvcc") is not None,
+            default=DeferredDefault(lambda: which("nvcc") is not None),
             help="Build with CUDA support.",
         ),
         enables_package=True,
@@ -122,7 +122,7 @@ class CUDA(Package):
         spec=ArgSpec(
             dest="CUDAC",
             type=Path,
-            default=_guess_cuda_compiler(),
+            default=DeferredDefault(_guess_cuda_compiler),
             help="Specify CUDA compiler",
         ),
         cmake_var=CMAKE_VARIABLE("CMAKE_CUDA_COMPILER", CMakeExecutable),
@@ -138,8 +138,10 @@ class CUDA(Package):
         spec=ArgSpec(
             dest="cuda_arch",
             required=False,
-            default=CudaArchAction.map_cuda_arch_names(
-                _guess_cuda_architecture()
+            default=DeferredDefault(
+                lambda: CudaArchAction.map_cuda_arch_names(
+                    _guess_cuda_architecture()
+                )
             ),
             action=CudaArchAction,
             help=(
@@ -196,7 +198,7 @@ class CUDA(Package):
         assert cc is not None
         ret.append(("Executable", cc))
 
-        version = self.log_execute_command([cc, "--version"]).stdout
+        version = self.log_execute_probe([cc, "--version"]).stdout
         ret.append(("Version", version))
 
         ccflags = self.manager.get_cmake_variable(self.CMAKE_CUDA_FLAGS)
@@ -0,0 +1,273 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import json
+import time
+import hashlib
+import tempfile
+import contextlib
+from pathlib import Path
+from subprocess import CompletedProcess
+from typing import TYPE_CHECKING, Final, TypedDict, TypeVar
+
+from .base import Configurable
+from .util.path_index import which
+from .util.utility import aedifix_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from .manager import ConfigurationManager
+
+_T = TypeVar("_T")
+
+# Bump this whenever the format of the cache entries, or the way they are
+# keyed, changes.
+_PROBE_CACHE_VERSION: Final = 1
+_DEFAULT_MAX_AGE: Final = 30 * 24 * 60 * 60  # 30 days, in seconds
+_DEFAULT_MAX_ENTRIES: Final = 512
+
+
+class ProbeCacheEntry(TypedDict):
+    VERSION: int
+    COMMAND: list[str]
+    EXECUTABLE: str
+    STDOUT: str
+    STDERR: str
+
+
+def default_probe_cache_dir() -> Path:
+    r"""Get the default location of the probe cache.
+
+    Returns
+    -------
+    cache_dir : Path
+        The probe cache directory, under ``$XDG_CACHE_HOME`` (or
+        ``~/.cache`` if unset).
+    """
+    return aedifix_cache_dir() / "probes"
+
+
+class ProbeCache(Configurable):
+    r"""A persistent, cross-configuration cache of the output of toolchain
+    probes, such as ``cmake --version``.
+
+    Entries are keyed by the command line, and the identity (resolved path,
+    size, modification time and inode) of the executable. Replacing or
+    updating the executable therefore automatically invalidates all of its
+    entries.
+    """
+
+    __slots__ = "_cache_dir", "_enabled"
+
+    def __init__(
+        self, manager: ConfigurationManager, cache_dir: Path | None = None
+    ) -> None:
+        r"""Construct a ProbeCache.
+
+        Parameters
+        ----------
+        manager : ConfigurationManager
+            The configuration manager to manage this object.
+        cache_dir : Path, optional
+            The directory in which to store the cache entries. Defaults to
+            `default_probe_cache_dir()`.
+        """
+        super().__init__(manager=manager)
+        if cache_dir is None:
+            cache_dir = default_probe_cache_dir()
+        self._cache_dir = cache_dir
+        self._enabled = True
+
+    @property
+    def cache_dir(self) -> Path:
+        r"""Get the cache directory.
+
+        Returns
+        -------
+        cache_dir : Path
+            The directory containing the cache entries.
+        """
+        return self._cache_dir
+
+    @property
+    def enabled(self) -> bool:
+        r"""Get whether the cache is enabled.
+
+        Returns
+        -------
+        enabled : bool
+            True if the cache is enabled, False otherwise.
+        """
+        return self._enabled
+
+    def disable(self) -> None:
+        r"""Disable the cache. All probes are executed, and their results are
+        not stored.
+        """
+        self._enabled = False
+
+    @staticmethod
+    def _executable_identity(exe: str) -> str | None:
+        if (found := which(exe)) is None:
+            return None
+        path = Path(found).resolve()
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return f"{path}:{st.st_size}:{st.st_mtime_ns}:{st.st_ino}"
+
+    def _entry_path(self, command: Sequence[str]) -> Path | None:
+        if not command:
+            return None
+        if (ident := self._executable_identity(command[0])) is None:
+            return None
+        key = json.dumps([_PROBE_CACHE_VERSION, ident, *command[1:]])
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.cache_dir / f"{digest}.json"
+
+    def _load(
+        self, entry_path: Path, command: Sequence[str]
+    ) -> CompletedProcess[str] | None:
+        try:
+            entry: ProbeCacheEntry = json.loads(entry_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if (
+            not isinstance(entry, dict)
+            or entry.get("VERSION") != _PROBE_CACHE_VERSION
+            or entry.get("COMMAND") != list(command)
+        ):
+            return None
+        # Refresh the modification time, which is used for eviction.
+        with contextlib.suppress(OSError):
+            os.utime(entry_path)
+        return CompletedProcess(
+            args=list(command),
+            returncode=0,
+            stdout=entry["STDOUT"],
+            stderr=entry["STDERR"],
+        )
+
+    def _store(
+        self,
+        entry_path: Path,
+        command: Sequence[str],
+        result: CompletedProcess[str],
+    ) -> None:
+        entry: ProbeCacheEntry = {
+            "VERSION": _PROBE_CACHE_VERSION,
+            "COMMAND": list(command),
+            "EXECUTABLE": str(which(command[0])),
+            "STDOUT": result.stdout or "",
+            "STDERR": result.stderr or "",
+        }
+        # Multiple configurations may share the cache, so the entry is written
+        # to a temporary file first, and then atomically moved into place.
+        try:
+            entry_path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=entry_path.parent, suffix=".tmp", delete=False
+            ) as fd:
+                json.dump(entry, fd, sort_keys=True, indent=4)
+            Path(fd.name).replace(entry_path)
+        except OSError as ose:
+            self.log(f"Failed to store probe cache entry {entry_path}: {ose}")
+
+    def run(self, command: Sequence[_T]) -> CompletedProcess[str]:
+        r"""Execute a probe, or retrieve its output from the cache.
+
+        Parameters
+        ----------
+        command : Sequence[T]
+            The probe command to execute. The first element must be the
+            executable.
+
+        Returns
+        -------
+        ret : CompletedProcess
+            The completed process object.
+
+        Raises
+        ------
+        CommandError
+            If the probe returns a non-zero errorcode.
+
+        Notes
+        -----
+        Probes must be side-effect free, and their output must depend only on
+        their executable and arguments. Failed probes are never cached.
+        """
+        str_cmd = [str(c) for c in command]
+        entry_path = self._entry_path(str_cmd) if self.enabled else None
+        if (
+            entry_path is not None
+            and (cached := self._load(entry_path, str_cmd)) is not None
+        ):
+            self.log(
+                f"Using cached result of probe: {' '.join(str_cmd)} "
+                f"({entry_path})"
+            )
+            return cached
+
+        ret = self.log_execute_command(command)
+        if entry_path is not None:
+            self._store(entry_path, str_cmd, ret)
+        return ret
+
+    def evict(
+        self,
+        *,
+        max_age: float = _DEFAULT_MAX_AGE,
+        max_entries: int = _DEFAULT_MAX_ENTRIES,
+    ) -> list[Path]:
+        r"""Evict old entries from the cache.
+
+        Parameters
+        ----------
+        max_age : float, optional
+            The maximum time (in seconds) since an entry was last used.
+        max_entries : int, optional
+            The maximum number of entries to keep. The least recently used
+            entries are evicted first.
+
+        Returns
+        -------
+        evicted : list[Path]
+            The evicted entries.
+        """
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            with contextlib.suppress(OSError):
+                entries.append((path.stat().st_mtime, path))
+        # Most recently used first
+        entries.sort(reverse=True)
+        oldest = time.time() - max_age
+        evicted = [
+            path
+            for idx, (mtime, path) in enumerate(entries)
+            if idx >= max_entries or mtime < oldest
+        ]
+        for path in evicted:
+            with contextlib.suppress(OSError):
+                path.unlink()
+        return evicted
+
+    def setup(self) -> None:
+        r"""Setup the probe cache."""
+        if not self.enabled or self.cl_args.no_probe_cache.value:
+            self.log("Probe cache disabled")
+            self.disable()
+            return
+        self.log(f"Using probe cache: {self.cache_dir}")
+
+    def finalize(self) -> None:
+        r"""Evict old entries from the probe cache."""
+        if not self.enabled:
+            return
+        if evicted := self.evict():
+            self.log(f"Evicted {len(evicted)} probe cache entries")
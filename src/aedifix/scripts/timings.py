@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from aedifix.timing_db import (
+    DEFAULT_MIN_SECONDS,
+    DEFAULT_THRESHOLD,
+    DEFAULT_WINDOW,
+    TimingDB,
+    default_timing_db_path,
+)
+
+
+def main() -> int:
+    parser = ArgumentParser(
+        description=(
+            "Report the parts of the latest configuration which took longer "
+            "than the median of the previous runs. Exits with a non-zero "
+            "status if any regressed."
+        )
+    )
+    parser.add_argument(
+        "--db",
+        type=Path,
+        default=default_timing_db_path(),
+        help="The timing database (default: %(default)s)",
+    )
+    parser.add_argument("--project", help="Only report this project")
+    parser.add_argument("--arch", help="Only report this arch")
+    parser.add_argument(
+        "--window",
+        type=int,
+        default=DEFAULT_WINDOW,
+        help="The number of previous runs to compare to (default: "
+        "%(default)s)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="The minimum slowdown to report (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--min-seconds",
+        type=float,
+        default=DEFAULT_MIN_SECONDS,
+        help="The minimum absolute slowdown, in seconds, to report "
+        "(default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"No timing database found at {args.db}")  # noqa: T201
+        return 0
+
+    db = TimingDB(args.db)
+    found = False
+    configs = [
+        (project, arch)
+        for project, arch in db.configurations()
+        if args.project in (None, project) and args.arch in (None, arch)
+    ]
+    for project, arch in configs:
+        regressions = db.regressions(
+            project,
+            arch,
+            window=args.window,
+            threshold=args.threshold,
+            min_seconds=args.min_seconds,
+        )
+        if not regressions:
+            print(f"{project} {arch}: no regressions")  # noqa: T201
+            continue
+        found = True
+        print(f"{project} {arch}:")  # noqa: T201
+        for reg in regressions:
+            print(  # noqa: T201
+                f"  {reg.category:<10} {reg.name}: {reg.latest:.2f} s "
+                f"(median {reg.median:.2f} s, {reg.ratio:.2f}x)"
+            )
+    return int(found)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +0,0 @@
-configure_file("${AEDIFIX_CONFIGURE_FILE_SRC}" "${AEDIFIX_CONFIGURE_FILE_DEST}"
-               USE_SOURCE_PERMISSIONS @ONLY)
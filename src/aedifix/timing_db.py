@@ -0,0 +1,362 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import json
+import sqlite3
+import contextlib
+import statistics
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Final
+
+from .util.utility import aedifix_cache_dir
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+    from pathlib import Path
+
+    from .util.trace import TraceEvent
+
+# Bump this whenever the schema changes.
+_SCHEMA_VERSION: Final = 1
+_SCHEMA: Final = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    project TEXT NOT NULL,
+    arch TEXT NOT NULL,
+    started REAL NOT NULL,
+    wall REAL NOT NULL,
+    success INTEGER NOT NULL,
+    argv TEXT NOT NULL,
+    fingerprint TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_by_config ON runs (project, arch, id);
+CREATE TABLE IF NOT EXISTS timings (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    category TEXT NOT NULL,
+    name TEXT NOT NULL,
+    wall REAL NOT NULL,
+    cpu REAL
+);
+CREATE INDEX IF NOT EXISTS timings_by_run ON timings (run_id);
+PRAGMA user_version = {_SCHEMA_VERSION};
+"""
+
+_LATEST_RUNS: Final = (
+    "SELECT id FROM runs WHERE project = ? AND arch = ? AND success "
+    "ORDER BY id DESC LIMIT ?"
+)
+_LATEST_TIMINGS: Final = (
+    "SELECT t.run_id, t.category, t.name, SUM(t.wall) FROM timings AS t "
+    "JOIN (SELECT id FROM runs WHERE project = ? AND arch = ? AND success "
+    "ORDER BY id DESC LIMIT ?) AS r ON t.run_id = r.id "
+    "GROUP BY t.run_id, t.category, t.name"
+)
+
+DEFAULT_WINDOW: Final = 5
+DEFAULT_THRESHOLD: Final = 1.25
+DEFAULT_MIN_SECONDS: Final = 1.0
+# The minimum number of previous runs needed to compute a meaningful median.
+_MIN_HISTORY: Final = 3
+
+Timings = dict[tuple[str, str], float]
+
+
+def default_timing_db_path() -> Path:
+    r"""Get the default location of the timing database.
+
+    Returns
+    -------
+    path : Path
+        The path to the timing database, see `aedifix_cache_dir()`.
+    """
+    return aedifix_cache_dir() / "timings.sqlite3"
+
+
+def format_duration(seconds: float) -> str:
+    r"""Format a duration for humans.
+
+    Parameters
+    ----------
+    seconds : float
+        The duration, in seconds.
+
+    Returns
+    -------
+    duration : str
+        The formatted duration, rounded to the second, e.g. '3 min 20 s'.
+    """
+    minutes, secs = divmod(round(seconds), 60)
+    if not (minutes or secs):
+        return "< 1 s"
+    if not minutes:
+        return f"{secs} s"
+    return f"{minutes} min {secs} s"
+
+
+@dataclass(slots=True, frozen=True)
+class Regression:
+    r"""A part of the configuration which took longer than usual."""
+
+    category: str
+    """The category of the part, e.g. 'phase' or 'command'."""
+
+    name: str
+    """The name of the part."""
+
+    latest: float
+    """The time taken in the latest run, in seconds."""
+
+    median: float
+    """The median time taken in the previous runs, in seconds."""
+
+    @property
+    def ratio(self) -> float:
+        r"""Get the slowdown of the latest run.
+
+        Returns
+        -------
+        ratio : float
+            The ratio of the latest time to the median time.
+        """
+        return self.latest / self.median if self.median else float("inf")
+
+
+class TimingDB:
+    r"""A persistent database of the time taken by each configuration, used
+    to detect performance regressions and to estimate durations.
+
+    Each run is keyed by its project and arch. For every run, the time taken
+    by each span recorded by the `Tracer` (phases, functions and commands) is
+    stored.
+    """
+
+    __slots__ = ("_path",)
+
+    def __init__(self, path: Path | None = None) -> None:
+        r"""Construct a TimingDB.
+
+        Parameters
+        ----------
+        path : Path, optional
+            The path of the database. Defaults to
+            `default_timing_db_path()`.
+
+        Notes
+        -----
+        The database is not opened (or created) on construction.
+        """
+        if path is None:
+            path = default_timing_db_path()
+        self._path = path
+
+    @property
+    def path(self) -> Path:
+        r"""Get the path of the database.
+
+        Returns
+        -------
+        path : Path
+            The path of the database.
+        """
+        return self._path
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Multiple configurations may run at once, so wait for the lock
+        # rather than failing immediately.
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            (version,) = conn.execute("PRAGMA user_version").fetchone()
+            if version != _SCHEMA_VERSION:
+                conn.executescript(_SCHEMA)
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def record(  # noqa: PLR0913
+        self,
+        project: str,
+        arch: str,
+        *,
+        argv: Sequence[str],
+        fingerprint: str | None,
+        started: float,
+        wall: float,
+        success: bool,
+        spans: Iterable[TraceEvent],
+    ) -> int:
+        r"""Record a configuration run.
+
+        Parameters
+        ----------
+        project : str
+            The name of the project.
+        arch : str
+            The arch of the configuration.
+        argv : Sequence[str]
+            The command-line arguments of the run.
+        fingerprint : str, optional
+            The fingerprint of the inputs of the configuration, if known.
+        started : float
+            The time (since the epoch, in seconds) at which the run started.
+        wall : float
+            The total time taken by the run, in seconds.
+        success : bool
+            Whether the run succeeded.
+        spans : Iterable[TraceEvent]
+            The spans recorded during the run, see `Tracer.spans`.
+
+        Returns
+        -------
+        run_id : int
+            The id of the recorded run.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO runs (project, arch, started, wall, success, "
+                "argv, fingerprint) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    project,
+                    arch,
+                    started,
+                    wall,
+                    success,
+                    json.dumps(list(argv)),
+                    fingerprint,
+                ),
+            )
+            run_id = cursor.lastrowid
+            assert run_id is not None
+            conn.executemany(
+                "INSERT INTO timings (run_id, category, name, wall, cpu) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        run_id,
+                        span["cat"],
+                        span["name"],
+                        span["dur"] / 1e6,
+                        span.get("args", {}).get("cpu"),
+                    )
+                    for span in spans
+                ),
+            )
+        return run_id
+
+    def _history(self, project: str, arch: str, limit: int) -> list[Timings]:
+        # Returns the total time of each span, in each of the latest `limit`
+        # successful runs, oldest first.
+        params = (project, arch, limit)
+        with self._connect() as conn:
+            run_ids = [
+                run_id for (run_id,) in conn.execute(_LATEST_RUNS, params)
+            ]
+            rows = conn.execute(_LATEST_TIMINGS, params).fetchall()
+        timings: defaultdict[int, Timings] = defaultdict(dict)
+        for run_id, category, name, wall in rows:
+            timings[run_id][category, name] = wall
+        return [timings[run_id] for run_id in reversed(run_ids)]
+
+    def configurations(self) -> list[tuple[str, str]]:
+        r"""Get all recorded configurations.
+
+        Returns
+        -------
+        configs : list[tuple[str, str]]
+            The (project, arch) of each configuration, sorted.
+        """
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT DISTINCT project, arch FROM runs "
+                "ORDER BY project, arch"
+            ).fetchall()
+
+    def estimate(
+        self,
+        project: str,
+        arch: str,
+        category: str,
+        name: str,
+        *,
+        window: int = DEFAULT_WINDOW,
+    ) -> float | None:
+        r"""Estimate the time a part of the configuration will take.
+
+        Parameters
+        ----------
+        project : str
+            The name of the project.
+        arch : str
+            The arch of the configuration.
+        category : str
+            The category of the part.
+        name : str
+            The name of the part.
+        window : int, optional
+            The number of previous successful runs to consider.
+
+        Returns
+        -------
+        estimate : float | None
+            The median time (in seconds) taken by the part in the previous
+            runs, or None if it never ran.
+        """
+        history = self._history(project, arch, window)
+        key = category, name
+        if walls := [t[key] for t in history if key in t]:
+            return statistics.median(walls)
+        return None
+
+    def regressions(
+        self,
+        project: str,
+        arch: str,
+        *,
+        window: int = DEFAULT_WINDOW,
+        threshold: float = DEFAULT_THRESHOLD,
+        min_seconds: float = DEFAULT_MIN_SECONDS,
+    ) -> list[Regression]:
+        r"""Find the parts of the latest configuration run which regressed.
+
+        Parameters
+        ----------
+        project : str
+            The name of the project.
+        arch : str
+            The arch of the configuration.
+        window : int, optional
+            The number of previous successful runs from which to compute the
+            rolling median.
+        threshold : float, optional
+            The minimum ratio of the latest time to the median time for a
+            part to have regressed.
+        min_seconds : float, optional
+            The minimum difference (in seconds) between the latest time and
+            the median time for a part to have regressed. Filters out noise
+            in very short parts.
+
+        Returns
+        -------
+        regressions : list[Regression]
+            The regressed parts, worst first.
+
+        Notes
+        -----
+        A part is only checked if it ran in at least 3 of the previous runs.
+        """
+        *previous, latest = self._history(project, arch, window + 1) or [{}]
+        ret = []
+        for key, wall in latest.items():
+            walls = [t[key] for t in previous if key in t]
+            if len(walls) < _MIN_HISTORY:
+                continue
+            median = statistics.median(walls)
+            if wall >= median * threshold and wall - median >= min_seconds:
+                ret.append(Regression(*key, latest=wall, median=median))
+        ret.sort(key=lambda r: r.latest - r.median, reverse=True)
+        return ret
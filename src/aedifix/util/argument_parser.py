@@ -14,7 +14,7 @@ from dataclasses import (
     fields as dataclasses_fields,
     replace as dataclasses_replace,
 )
-from typing import TYPE_CHECKING, Any, Literal, TypeAlias, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, Literal, TypeAlias, TypeVar
 
 from .exception import LengthError
 
@@ -53,6 +53,70 @@ T = TypeVar("T")
 NotRequired: TypeAlias = type[Unset] | T
 
 
+class DeferredDefault(Generic[T]):
+    r"""A default value which is computed only when it is first needed."""
+
+    __slots__ = "_func", "_value"
+
+    def __init__(self, func: Callable[[], T]) -> None:
+        r"""Construct a DeferredDefault.
+
+        Parameters
+        ----------
+        func : Callable[[], T]
+            The function which computes the default value. It is called at
+            most once.
+
+        Notes
+        -----
+        Use this for defaults that are expensive to compute (for example
+        because they need to search the file system), so that the cost is
+        only paid if the value is actually read (or shown in the help text),
+        rather than when the module defining the argument is imported.
+        """
+        self._func = func
+        self._value: NotRequired[T] = Unset
+
+    def resolve(self) -> T:
+        r"""Compute the default value.
+
+        Returns
+        -------
+        value : T
+            The default value.
+        """
+        if self._value is Unset:
+            self._value = self._func()
+        return self._value  # type: ignore[return-value]
+
+    def converted(self, type_: Callable[[str], Any]) -> DeferredDefault[Any]:
+        r"""Create a deferred default applying argparse's type conversion.
+
+        Parameters
+        ----------
+        type_ : Callable[[str], Any]
+            The argument type.
+
+        Returns
+        -------
+        converted : DeferredDefault
+            A deferred default which, like argparse does for regular
+            defaults, converts the value with `type_` if it is a string.
+        """
+
+        def convert() -> Any:
+            value = self.resolve()
+            return type_(value) if isinstance(value, str) else value
+
+        return DeferredDefault(convert)
+
+    def __str__(self) -> str:
+        return str(self.resolve())
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._func!r})"
+
+
 @dataclass(slots=True, frozen=True)
 class ArgSpec:
     dest: str
@@ -153,6 +217,12 @@ class ConfigArgument:
             replace_if_unset("metavar", "bool")
             spec = dataclasses_replace(spec, **to_replace)
 
+        default = spec.default
+        if isinstance(default, DeferredDefault) and spec.type is not Unset:
+            spec = dataclasses_replace(
+                spec, default=default.converted(spec.type)
+            )
+
         kwargs = spec.as_pruned_dict()
         parser.add_argument(self.name, **kwargs)
 
@@ -3,16 +3,21 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import sys
 import inspect
+import itertools
+import threading
+import traceback
 from functools import lru_cache
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Final
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
     from types import CodeType, FrameType
 
-_get_calling_function_called = 0
+# Per-thread recursion guard for get_calling_function(), see _gcf_method().
+_get_calling_function_state = threading.local()
 
 
 class GetCallingFuncRecursionError(Exception):
@@ -77,48 +82,102 @@ def _gcf_misc_2(fr: FrameType, _co: CodeType) -> Callable[..., Any]:
     return _gcf_get_local(fr, "f")
 
 
+_GETTERS: Final = (
+    _gcf_function,
+    _gcf_method,
+    _gcf_classmethod,
+    _gcf_nested,
+    _gcf_functools_wraps,
+    _gcf_misc_1,
+    _gcf_misc_2,
+)
+
+# Sentinel stored in _CODE_CACHE for code objects belonging to passthrough
+# functions (those marked with __config_log_ignore___).
+_PASSTHROUGH: Final = -1
+
+# Maps a code object to the index (into _GETTERS) of the getter which last
+# successfully resolved it, or _PASSTHROUGH. A code object always belongs to
+# the same kind of callable, so once resolved the remaining getters need not
+# be tried again.
+_CODE_CACHE: dict[CodeType, int] = {}
+
+
+def _resolve_frame(fr: FrameType, co: CodeType) -> Callable[..., Any] | None:
+    r"""Resolve the function object executing in a frame.
+
+    Parameters
+    ----------
+    fr : FrameType
+        The frame to resolve.
+    co : CodeType
+        The code object of `fr`.
+
+    Returns
+    -------
+    func : Callable[..., Any] | None
+        The function object, or None if the function is a passthrough.
+
+    Raises
+    ------
+    ValueError
+        If the function object cannot be determined.
+    """
+    cached = _CODE_CACHE.get(co)
+    if cached == _PASSTHROUGH:
+        return None
+
+    order: Iterable[int] = range(len(_GETTERS))
+    if cached is not None:
+        # Try the cached getter first, but fall back to the full search in
+        # case it does not hold for this particular frame.
+        order = itertools.chain((cached,), order)
+
+    for idx in order:
+        getter = _GETTERS[idx]
+        try:
+            func = getter(fr, co)
+        except (KeyError, AttributeError):
+            continue
+        if getattr(func, "__code__", None) is not co:
+            continue
+        if getattr(func, "__config_log_ignore___", False):
+            # found a passthrough function, continue searching up the stack
+            _CODE_CACHE[co] = _PASSTHROUGH
+            return None
+        _CODE_CACHE[co] = idx
+        return func
+    raise ValueError
+
+
 def _get_calling_function_impl() -> Callable[..., Any]:
-    stack = inspect.stack()
     maxidx = 20
-    for idx in range(
-        3,  # the caller of the function that called get_calling_function()
+    # The caller of the function that called get_calling_function(). Frame 0
+    # is this function, 1 is get_calling_function(), and 2 is whoever called
+    # it.
+    start = 3
+    try:
+        fr: FrameType | None = sys._getframe(start)  # noqa: SLF001
+    except ValueError:
+        # call stack is not deep enough
+        raise ValueError from None
+
+    for _ in range(
+        start,
         maxidx,  # if anyone is more than 20 ignores deep, probably a bug
     ):
-        try:
-            fr = stack[idx].frame
-        except IndexError:
+        if fr is None:
             break
-        co = fr.f_code
-
-        getters = (
-            _gcf_function,
-            _gcf_method,
-            _gcf_classmethod,
-            _gcf_nested,
-            _gcf_functools_wraps,
-            _gcf_misc_1,
-            _gcf_misc_2,
-        )
-        for getter in getters:
-            try:
-                func = getter(fr, co)
-            except (KeyError, AttributeError):
-                continue
-            if func.__code__ != co:
-                continue
-            if getattr(func, "__config_log_ignore___", False):
-                # found a passthrough function, continue searching up the stack
-                break
+        if (func := _resolve_frame(fr, fr.f_code)) is not None:
             return func
-        else:
-            # we did not break due to ignores, so we failed to find the caller
-            break
+        fr = fr.f_back
     else:
         # We exhausted the range iterator
+        stack = "".join(traceback.format_stack(sys._getframe(1)))  # noqa: SLF001
         msg = (
             f"Iterated {maxidx} times trying to determine the calling "
             "function, but failed to find it. This is likely a bug! "
-            f"Stack: {stack}"
+            f"Stack:\n{stack}"
         )
         raise AssertionError(msg)
     raise ValueError
@@ -137,17 +196,15 @@ def get_calling_function() -> Callable[..., Any]:
     ValueError
         If the calling function cannot be determined.
     """
-    global _get_calling_function_called  # noqa: PLW0603
-
-    if _get_calling_function_called:
+    state = _get_calling_function_state
+    if getattr(state, "called", False):
         raise GetCallingFuncRecursionError
 
-    _get_calling_function_called += 1
+    state.called = True
     try:
         return _get_calling_function_impl()
     finally:
-        _get_calling_function_called -= 1
-        assert _get_calling_function_called >= 0
+        state.called = False
 
 
 def _is_classmethod(method: Any) -> bool:
@@ -163,7 +220,9 @@ def _is_classmethod(method: Any) -> bool:
     return False
 
 
-@lru_cache
+# Each distinct bound method (i.e. one per instance) is a separate cache entry,
+# so the default maxsize of 128 is easily exceeded during a configure run.
+@lru_cache(maxsize=1024)
 def classify_callable(
     fn: Callable[..., Any], *, fully_qualify: bool = True
 ) -> tuple[str, Path, int]:
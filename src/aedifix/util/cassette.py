@@ -0,0 +1,314 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Record and replay of the commands executed during configuration.
+
+When recording, the command line, environment, output, return code and wall
+time of each command are stored in a cassette file, along with the contents
+of any files the command declares as its outputs (e.g. the
+``CMakeCache.txt`` written by CMake). When replaying, the recorded results
+are served, and the outputs restored, without spawning any processes. This
+isolates the overhead of aedifix itself from that of the tools it runs.
+
+Occurrences of the project directory are stored as a placeholder, so that a
+cassette recorded in one checkout can be replayed in another.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import tempfile
+import threading
+from pathlib import Path
+from subprocess import CompletedProcess
+from typing import TYPE_CHECKING, Final, TypedDict
+
+from .exception import ReplayError, WrongOrderError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+# Bump this whenever the format of the cassette changes.
+_CASSETTE_VERSION: Final = 1
+_PROJECT_DIR: Final = "@AEDIFIX_PROJECT_DIR@"
+
+
+class CassetteEntry(TypedDict):
+    COMMAND: list[str]
+    ENV: dict[str, str | None]
+    RETURNCODE: int
+    STDOUT: str
+    STDERR: str
+    WALL: float
+    OUTPUTS: dict[str, str]
+
+
+def _environ_delta(
+    base: Mapping[str, str], environ: Mapping[str, str]
+) -> dict[str, str | None]:
+    # None marks a removed variable
+    delta: dict[str, str | None] = {
+        key: value for key, value in environ.items() if base.get(key) != value
+    }
+    delta.update((key, None) for key in base.keys() - environ.keys())
+    return delta
+
+
+class Cassette:
+    r"""Records the commands executed during configuration, or replays a
+    previous recording.
+    """
+
+    __slots__ = (
+        "_base_environ",
+        "_entries",
+        "_lock",
+        "_normalize",
+        "_path",
+        "_project_dir",
+        "_replaying",
+    )
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        project_dir: Path,
+        replay: bool = False,
+        normalize: Mapping[str, str] | None = None,
+    ) -> None:
+        r"""Construct a Cassette.
+
+        Parameters
+        ----------
+        path : Path
+            The path of the cassette file.
+        project_dir : Path
+            The project directory, replaced by a placeholder in the
+            recording.
+        replay : bool, False
+            Whether to replay `path` rather than record to it.
+        normalize : Mapping[str, str], optional
+            Substrings of the command lines to replace before recording or
+            looking them up, e.g. to ignore arguments which do not affect the
+            result of the commands.
+
+        Raises
+        ------
+        ReplayError
+            If `replay` is True, and `path` cannot be read, or is not a
+            cassette of this version of aedifix.
+
+        Notes
+        -----
+        The environment of each command is recorded as its difference to the
+        environment at the time of construction.
+        """
+        self._path = path
+        self._project_dir = str(project_dir)
+        self._replaying = replay
+        self._normalize = dict(normalize or {})
+        self._base_environ = dict(os.environ)
+        self._lock = threading.Lock()
+        self._entries: list[CassetteEntry] = []
+        if replay:
+            self._entries = self._load(path)
+
+    @staticmethod
+    def _load(path: Path) -> list[CassetteEntry]:
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError) as e:
+            msg = f"Failed to read command recording {path}: {e}"
+            raise ReplayError(msg) from e
+        if (
+            not isinstance(data, dict)
+            or data.get("VERSION") != _CASSETTE_VERSION
+        ):
+            msg = (
+                f"{path} is not a command recording of this version of "
+                "aedifix, re-record it"
+            )
+            raise ReplayError(msg)
+        return data["COMMANDS"]
+
+    @property
+    def path(self) -> Path:
+        r"""Get the path of the cassette file.
+
+        Returns
+        -------
+        path : Path
+            The path of the cassette file.
+        """
+        return self._path
+
+    @property
+    def replaying(self) -> bool:
+        r"""Get whether the cassette replays a previous recording.
+
+        Returns
+        -------
+        replaying : bool
+            True if replaying, False if recording.
+        """
+        return self._replaying
+
+    def _encode(self, value: str) -> str:
+        return value.replace(self._project_dir, _PROJECT_DIR)
+
+    def _decode(self, value: str) -> str:
+        return value.replace(_PROJECT_DIR, self._project_dir)
+
+    def _key(self, command: Iterable[object]) -> list[str]:
+        ret = []
+        for arg in command:
+            normalized = str(arg)
+            for old, new in self._normalize.items():
+                normalized = normalized.replace(old, new)
+            ret.append(self._encode(normalized))
+        return ret
+
+    def _env(self) -> dict[str, str | None]:
+        return {
+            key: None if value is None else self._encode(value)
+            for key, value in _environ_delta(
+                self._base_environ, os.environ
+            ).items()
+        }
+
+    def record(
+        self,
+        command: Sequence[object],
+        result: CompletedProcess[str],
+        *,
+        wall: float,
+        outputs: Iterable[Path] = (),
+    ) -> None:
+        r"""Record the result of a command.
+
+        Parameters
+        ----------
+        command : Sequence[object]
+            The executed command.
+        result : CompletedProcess[str]
+            The result of the command. Its output must be complete.
+        wall : float
+            The wall time of the command, in seconds.
+        outputs : Iterable[Path], optional
+            The files written by the command, whose contents to record. Files
+            which do not exist are ignored.
+
+        Raises
+        ------
+        WrongOrderError
+            If the cassette is replaying.
+        """
+        if self.replaying:
+            msg = "Cannot record to a cassette which is being replayed"
+            raise WrongOrderError(msg)
+        recorded_outputs = {}
+        for path in outputs:
+            try:
+                content = path.read_text()
+            except OSError:
+                continue
+            recorded_outputs[self._encode(str(path))] = self._encode(content)
+        entry: CassetteEntry = {
+            "COMMAND": self._key(command),
+            "ENV": self._env(),
+            "RETURNCODE": result.returncode,
+            "STDOUT": self._encode(result.stdout or ""),
+            "STDERR": self._encode(result.stderr or ""),
+            "WALL": wall,
+            "OUTPUTS": recorded_outputs,
+        }
+        with self._lock:
+            self._entries.append(entry)
+
+    def replay(self, command: Sequence[object]) -> CompletedProcess[str]:
+        r"""Replay the recorded result of a command.
+
+        Parameters
+        ----------
+        command : Sequence[object]
+            The command to replay.
+
+        Returns
+        -------
+        ret : CompletedProcess[str]
+            The recorded result of the command.
+
+        Raises
+        ------
+        ReplayError
+            If the command was not recorded with the current environment, or
+            has already been replayed as many times as it was recorded.
+
+        Notes
+        -----
+        A command recorded several times is replayed in the order of the
+        recording. The recorded outputs of the command are written back to
+        disk.
+        """
+        key = self._key(command)
+        env = self._env()
+        with self._lock:
+            for idx, entry in enumerate(self._entries):
+                if entry["COMMAND"] == key and entry["ENV"] == env:
+                    del self._entries[idx]
+                    break
+            else:
+                msg = self._replay_error_message(key, env)
+                raise ReplayError(msg)
+
+        for path, content in entry["OUTPUTS"].items():
+            out = Path(self._decode(path))
+            out.parent.mkdir(parents=True, exist_ok=True)
+            out.write_text(self._decode(content))
+        return CompletedProcess(
+            args=[str(c) for c in command],
+            returncode=entry["RETURNCODE"],
+            stdout=self._decode(entry["STDOUT"]),
+            stderr=self._decode(entry["STDERR"]),
+        )
+
+    def _replay_error_message(
+        self, key: list[str], env: dict[str, str | None]
+    ) -> str:
+        str_cmd = self._decode(" ".join(key))
+        envs = [e["ENV"] for e in self._entries if e["COMMAND"] == key]
+        if not envs:
+            return (
+                f"Command was not recorded in {self.path} (or was replayed "
+                f"more often than recorded): {str_cmd}"
+            )
+        recorded = envs[0]
+        diff = sorted(
+            name
+            for name in recorded.keys() | env.keys()
+            if (name in recorded, recorded.get(name))
+            != (name in env, env.get(name))
+        )
+        return (
+            f"Command was recorded in {self.path} with a different "
+            f"environment (differing in {', '.join(diff)}): {str_cmd}"
+        )
+
+    def write(self) -> None:
+        r"""Write the recording to the cassette file.
+
+        Raises
+        ------
+        OSError
+            If the cassette file could not be written.
+        """
+        with self._lock:
+            data = {"VERSION": _CASSETTE_VERSION, "COMMANDS": self._entries}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=self.path.parent, suffix=".tmp", delete=False
+            ) as fd:
+                json.dump(data, fd, indent=2)
+            Path(fd.name).replace(self.path)
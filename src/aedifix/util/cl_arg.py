@@ -5,21 +5,30 @@ from __future__ import annotations
 
 from typing import Generic, TypeVar
 
+from .argument_parser import DeferredDefault
+
 _T = TypeVar("_T")
 
 
 class CLArg(Generic[_T]):
     __slots__ = "_cl_set", "_name", "_value"
 
-    def __init__(self, name: str, value: _T | None, *, cl_set: bool) -> None:
+    def __init__(
+        self,
+        name: str,
+        value: _T | DeferredDefault[_T] | None,
+        *,
+        cl_set: bool,
+    ) -> None:
         r"""Construct a ``CLArg``.
 
         Parameters
         ----------
         name : str
             The name of the command line argument.
-        value : T
-            The value of the command line argument.
+        value : T | DeferredDefault[T]
+            The value of the command line argument. If deferred, it is
+            computed when first read.
         cl_set : bool
             True if the value was set by the user on the command line, False
             otherwise.
@@ -48,6 +57,8 @@ class CLArg(Generic[_T]):
         value : T
             The value of the command line argument.
         """
+        if isinstance(self._value, DeferredDefault):
+            self._value = self._value.resolve()
         return self._value
 
     @value.setter
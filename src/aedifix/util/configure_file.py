@@ -0,0 +1,132 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""A pure-Python implementation of CMake's ``configure_file()``.
+
+Only the subset of behavior used by aedifix is implemented, namely::
+
+    configure_file(<input> <output> USE_SOURCE_PERMISSIONS @ONLY)
+
+That is:
+
+- ``@VAR@`` references are replaced by the value of ``VAR``, or the empty
+  string if ``VAR`` is not defined. ``${VAR}`` references are left untouched.
+- ``#cmakedefine VAR ...`` lines become ``#define VAR ...`` if ``VAR`` is
+  not false (in the sense of CMake's ``if()``), otherwise
+  ``/* #undef VAR */``.
+- ``#cmakedefine01 VAR`` lines become ``#define VAR 1`` or ``#define VAR 0``.
+- The output file is only written if its contents would change (see
+  `write_if_changed()`), and it is given the same permissions as the input
+  file.
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+from typing import TYPE_CHECKING, Final
+
+from .write_if_changed import write_if_changed
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+# See cmMakefile::ExpandVariablesInStringNew(). The set of characters allowed
+# in an @VAR@ reference differs from those allowed in ${VAR}.
+_AT_VAR_RE: Final = re.compile(r"@([A-Za-z_0-9/.+-]+)@")
+_DEFINE_RE: Final = re.compile(r"#([ \t]*)cmakedefine[ \t]+([A-Za-z_0-9]*)")
+_DEFINE01_RE: Final = re.compile(
+    r"#([ \t]*)cmakedefine01[ \t]+([A-Za-z_0-9]*)"
+)
+
+_OFF_VALUES: Final = frozenset(
+    {"0", "off", "no", "false", "n", "ignore", "notfound", ""}
+)
+
+
+def _is_off(value: str | None) -> bool:
+    r"""Determine whether a value is false, following CMake's cmIsOff().
+
+    Parameters
+    ----------
+    value : str | None
+        The value to check, or None if the variable is undefined.
+
+    Returns
+    -------
+    off : bool
+        True if `value` is false, False otherwise.
+    """
+    if value is None:
+        return True
+    folded = value.casefold()
+    return folded in _OFF_VALUES or folded.endswith("-notfound")
+
+
+def _configure_line(line: str, defs: Mapping[str, str]) -> str:
+    if m := _DEFINE_RE.search(line):
+        indent, var = m.groups()
+        if _is_off(defs.get(var)):
+            line = f"/* #undef {var} */"
+        else:
+            line = line.replace(f"#{indent}cmakedefine", f"#{indent}define")
+    elif m := _DEFINE01_RE.search(line):
+        indent, var = m.groups()
+        line = line.replace(f"#{indent}cmakedefine01", f"#{indent}define")
+        line += " 0" if _is_off(defs.get(var)) else " 1"
+
+    return _AT_VAR_RE.sub(lambda mv: defs.get(mv[1], ""), line)
+
+
+def configure_string(text: str, defs: Mapping[str, str]) -> str:
+    r"""Configure a string as CMake's ``configure_file(... @ONLY)`` would.
+
+    Parameters
+    ----------
+    text : str
+        The template text.
+    defs : Mapping[str, str]
+        The variable definitions to substitute.
+
+    Returns
+    -------
+    configured : str
+        The configured text.
+    """
+    lines = text.split("\n")
+    if not lines[-1]:
+        # Either the text ends with a newline, or is empty.
+        lines.pop()
+    # CMake newline-terminates every line, including the last one.
+    return "".join(
+        _configure_line(line.removesuffix("\r"), defs) + "\n" for line in lines
+    )
+
+
+def configure_file(
+    src_file: Path, dest_file: Path, defs: Mapping[str, str]
+) -> bool:
+    r"""Configure a file as CMake's
+    ``configure_file(... USE_SOURCE_PERMISSIONS @ONLY)`` would.
+
+    Parameters
+    ----------
+    src_file : Path
+        The template file.
+    dest_file : Path
+        The output file.
+    defs : Mapping[str, str]
+        The variable definitions to substitute.
+
+    Returns
+    -------
+    written : bool
+        True if `dest_file` was (re-)written, False if it was already up to
+        date.
+    """
+    text = configure_string(src_file.read_text(), defs)
+    dest_file.parent.mkdir(parents=True, exist_ok=True)
+    written = write_if_changed(dest_file, text)
+    shutil.copymode(src_file, dest_file)
+    return written
@@ -57,3 +57,9 @@ class CommandError(BaseError):
             f"{stderr}",
         )
         return "\n".join(lines)
+
+
+class ReplayError(BaseError):
+    r"""An error raised when a command cannot be replayed from a recording,
+    e.g. because it was never recorded.
+    """
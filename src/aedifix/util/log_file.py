@@ -0,0 +1,377 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""The on-disk configure log.
+
+With high CMake debug levels (e.g. ``--trace-expand``) the log can grow to
+several GB, so it may be compressed as it is written, and capped in size. It
+is also shared (rather than copied) with the arch directory whenever the
+filesystem allows it.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import gzip
+import lzma
+import shutil
+import logging
+from collections import deque
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, cast
+
+if TYPE_CHECKING:
+    from io import TextIOWrapper
+    from typing import Literal
+
+_GZIP_LEVEL: Final = 6
+# Higher presets compress logs only marginally better, at a fraction of the
+# speed.
+_XZ_PRESET: Final = 2
+# From linux/fs.h
+_FICLONE: Final = 0x40049409
+
+_SIZE_RE: Final = re.compile(
+    r"^\s*(\d+)\s*([kmgt]?)(?:i?b)?\s*$", flags=re.IGNORECASE
+)
+_SIZE_UNITS: Final = {
+    "": 1,
+    "k": 1 << 10,
+    "m": 1 << 20,
+    "g": 1 << 30,
+    "t": 1 << 40,
+}
+
+
+class LogCompression(Enum):
+    NONE = "none"
+    GZIP = "gzip"
+    XZ = "xz"
+
+    def __str__(self) -> str:
+        return self.value
+
+    @classmethod
+    def from_string(cls, str_val: str) -> LogCompression:
+        r"""Convert a string to a LogCompression.
+
+        Parameters
+        ----------
+        str_val : str
+            The name of the compression, e.g. 'gzip'. Case-insensitive.
+
+        Returns
+        -------
+        LogCompression
+            The compression.
+
+        Raises
+        ------
+        ValueError
+            If `str_val` does not name a compression.
+        """
+        try:
+            return cls(str_val.strip().casefold())
+        except ValueError as ve:
+            msg = f"Unknown log compression: {str_val!r}"
+            raise ValueError(msg) from ve
+
+    @property
+    def suffix(self) -> str:
+        r"""Get the file suffix of the compression.
+
+        Returns
+        -------
+        suffix : str
+            The suffix, e.g. '.gz', or the empty string if uncompressed.
+        """
+        match self:
+            case LogCompression.NONE:
+                return ""
+            case LogCompression.GZIP:
+                return ".gz"
+            case LogCompression.XZ:
+                return ".xz"
+
+    def open(self, path: Path, mode: Literal["wt", "at"]) -> TextIOWrapper:
+        r"""Open a file for writing with this compression.
+
+        Parameters
+        ----------
+        path : Path
+            The path of the file.
+        mode : {'wt', 'at'}
+            Whether to truncate or append to the file.
+
+        Returns
+        -------
+        file : TextIOWrapper
+            The opened file.
+
+        Notes
+        -----
+        Appending to a compressed file adds a new compressed stream to it.
+        Both gzip and xz transparently decompress such files as a whole.
+        """
+        match self:
+            case LogCompression.NONE:
+                return path.open(mode, encoding="utf-8")
+            case LogCompression.GZIP:
+                return gzip.open(
+                    path, mode, compresslevel=_GZIP_LEVEL, encoding="utf-8"
+                )
+            case LogCompression.XZ:
+                return lzma.open(  # type: ignore[return-value]
+                    path, mode, preset=_XZ_PRESET, encoding="utf-8"
+                )
+
+
+def parse_size(str_val: str) -> int:
+    r"""Parse a size in bytes.
+
+    Parameters
+    ----------
+    str_val : str
+        The size, optionally followed by a (binary, case-insensitive) unit,
+        e.g. '4096', '512K', '2GiB'.
+
+    Returns
+    -------
+    size : int
+        The size in bytes.
+
+    Raises
+    ------
+    ValueError
+        If `str_val` is not a valid size, or is not positive.
+    """
+    if (re_match := _SIZE_RE.match(str_val)) is None:
+        msg = f"Invalid size: {str_val!r}"
+        raise ValueError(msg)
+    size = int(re_match[1]) * _SIZE_UNITS[re_match[2].casefold()]
+    if size <= 0:
+        msg = f"Size must be positive: {str_val!r}"
+        raise ValueError(msg)
+    return size
+
+
+class LogFileHandler(logging.FileHandler):
+    r"""A logging handler writing to an optionally compressed, optionally
+    size-capped file.
+    """
+
+    __slots__ = (
+        "_compression",
+        "_head_full",
+        "_head_left",
+        "_max_size",
+        "_omitted",
+        "_opened",
+        "_tail",
+        "_tail_left",
+    )
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        compression: LogCompression = LogCompression.NONE,
+        max_size: int | None = None,
+    ) -> None:
+        r"""Construct a LogFileHandler.
+
+        Parameters
+        ----------
+        path : Path
+            The path of the log file. The suffix of `compression` is appended
+            to it.
+        compression : LogCompression, LogCompression.NONE
+            The compression of the log file.
+        max_size : int, optional
+            The maximum (uncompressed) size of the log, in bytes. Once
+            reached, only the last messages totalling half of the size are
+            kept, and written when the handler is closed. If not given, the
+            size is unlimited.
+
+        Raises
+        ------
+        ValueError
+            If `max_size` is not positive.
+
+        Notes
+        -----
+        The file is not created until the first message is written. Any
+        existing file is replaced, rather than truncated, since it may be
+        shared with a copy made by `clone_file()`.
+
+        Uncompressed logs are flushed after every message. Compressed logs
+        are only complete once the handler is closed, but messages written
+        after closing are appended in a new compressed stream.
+        """
+        if max_size is not None and max_size <= 0:
+            msg = f"Maximum log size must be positive, have {max_size}"
+            raise ValueError(msg)
+        self._compression = compression
+        self._max_size = max_size
+        self._head_full = False
+        self._head_left = 0 if max_size is None else max_size - max_size // 2
+        self._tail: deque[tuple[str, int]] = deque()
+        self._tail_left = 0 if max_size is None else max_size // 2
+        self._omitted = 0
+        self._opened = False
+        path = path.with_name(path.name + compression.suffix)
+        super().__init__(path, mode="w", encoding="utf-8", delay=True)
+
+    @property
+    def compression(self) -> LogCompression:
+        r"""Get the compression of the log file.
+
+        Returns
+        -------
+        compression : LogCompression
+            The compression.
+        """
+        return self._compression
+
+    @property
+    def max_size(self) -> int | None:
+        r"""Get the maximum size of the log.
+
+        Returns
+        -------
+        max_size : int | None
+            The maximum (uncompressed) size in bytes, or None if unlimited.
+        """
+        return self._max_size
+
+    def _open(self) -> TextIOWrapper:
+        path = Path(self.baseFilename)
+        if self._opened:
+            return self.compression.open(path, "at")
+        path.unlink(missing_ok=True)
+        self._opened = True
+        return self.compression.open(path, "wt")
+
+    def _get_stream(self) -> TextIOWrapper:
+        # The stream is None until the first write, and after closing
+        if (stream := cast("TextIOWrapper | None", self.stream)) is None:
+            stream = self.stream = self._open()
+        return stream
+
+    def _push_tail(self, msg: str, size: int) -> None:
+        tail = self._tail
+        tail.append((msg, size))
+        self._tail_left -= size
+        while self._tail_left < 0:
+            _, dropped = tail.popleft()
+            self._tail_left += dropped
+            self._omitted += dropped
+
+    def _write_tail(self) -> None:
+        if not (self._tail or self._omitted):
+            return
+        stream = self._get_stream()
+        if self._omitted:
+            stream.write(
+                f"[... {self._omitted} bytes omitted, the log is capped at "
+                f"{self._max_size} bytes ...]{self.terminator}"
+            )
+            self._omitted = 0
+        stream.writelines(msg for msg, _ in self._tail)
+        self._tail.clear()
+        self._tail_left = (self._max_size or 0) // 2
+
+    def emit(self, record: logging.LogRecord) -> None:
+        r"""Write a log record.
+
+        Parameters
+        ----------
+        record : logging.LogRecord
+            The record to write.
+        """
+        try:
+            msg = self.format(record) + self.terminator
+            if self._max_size is not None:
+                size = len(msg) if msg.isascii() else len(msg.encode())
+                if self._head_full or size > self._head_left:
+                    # Once a message misses the head, all later ones must
+                    # also miss it, to keep the messages in order.
+                    self._head_full = True
+                    self._push_tail(msg, size)
+                    return
+                self._head_left -= size
+            stream = self._get_stream()
+            stream.write(msg)
+            if self.compression == LogCompression.NONE:
+                # Flushing a compressed stream hurts the compression ratio
+                stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        r"""Write any kept messages, and close the log file."""
+        with self.lock:  # type: ignore[union-attr]
+            try:
+                self._write_tail()
+            finally:
+                super().close()
+
+
+def _reflink(src: Path, dest: Path) -> None:
+    import fcntl
+
+    with src.open("rb") as src_fd, dest.open("wb") as dest_fd:
+        fcntl.ioctl(dest_fd.fileno(), _FICLONE, src_fd.fileno())
+
+
+def _clone(src: Path, dest: Path) -> None:
+    try:
+        os.link(src, dest)
+        return  # noqa: TRY300
+    except OSError:
+        pass
+    if sys.platform == "linux":
+        try:
+            _reflink(src, dest)
+            return  # noqa: TRY300
+        except OSError:
+            pass
+    shutil.copy2(src, dest)
+
+
+def clone_file(src: Path, dest: Path) -> Path:
+    r"""Copy a file, sharing its data with the original where possible.
+
+    Parameters
+    ----------
+    src : Path
+        The file to copy.
+    dest : Path
+        The destination. Any existing file is replaced.
+
+    Returns
+    -------
+    dest : Path
+        The destination.
+
+    Notes
+    -----
+    A hard link is tried first, then (on Linux) a copy-on-write reflink, and
+    finally a regular copy. Neither of the first two copies any data. Note
+    that a hard link shares all future writes to `src` with `dest`. Writers
+    which must not do so should replace the file instead of truncating it,
+    see `LogFileHandler`.
+    """
+    tmp = dest.with_name(f".{dest.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        _clone(src, tmp)
+    except:
+        tmp.unlink(missing_ok=True)
+        raise
+    return tmp.replace(dest)
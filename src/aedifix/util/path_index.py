@@ -0,0 +1,160 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""A process-wide index of the executables on ``PATH``.
+
+``shutil.which()`` stats every ``PATH`` entry for every lookup. When ``PATH``
+is long, and lives on a network filesystem, dozens of lookups become
+noticeably slow. Instead, each directory is listed (once, and only when
+needed) and all lookups are answered from the listing.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING, Final
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+_EXEC_MODE: Final = os.F_OK | os.X_OK
+
+
+def _is_executable(path: str) -> bool:
+    # Same check as shutil.which()
+    return (
+        os.path.exists(path)  # noqa: PTH110
+        and os.access(path, _EXEC_MODE)
+        and not os.path.isdir(path)  # noqa: PTH112
+    )
+
+
+class PathIndex:
+    r"""An index of the executables in a search path."""
+
+    __slots__ = "_dirs", "_entries", "_lock", "_path"
+
+    def __init__(self, path: str) -> None:
+        r"""Construct a PathIndex.
+
+        Parameters
+        ----------
+        path : str
+            The search path, in the format of the ``PATH`` environment
+            variable.
+
+        Notes
+        -----
+        No directory is listed on construction. Each directory is listed the
+        first time a lookup needs to search it.
+        """
+        self._path = path
+        # An empty entry means the current directory, and the first of any
+        # duplicate entries shadows the rest.
+        self._dirs = tuple(
+            dict.fromkeys(d or os.curdir for d in path.split(os.pathsep))
+        )
+        self._entries: dict[str, frozenset[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> str:
+        r"""Get the search path.
+
+        Returns
+        -------
+        path : str
+            The search path indexed by this object.
+        """
+        return self._path
+
+    def _listing(self, directory: str) -> frozenset[str]:
+        with self._lock:
+            if (entries := self._entries.get(directory)) is None:
+                try:
+                    with os.scandir(directory) as it:
+                        entries = frozenset(entry.name for entry in it)
+                except OSError:
+                    entries = frozenset()
+                self._entries[directory] = entries
+        return entries
+
+    def which(self, name: str | Path) -> str | None:
+        r"""Locate an executable.
+
+        Parameters
+        ----------
+        name : str | Path
+            The name of the executable.
+
+        Returns
+        -------
+        path : str | None
+            The path to the executable, or None if it was not found.
+
+        Notes
+        -----
+        Behaves as ``shutil.which(name)``. In particular, if `name` contains a
+        directory component, it is checked directly, and the search path is
+        not consulted.
+        """
+        name = os.fspath(name)
+        if os.path.dirname(name):  # noqa: PTH120
+            return name if _is_executable(name) else None
+
+        for directory in self._dirs:
+            if name not in self._listing(directory):
+                continue
+            candidate = os.path.join(directory, name)  # noqa: PTH118
+            if _is_executable(candidate):
+                return candidate
+        return None
+
+    def invalidate(self) -> None:
+        r"""Discard all directory listings, for example after installing a
+        new executable.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+_INDEX: PathIndex | None = None
+_INDEX_LOCK: Final = threading.Lock()
+
+
+def path_index() -> PathIndex:
+    r"""Get the process-wide index of the current ``PATH``.
+
+    Returns
+    -------
+    index : PathIndex
+        The index. It is rebuilt whenever the value of ``PATH`` changes.
+    """
+    global _INDEX  # noqa: PLW0603
+
+    path = os.environ.get("PATH", os.defpath)
+    with _INDEX_LOCK:
+        if _INDEX is None or _INDEX.path != path:
+            _INDEX = PathIndex(path)
+        return _INDEX
+
+
+def which(name: str | Path) -> str | None:
+    r"""Locate an executable on ``PATH``.
+
+    Parameters
+    ----------
+    name : str | Path
+        The name of the executable.
+
+    Returns
+    -------
+    path : str | None
+        The path to the executable, or None if it was not found.
+
+    Notes
+    -----
+    A drop-in replacement for ``shutil.which(name)``, see `PathIndex.which()`.
+    """
+    return path_index().which(name)
@@ -0,0 +1,291 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Resource accounting of the subprocesses launched during configuration.
+
+The CPU time, I/O and peak memory of each subprocess (including all of its
+descendants) are taken from the ``rusage`` reported by ``wait4()`` when it is
+reaped. Since ``ru_maxrss`` only records the largest single process, the
+total memory of the process tree is also sampled from ``/proc`` while it
+runs, where available.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from resource import struct_rusage
+
+# The interval between two samples of a running process tree, in seconds.
+# Each sample reads two small files per process, so this is cheap even for
+# heavily parallel commands.
+_SAMPLE_INTERVAL: Final = 0.25
+_PROC: Final = Path("/proc")
+# ru_maxrss is in bytes on macOS, and KiB everywhere else
+_MAXRSS_UNIT: Final = 1 if sys.platform == "darwin" else 1 << 10
+# On Linux, ru_inblock and ru_oublock count 512-byte units of storage I/O. On
+# other platforms they count I/O operations of unknown size.
+_BLOCK_SIZE: Final = 512 if sys.platform == "linux" else None
+
+
+def format_bytes(size: float) -> str:
+    r"""Format a size for humans.
+
+    Parameters
+    ----------
+    size : float
+        The size, in bytes.
+
+    Returns
+    -------
+    size : str
+        The formatted size, using binary units, e.g. '1.5 MiB'.
+    """
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < (1 << 10):
+            return f"{size:.0f} B" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1 << 10
+    return f"{size:.1f} TiB"
+
+
+@dataclass(slots=True, frozen=True)
+class ResourceUsage:
+    r"""The resources used by a subprocess and all of its descendants."""
+
+    wall: float
+    """The time from launching the process to reaping it, in seconds."""
+
+    user: float
+    """The CPU time spent in user mode, in seconds."""
+
+    system: float
+    """The CPU time spent in kernel mode, in seconds."""
+
+    max_rss: int
+    """The peak resident set size, in bytes. The larger of that of the
+    largest single process, and the sampled total of the process tree."""
+
+    read_bytes: int | None
+    """The bytes read from storage (including network filesystems), or None
+    if unknown on this platform."""
+
+    write_bytes: int | None
+    """The bytes written to storage, or None if unknown on this platform."""
+
+    @classmethod
+    def from_rusage(
+        cls, rusage: struct_rusage, *, wall: float, sampled_rss: int = 0
+    ) -> ResourceUsage:
+        r"""Construct a ResourceUsage from the result of `os.wait4()`.
+
+        Parameters
+        ----------
+        rusage : resource.struct_rusage
+            The resource usage of the reaped process.
+        wall : float
+            The wall time of the process, in seconds.
+        sampled_rss : int, 0
+            The sampled peak resident set size of the process tree, in
+            bytes, see `ProcSampler`.
+
+        Returns
+        -------
+        usage : ResourceUsage
+            The resource usage.
+        """
+        read_bytes = write_bytes = None
+        if _BLOCK_SIZE is not None:
+            read_bytes = rusage.ru_inblock * _BLOCK_SIZE
+            write_bytes = rusage.ru_oublock * _BLOCK_SIZE
+        return cls(
+            wall=wall,
+            user=rusage.ru_utime,
+            system=rusage.ru_stime,
+            max_rss=max(rusage.ru_maxrss * _MAXRSS_UNIT, sampled_rss),
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+        )
+
+    @classmethod
+    def total(cls, usages: Iterable[ResourceUsage]) -> ResourceUsage:
+        r"""Compute the total resource usage of several subprocesses.
+
+        Parameters
+        ----------
+        usages : Iterable[ResourceUsage]
+            The resource usage of each subprocess.
+
+        Returns
+        -------
+        total : ResourceUsage
+            The sum of the times and I/O, and the largest of the peak
+            resident set sizes.
+
+        Notes
+        -----
+        The subprocesses may have run concurrently, so the total wall time
+        may exceed the elapsed time.
+        """
+        usages = list(usages)
+
+        def sum_io(values: Iterable[int | None]) -> int | None:
+            values = list(values)
+            if None in values:
+                return None
+            return sum(v for v in values if v is not None)
+
+        return cls(
+            wall=sum(u.wall for u in usages),
+            user=sum(u.user for u in usages),
+            system=sum(u.system for u in usages),
+            max_rss=max((u.max_rss for u in usages), default=0),
+            read_bytes=sum_io(u.read_bytes for u in usages),
+            write_bytes=sum_io(u.write_bytes for u in usages),
+        )
+
+    @property
+    def cpu(self) -> float:
+        r"""Get the total CPU time.
+
+        Returns
+        -------
+        cpu : float
+            The sum of the user and system CPU time, in seconds.
+        """
+        return self.user + self.system
+
+    def to_dict(self) -> dict[str, Any]:
+        r"""Convert the resource usage to a JSON-serializable dict.
+
+        Returns
+        -------
+        usage : dict[str, Any]
+            The fields of the resource usage.
+        """
+        return asdict(self)
+
+    def __str__(self) -> str:
+        ret = [
+            f"wall {self.wall:.2f} s",
+            f"user {self.user:.2f} s",
+            f"sys {self.system:.2f} s",
+            f"max RSS {format_bytes(self.max_rss)}",
+        ]
+        if self.read_bytes is not None:
+            ret.append(f"read {format_bytes(self.read_bytes)}")
+        if self.write_bytes is not None:
+            ret.append(f"written {format_bytes(self.write_bytes)}")
+        return ", ".join(ret)
+
+
+def _read_tree_rss(pid: int, page_size: int) -> int:
+    # Only the children of the main thread are listed, which covers every
+    # build tool we run.
+    rss = 0
+    pending = [pid]
+    while pending:
+        proc_dir = _PROC / str(pending.pop())
+        try:
+            rss += int((proc_dir / "statm").read_text().split()[1])
+            children = (
+                proc_dir / "task" / proc_dir.name / "children"
+            ).read_text()
+        except (OSError, IndexError, ValueError):
+            # Exited in the meantime
+            continue
+        pending.extend(map(int, children.split()))
+    return rss * page_size
+
+
+class ProcSampler:
+    r"""Periodically samples the memory of a running process tree from
+    ``/proc``.
+    """
+
+    __slots__ = "_interval", "_peak", "_pid", "_stop", "_thread"
+
+    def __init__(
+        self, pid: int, *, interval: float = _SAMPLE_INTERVAL
+    ) -> None:
+        r"""Construct a ProcSampler.
+
+        Parameters
+        ----------
+        pid : int
+            The pid of the root of the process tree.
+        interval : float, optional
+            The interval between two samples, in seconds.
+        """
+        self._pid = pid
+        self._interval = interval
+        self._peak = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @staticmethod
+    def supported() -> bool:
+        r"""Get whether sampling is supported on this platform.
+
+        Returns
+        -------
+        supported : bool
+            True if ``/proc`` exposes the memory of processes, False
+            otherwise.
+        """
+        return (_PROC / "self" / "statm").exists()
+
+    @property
+    def peak_rss(self) -> int:
+        r"""Get the peak resident set size sampled so far.
+
+        Returns
+        -------
+        peak_rss : int
+            The largest total resident set size of the process tree, in
+            bytes, or 0 if nothing was sampled.
+        """
+        return self._peak
+
+    def _run(self) -> None:
+        page_size = os.sysconf("SC_PAGE_SIZE")
+        while True:
+            self._peak = max(self._peak, _read_tree_rss(self._pid, page_size))
+            if self._stop.wait(self._interval):
+                return
+
+    def start(self) -> None:
+        r"""Start sampling, in a background thread. Does nothing if
+        sampling is not supported.
+        """
+        if self._thread is not None or not self.supported():
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="aedifix-proc-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> int:
+        r"""Stop sampling.
+
+        Returns
+        -------
+        peak_rss : int
+            The peak resident set size, see `peak_rss`.
+
+        Notes
+        -----
+        Must be called before the process is reaped, since its pid may be
+        reused afterwards.
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.peak_rss
@@ -0,0 +1,231 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""A timeline of the configuration, in the Chrome trace event format.
+
+The resulting file can be viewed in ``chrome://tracing`` or
+https://ui.perfetto.dev.
+"""
+
+from __future__ import annotations
+
+import os
+import json
+import time
+import threading
+import contextlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+TraceEvent = dict[str, Any]
+
+
+class Tracer:
+    r"""Records the spans of time taken by each part of the configuration."""
+
+    __slots__ = (
+        "_enabled",
+        "_events",
+        "_lock",
+        "_pid",
+        "_processes",
+        "_threads",
+    )
+
+    def __init__(self, *, enabled: bool = True) -> None:
+        r"""Construct a Tracer.
+
+        Parameters
+        ----------
+        enabled : bool, True
+            Whether to record anything. If False, all spans are no-ops.
+        """
+        self._enabled = enabled
+        self._pid = os.getpid()
+        self._events: list[TraceEvent] = []
+        self._threads: dict[int, str] = {}
+        self._processes = {self._pid: "aedifix"}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        r"""Get whether the tracer records anything.
+
+        Returns
+        -------
+        enabled : bool
+            True if the tracer is enabled, False otherwise.
+        """
+        return self._enabled
+
+    @property
+    def events(self) -> list[TraceEvent]:
+        r"""Get the recorded events.
+
+        Returns
+        -------
+        events : list[TraceEvent]
+            A copy of the recorded events, including the metadata events
+            naming each process and thread.
+        """
+        with self._lock:
+            events = list(self._events)
+            processes = dict(self._processes)
+            threads = dict(self._threads)
+        events.extend(
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": name},
+            }
+            for pid, name in processes.items()
+        )
+        events.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in threads.items()
+        )
+        return events
+
+    @property
+    def spans(self) -> list[TraceEvent]:
+        r"""Get the spans recorded by this process.
+
+        Returns
+        -------
+        spans : list[TraceEvent]
+            A copy of the spans recorded by `span()`, excluding any merged
+            events.
+        """
+        with self._lock:
+            return [
+                e
+                for e in self._events
+                if e["ph"] == "X" and e["pid"] == self._pid
+            ]
+
+    @staticmethod
+    def now() -> int:
+        r"""Get the current trace timestamp.
+
+        Returns
+        -------
+        now : int
+            The current time, in microseconds.
+
+        Notes
+        -----
+        Uses the monotonic clock, which is also used by CMake's profiling
+        output, so that the two can be merged without adjustment.
+        """
+        return time.monotonic_ns() // 1_000
+
+    @contextlib.contextmanager
+    def span(
+        self, name: str, *, category: str, args: dict[str, Any] | None = None
+    ) -> Iterator[dict[str, Any]]:
+        r"""Record the time taken by a block of code.
+
+        Parameters
+        ----------
+        name : str
+            The name of the span.
+        category : str
+            The category of the span, e.g. 'phase' or 'command'.
+        args : dict[str, Any], optional
+            Additional JSON-serializable information to attach to the span.
+
+        Yields
+        ------
+        args : dict[str, Any]
+            The additional information of the span, which may be updated
+            with results only known once the block has run.
+        """
+        args = {} if args is None else dict(args)
+        if not self.enabled:
+            yield args
+            return
+
+        start = self.now()
+        try:
+            yield args
+        finally:
+            tid = threading.get_native_id()
+            event: TraceEvent = {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": start,
+                "dur": self.now() - start,
+                "pid": self._pid,
+                "tid": tid,
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                self._events.append(event)
+                self._threads[tid] = threading.current_thread().name
+
+    def merge(
+        self,
+        events: Iterable[TraceEvent],
+        *,
+        process_name: str,
+        start: int,
+        end: int,
+    ) -> None:
+        r"""Merge the events of another trace, for example one produced by a
+        subprocess.
+
+        Parameters
+        ----------
+        events : Iterable[TraceEvent]
+            The events to merge.
+        process_name : str
+            The name under which to show the processes of the events.
+        start : int
+            The timestamp before which the events cannot have started.
+        end : int
+            The timestamp after which the events cannot have ended.
+
+        Notes
+        -----
+        If the events do not fall within [`start`, `end`], they were recorded
+        with a different clock, and are shifted to begin at `start`.
+        """
+        if not self.enabled:
+            return
+
+        events = [e for e in events if isinstance(e.get("ts"), (int, float))]
+        if not events:
+            return
+        first = min(e["ts"] for e in events)
+        last = max(e["ts"] + e.get("dur", 0) for e in events)
+        if first < start or last > end:
+            shift = start - first
+            events = [{**e, "ts": e["ts"] + shift} for e in events]
+        with self._lock:
+            self._events.extend(events)
+            for e in events:
+                if (pid := e.get("pid")) is not None:
+                    self._processes.setdefault(pid, process_name)
+
+    def write(self, path: Path) -> None:
+        r"""Write the trace to disk.
+
+        Parameters
+        ----------
+        path : Path
+            The path of the trace file.
+        """
+        trace = {"traceEvents": self.events, "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(trace))
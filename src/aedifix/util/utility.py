@@ -3,10 +3,16 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import io
+import os
 import re
 import enum
-import shlex
+import time
+import codecs
+import locale
+import selectors
 import subprocess
+from collections import deque
 from pathlib import Path
 from signal import SIGINT
 from subprocess import (
@@ -15,11 +21,12 @@ from subprocess import (
     CalledProcessError,
     CompletedProcess,
     Popen,
-    TimeoutExpired,
 )
 from typing import TYPE_CHECKING, Any, Final, TypeVar
 
+from .configure_file import configure_file
 from .exception import CommandError
+from .resource_usage import ProcSampler, ResourceUsage
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Iterable, Sequence
@@ -109,74 +116,217 @@ def subprocess_capture_output(
     return ret
 
 
-def _normalize_output(output: bytes | None | str) -> str:
-    match output:
-        case None:
-            return ""
-        case str():
-            return output
-        case bytes():
-            return output.decode()
+# Size of each read() from the subprocess pipes. Large enough that verbose
+# CMake output (e.g. --trace-expand) is consumed in few system calls.
+_PIPE_READ_SIZE: Final = 1 << 16
+
+
+class _StreamReader:
+    r"""Decode a subprocess pipe incrementally into complete lines."""
+
+    __slots__ = "_chunks", "_decoder", "_pending", "_tail"
+
+    def __init__(self, encoding: str, tail_lines: int | None) -> None:
+        r"""Construct a _StreamReader.
+
+        Parameters
+        ----------
+        encoding : str
+            The encoding of the stream.
+        tail_lines : int | None
+            The number of trailing lines to retain, or None to retain the
+            entire stream.
+        """
+        self._decoder = io.IncrementalNewlineDecoder(
+            codecs.getincrementaldecoder(encoding)(errors="replace"),
+            translate=True,
+        )
+        self._pending = ""
+        self._chunks: list[str] | None = None
+        self._tail: deque[str] | None = None
+        if tail_lines is None:
+            self._chunks = []
+        else:
+            self._tail = deque(maxlen=tail_lines)
+
+    def feed(self, data: bytes, *, final: bool = False) -> str:
+        r"""Feed raw data read from the stream.
+
+        Parameters
+        ----------
+        data : bytes
+            The data read from the stream.
+        final : bool, False
+            True if the stream has reached EOF, False otherwise.
+
+        Returns
+        -------
+        lines : str
+            The newly completed lines (including their newlines), if any.
+            When `final` is True, any trailing partial line is included.
+        """
+        text = self._pending + self._decoder.decode(data, final=final)
+        if final:
+            complete, self._pending = text, ""
+        else:
+            idx = text.rfind("\n") + 1
+            complete, self._pending = text[:idx], text[idx:]
+
+        if complete:
+            if self._chunks is not None:
+                self._chunks.append(complete)
+            else:
+                assert self._tail is not None
+                self._tail.extend(complete.splitlines(keepends=True))
+        return complete
+
+    @property
+    def output(self) -> str:
+        r"""Get the retained output of the stream.
+
+        Returns
+        -------
+        output : str
+            The full output, or the last lines of it if the reader was
+            constructed with a line limit.
+        """
+        if self._chunks is not None:
+            return "".join(self._chunks)
+        assert self._tail is not None
+        return "".join(self._tail)
+
+
+def _pump_streams(
+    process: Popen[bytes],
+    callback: Callable[[str, str], None],
+    stdout: _StreamReader,
+    stderr: _StreamReader,
+) -> None:
+    readers: dict[int, _StreamReader] = {}
+    with selectors.DefaultSelector() as selector:
+        for stream, reader in (
+            (process.stdout, stdout),
+            (process.stderr, stderr),
+        ):
+            if stream is not None:
+                fd = stream.fileno()
+                os.set_blocking(fd, False)
+                selector.register(fd, selectors.EVENT_READ)
+                readers[fd] = reader
+
+        while readers:
+            for key, _ in selector.select():
+                fd = key.fd
+                reader = readers[fd]
+                try:
+                    data = os.read(fd, _PIPE_READ_SIZE)
+                except BlockingIOError:
+                    continue
+                if data:
+                    lines = reader.feed(data)
+                else:
+                    # EOF
+                    lines = reader.feed(b"", final=True)
+                    selector.unregister(fd)
+                    del readers[fd]
+                if lines:
+                    if reader is stdout:
+                        callback(lines, "")
+                    else:
+                        callback("", lines)
+
+
+def _reap(
+    process: Popen[bytes], sampler: ProcSampler, start: float
+) -> ResourceUsage:
+    sampler.stop()
+    _, status, rusage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - start
+    # Let Popen know the process is gone, so that it does not wait for it
+    # again.
+    process.returncode = os.waitstatus_to_exitcode(status)
+    return ResourceUsage.from_rusage(
+        rusage, wall=wall, sampled_rss=sampler.peak_rss
+    )
 
 
 def subprocess_capture_output_live_impl(
-    callback: Callable[[str, str], None], *args: Any, **kwargs: Any
+    callback: Callable[[str, str], None],
+    *args: Any,
+    tail_lines: int | None = None,
+    usage_callback: Callable[[ResourceUsage], None] | None = None,
+    **kwargs: Any,
 ) -> CompletedProcess[str]:
+    r"""Execute a subprocess, streaming its output to a callback.
+
+    Parameters
+    ----------
+    callback : Callable[[str, str], None]
+        The callback to execute with newly completed lines of stdout and
+        stderr respectively.
+    *args : Any
+        Positional arguments to Popen.
+    tail_lines : int, optional
+        If given, only the last `tail_lines` lines of each stream are
+        retained in the returned object. Otherwise the full output is
+        retained.
+    usage_callback : Callable[[ResourceUsage], None], optional
+        The callback to execute with the resource usage of the subprocess,
+        once it has exited.
+    **kwargs : Any
+        Keyword arguments to Popen.
+
+    Returns
+    -------
+    ret : CompletedProcess
+        The object representing the subprocess results.
+
+    Notes
+    -----
+    Output is read as soon as it becomes available and delivered to
+    `callback` one batch of complete lines at a time. Partial lines are held
+    back until they are completed, or the stream is closed.
+    """
     kwargs.setdefault("stdout", PIPE)
     kwargs.setdefault("stderr", STDOUT)
-    kwargs["universal_newlines"] = True
-    kwargs["text"] = True
-
-    timeout = kwargs.pop("timeout", 1)
+    for key in ("text", "universal_newlines", "errors"):
+        kwargs.pop(key, None)
+    encoding = kwargs.pop("encoding", None) or locale.getpreferredencoding(
+        do_setlocale=False
+    )
 
-    total_stdout_len = 0
-    total_stderr_len = 0
-    stdout = ""
-    stderr = ""
+    stdout = _StreamReader(encoding, tail_lines)
+    stderr = _StreamReader(encoding, tail_lines)
 
+    start = time.perf_counter()
     with Popen(*args, **kwargs) as process:
-        done = False
-        while not done:
-            try:
-                stdout, stderr = process.communicate(timeout=timeout)
-            except TimeoutExpired as te_exn:
-                stdout = _normalize_output(te_exn.stdout)
-                stderr = _normalize_output(te_exn.stderr)
-            except KeyboardInterrupt:
-                process.send_signal(SIGINT)
-                raise
-            except:
-                process.kill()
-                raise
-            else:
-                # Don't break, instead wait for end of loop, in case stdout
-                # and/or stderr were updated.
-                done = True
-                stderr = _normalize_output(stderr)
-                stdout = _normalize_output(stdout)
-
-            # The streams will always contain the sum-total output of the
-            # subprocess call, so we need to strip the stuff we've already
-            # "seen" from the output before sending it to the callback.
-            new_stdout = stdout[total_stdout_len:]
-            new_stderr = stderr[total_stderr_len:]
-            if new_stdout or new_stderr:
-                # Now we replace the complete stdout
-                total_stdout_len = len(stdout)
-                total_stderr_len = len(stderr)
-                callback(new_stdout, new_stderr)
-
-        retcode = process.poll()
-        if retcode is None:
-            retcode = 0
-
-    return CompletedProcess(process.args, retcode, stdout, stderr)
+        sampler = ProcSampler(process.pid)
+        try:
+            sampler.start()
+            _pump_streams(process, callback, stdout, stderr)
+            usage = _reap(process, sampler, start)
+        except KeyboardInterrupt:
+            process.send_signal(SIGINT)
+            raise
+        except:
+            process.kill()
+            raise
+        finally:
+            sampler.stop()
+
+    if usage_callback is not None:
+        usage_callback(usage)
+    return CompletedProcess(
+        process.args, process.returncode, stdout.output, stderr.output
+    )
 
 
 def subprocess_capture_output_live(
     *args: Any,
     callback: Callable[[str, str], None] | None = None,
     check: bool = True,
+    tail_lines: int | None = None,
+    usage_callback: Callable[[ResourceUsage], None] | None = None,
     **kwargs: Any,
 ) -> CompletedProcess[str]:
     r"""Execute a subprocess call with a live callback.
@@ -189,6 +339,13 @@ def subprocess_capture_output_live(
         The callback to intermittently execute.
     check : bool, True
         Whether to check the returncode.
+    tail_lines : int, optional
+        If given, only retain the last `tail_lines` lines of output in the
+        returned object. Ignored if `callback` is None.
+    usage_callback : Callable[[ResourceUsage], None], optional
+        The callback to execute with the resource usage of the subprocess
+        once it has exited, whether or not it succeeded. Ignored if
+        `callback` is None.
     **kwargs : Any
         Keyword arguments to Popen.
 
@@ -208,6 +365,9 @@ def subprocess_capture_output_live(
     The utility of this routine is to be able to monitor the output of the
     running subprocess in real time. This is done via the callback argument,
     which takes as arguments the stdout and stderr of the executing process.
+    The callback is invoked with complete lines as soon as they are produced.
+    Since the callback sees every line, callers which only need the output
+    for diagnostics may pass `tail_lines` to bound memory usage.
 
     If callback is None, this routine is identical to
     subprocess_capture_output().
@@ -215,7 +375,13 @@ def subprocess_capture_output_live(
     if callback is None:
         return subprocess_capture_output(*args, check=check, **kwargs)
 
-    ret = subprocess_capture_output_live_impl(callback, *args, **kwargs)
+    ret = subprocess_capture_output_live_impl(
+        callback,
+        *args,
+        tail_lines=tail_lines,
+        usage_callback=usage_callback,
+        **kwargs,
+    )
     if check:
         ret = subprocess_check_returncode(ret)
     return ret
@@ -378,6 +544,22 @@ def dest_to_flag(dest: str) -> str:
     return "--" + dest.replace("_", "-")
 
 
+def aedifix_cache_dir() -> Path:
+    r"""Get the directory holding the persistent, cross-configuration data
+    of aedifix.
+
+    Returns
+    -------
+    cache_dir : Path
+        The directory, under ``$XDG_CACHE_HOME`` (or ``~/.cache`` if unset).
+    """
+    if cache_home := os.environ.get("XDG_CACHE_HOME", "").strip():
+        base = Path(cache_home)
+    else:
+        base = Path.home() / ".cache"
+    return base / "aedifix"
+
+
 def partition_argv(argv: Iterable[str]) -> tuple[list[str], list[str]]:
     r"""Split a command-line list of arguments into 2.
 
@@ -409,26 +591,56 @@ def partition_argv(argv: Iterable[str]) -> tuple[list[str], list[str]]:
     return main_argv, rest_argv
 
 
-CMAKE_TEMPLATES_DIR: Final = Path(__file__).resolve().parents[1] / "templates"
-CMAKE_CONFIGURE_FILE: Final = CMAKE_TEMPLATES_DIR / "configure_file.cmake"
-
-assert CMAKE_CONFIGURE_FILE.exists(), (
-    f"Cmake configure file {CMAKE_CONFIGURE_FILE} does not exist"
-)
-assert CMAKE_CONFIGURE_FILE.is_file(), (
-    f"Cmake configure file {CMAKE_CONFIGURE_FILE} is not a file"
+_CMAKE_CACHE_ENTRY: Final = re.compile(
+    r"(?P<name>[A-Za-z_0-9\-]+):(?P<type>[A-Z]+)\s*=\s*(?P<value>.*)"
 )
 
 
+def read_cmake_cache(cmake_cache: Path) -> dict[str, str]:
+    r"""Read the values of the entries in a CMakeCache.txt.
+
+    Parameters
+    ----------
+    cmake_cache : Path
+        The path to the CMakeCache.txt.
+
+    Returns
+    -------
+    values : dict[str, str]
+        The value of each cache entry, by name.
+
+    Raises
+    ------
+    OSError
+        If `cmake_cache` could not be read.
+    """
+
+    def keep_line(line: str) -> bool:
+        line = line.strip()
+        if not line:
+            return False
+        return not line.startswith(("//", "#"))
+
+    with cmake_cache.open() as fd:
+        line_gen = (
+            _CMAKE_CACHE_ENTRY.match(line.lstrip())
+            for line in filter(keep_line, fd)
+        )
+        return {m.group("name"): m.group("value") for m in line_gen if m}
+
+
+CMAKE_TEMPLATES_DIR: Final = Path(__file__).resolve().parents[1] / "templates"
+
+
 def cmake_configure_file(
     obj: Configurable, src_file: Path, dest_file: Path, defs: dict[str, Any]
 ) -> None:
-    r"""Configure a file using CMake's configure_file().
+    r"""Configure a file as CMake's configure_file() would.
 
     Parameters
     ----------
     obj : Configurable
-        The configurable to use to launch the cmake command.
+        The configurable to use to log the configuration.
     src_file : Path
         The input file (i.e. the "template" file) to configure.
     dest_file : Path
@@ -436,17 +648,18 @@ def cmake_configure_file(
     defs : dict[str, Any]
         A mapping of variable names to values to be replaced. I.e. ``@key@``
         will be replaced by ``value``.
-    """
-    cmake_exe = obj.manager.get_cmake_variable("CMAKE_COMMAND")
-    base_cmd = [
-        cmake_exe,
-        f"-DAEDIFIX_CONFIGURE_FILE_SRC={src_file}",
-        f"-DAEDIFIX_CONFIGURE_FILE_DEST={dest_file}",
-    ]
-    defs_cmd = [
-        f"-D{key}={shlex.quote(str(value))}" for key, value in defs.items()
-    ]
 
+    Raises
+    ------
+    ValueError
+        If `src_file` contains a substitution not found in `defs`.
+
+    Notes
+    -----
+    The file is configured in-process, following the semantics of
+    ``configure_file(<src> <dest> USE_SOURCE_PERMISSIONS @ONLY)``. See
+    `aedifix.util.configure_file` for details.
+    """
     if unhandled_subs := {
         var_name
         for var_name in re.findall(r"@([\w_]+)@", src_file.read_text())
@@ -458,5 +671,9 @@ def cmake_configure_file(
         )
         raise ValueError(msg)
 
-    cmd = base_cmd + defs_cmd + ["-P", CMAKE_CONFIGURE_FILE]
-    obj.log_execute_command(cmd)
+    str_defs = {key: str(value) for key, value in defs.items()}
+    written = configure_file(src_file, dest_file, str_defs)
+    obj.log(
+        f"Configured {src_file} -> {dest_file} "
+        f"({'written' if written else 'unchanged'})"
+    )
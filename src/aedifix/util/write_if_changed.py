@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Write generated files without needlessly touching them.
+
+Build rules (and CMake's own regeneration checks) compare modification
+times, so rewriting a generated file with identical content still triggers
+them. `write_if_changed()` leaves such files alone, and otherwise replaces
+them atomically, so that readers never see a partially written file.
+"""
+
+from __future__ import annotations
+
+import os
+import stat
+import secrets
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    r"""Write a file, unless it already has the given content.
+
+    Parameters
+    ----------
+    path : Path
+        The file to write.
+    content : str
+        The content of the file.
+
+    Returns
+    -------
+    written : bool
+        True if `path` was (re-)written, False if it already had `content`,
+        in which case neither it nor its modification time were touched.
+
+    Notes
+    -----
+    The content is written to a temporary file in the same directory, which
+    then atomically replaces `path`. An existing `path` keeps its
+    permissions, a new one gets the default ones (subject to the umask).
+    """
+    data = content.encode()
+    try:
+        if path.read_bytes() == data:
+            return False
+        mode: int | None = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        mode = None
+
+    tmp = path.with_name(f".{path.name}.{secrets.token_hex(8)}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as fdo:
+            fdo.write(data)
+        if mode is not None:
+            tmp.chmod(mode)
+        tmp.replace(path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return True
@@ -0,0 +1,163 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import timeit
+from os import environ
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from aedifix.manager import ConfigurationManager
+    from aedifix.package.main_package import MainPackage
+
+
+def make_manager(project_dir: Path) -> ConfigurationManager:
+    r"""Construct a ConfigurationManager for the dummy test main package.
+
+    Parameters
+    ----------
+    project_dir : Path
+        The directory to use as the project directory.
+
+    Returns
+    -------
+    manager : ConfigurationManager
+        The configuration manager.
+    """
+    from aedifix.manager import ConfigurationManager
+
+    from ..fixtures.dummy_main_module import DummyMainModule
+
+    environ["AEDIFIX_PYTEST_DIR"] = str(project_dir)
+    environ["AEDIFIX_PYTEST_ARCH"] = "arch-bench"
+    return ConfigurationManager((), DummyMainModule)
+
+
+def make_synthetic_main_package(
+    num_packages: int, num_arguments: int
+) -> type[MainPackage]:
+    r"""Create a main package with synthetic dependencies.
+
+    Parameters
+    ----------
+    num_packages : int
+        The number of packages the main package depends on.
+    num_arguments : int
+        The number of ConfigArguments (each with a CMake variable) of each
+        package.
+
+    Returns
+    -------
+    main_package : type[MainPackage]
+        The main package. Its project dir and arch are read from the
+        ``AEDIFIX_PYTEST_DIR`` and ``AEDIFIX_PYTEST_ARCH`` environment
+        variables.
+    """
+    from aedifix.cmake import CMAKE_VARIABLE, CMakeString
+    from aedifix.package import Package
+    from aedifix.util.argument_parser import ArgSpec, ConfigArgument
+
+    from ..fixtures.dummy_main_module import DummyMainModule
+
+    class SyntheticPackage(Package):
+        arguments: tuple[ConfigArgument, ...] = ()
+
+        def configure(self) -> None:
+            super().configure()
+            for arg in self.arguments:
+                self.set_flag_if_set(arg, getattr(self.cl_args, arg.spec.dest))
+
+    packages: list[type[Package]] = []
+    for i in range(num_packages):
+        arguments = {
+            f"OPTION_{j}": ConfigArgument(
+                name=f"--synthetic-{i}-option-{j}",
+                spec=ArgSpec(
+                    dest=f"synthetic_{i}_option_{j}",
+                    default=f"value-{j}",
+                    help=f"Synthetic option {j} of package {i}.",
+                ),
+                cmake_var=CMAKE_VARIABLE(
+                    f"SYNTHETIC_{i}_OPTION_{j}", CMakeString
+                ),
+            )
+            for j in range(num_arguments)
+        }
+        packages.append(
+            type(
+                f"Synthetic{i}",
+                (SyntheticPackage,),
+                {
+                    "__module__": __name__,
+                    "name": f"Synthetic{i}",
+                    "arguments": tuple(arguments.values()),
+                    "WITH_PACKAGE": ConfigArgument(
+                        name=f"--with-synthetic-{i}",
+                        spec=ArgSpec(
+                            dest=f"with_synthetic_{i}",
+                            type=bool,
+                            default=True,
+                            help=f"Build with synthetic package {i}.",
+                        ),
+                        enables_package=True,
+                        primary=True,
+                    ),
+                    **arguments,
+                },
+            )
+        )
+
+    class SyntheticMainPackage(DummyMainModule):
+        name = "SyntheticMainPackage"
+        dependencies = tuple(packages)
+
+    return SyntheticMainPackage
+
+
+def times_per_call(
+    fn: Callable[[], object], *, number: int, repeat: int = 5
+) -> list[float]:
+    r"""Time a callable.
+
+    Parameters
+    ----------
+    fn : Callable[[], object]
+        The callable to time.
+    number : int
+        The number of times to call `fn` per measurement.
+    repeat : int, 5
+        The number of measurements to take.
+
+    Returns
+    -------
+    seconds : list[float]
+        The time per call of each measurement, in seconds.
+    """
+    timer = timeit.Timer(fn)
+    return [t / number for t in timer.repeat(repeat=repeat, number=number)]
+
+
+def time_per_call(
+    fn: Callable[[], object], *, number: int, repeat: int = 5
+) -> float:
+    r"""Time a callable.
+
+    Parameters
+    ----------
+    fn : Callable[[], object]
+        The callable to time.
+    number : int
+        The number of times to call `fn` per measurement.
+    repeat : int, 5
+        The number of measurements to take.
+
+    Returns
+    -------
+    seconds : float
+        The best observed time per call, in seconds.
+    """
+    return min(times_per_call(fn, number=number, repeat=repeat))
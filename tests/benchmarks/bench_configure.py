@@ -0,0 +1,366 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Benchmark a full configuration, end to end, against a stub CMake.
+
+Runs ``basic_configure()`` for the example configure script
+(``share/aedifix/example_configure.py``) and for synthetic main packages
+with N packages of M ConfigArguments each. CMake is replaced by
+``fake_cmake.py``, so that only aedifix itself is measured.
+
+Each configuration runs in a fresh interpreter: once to warm up (e.g. the
+probe cache), then ``--repeat`` times. For each, reports the median of the
+import time, the wall time and number of subprocesses of each phase, and the
+peak RSS. Exits with a non-zero status if any exceeds its threshold in
+``configure_thresholds.json``.
+
+Run as ``python -m tests.benchmarks.bench_configure``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import runpy
+import shlex
+import resource
+import tempfile
+import subprocess
+from argparse import SUPPRESS, ArgumentParser, Namespace
+from pathlib import Path
+from statistics import median
+from typing import TYPE_CHECKING, Any, Final
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+_ROOT_DIR: Final = Path(__file__).resolve().parents[2]
+_EXAMPLE: Final = _ROOT_DIR / "share" / "aedifix" / "example_configure.py"
+_FAKE_CMAKE: Final = Path(__file__).resolve().with_name("fake_cmake.py")
+_THRESHOLDS: Final = (
+    Path(__file__).resolve().with_name("configure_thresholds.json")
+)
+_ARCH: Final = "arch-bench"
+_PHASES: Final = ("setup", "configure", "finalize")
+_DEFAULT_SYNTHETIC: Final = ((10, 10), (50, 20))
+# Headroom given to measured values by --update-thresholds. Subprocess
+# counts are deterministic, so get none.
+_TIME_MARGIN: Final = 2.0
+_RSS_MARGIN: Final = 1.25
+
+# The example configure script imports its main package from here
+_EXAMPLE_MAIN_PACKAGE: Final = """\
+from pathlib import Path
+
+from aedifix.package.main_package import MainPackage
+
+
+class MyMainPackage(MainPackage):
+    name = "MyProject"
+
+    def __init__(self, manager, argv):
+        super().__init__(
+            manager=manager,
+            argv=argv,
+            arch_name="MY_PROJECT_ARCH",
+            project_dir_name="MY_PROJECT_DIR",
+            project_dir_value=Path(__file__).resolve().parents[1],
+        )
+
+    @classmethod
+    def from_argv(cls, manager, argv):
+        return cls(manager, argv)
+"""
+
+Metrics = dict[str, float]
+
+
+def _case_name(case: tuple[int, int] | None) -> str:
+    if case is None:
+        return "example"
+    return f"synthetic-{case[0]}x{case[1]}"
+
+
+def _child(spec: dict[str, Any]) -> None:
+    # Runs in the fresh interpreter. Must not import aedifix before timing
+    # the import.
+    argv: list[str] = spec["argv"]
+    configure: Callable[[], int]
+    start = time.perf_counter()
+    if spec["case"] is None:
+        sys.path.insert(0, spec["project_dir"])
+        namespace = runpy.run_path(str(_EXAMPLE), run_name="example_configure")
+        sys.argv = [str(_EXAMPLE), *argv]
+        configure = namespace["main"]
+    else:
+        from aedifix.main import basic_configure
+
+        from ._common import make_synthetic_main_package
+
+        main_package = make_synthetic_main_package(*spec["case"])
+
+        def configure() -> int:
+            return basic_configure(tuple(argv), main_package)
+
+    import_time = time.perf_counter() - start
+    start = time.perf_counter()
+    ret = configure()
+    wall = time.perf_counter() - start
+    result = {
+        "returncode": ret,
+        "import_time": import_time,
+        "wall": wall,
+        # ru_maxrss is in KiB on Linux, bytes on macOS
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        * (1 if sys.platform == "darwin" else 1 << 10),
+    }
+    Path(spec["output"]).write_text(json.dumps(result))
+
+
+def _phase_metrics(trace_path: Path) -> Metrics:
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    phases = {e["name"]: e for e in events if e.get("cat") == "phase"}
+    commands = [e for e in events if e.get("cat") == "command"]
+    ret: Metrics = {}
+    for name in _PHASES:
+        if (phase := phases.get(name)) is None:
+            continue
+        begin, end = phase["ts"], phase["ts"] + phase["dur"]
+        ret[f"{name}.wall"] = phase["dur"] / 1e6
+        ret[f"{name}.subprocesses"] = sum(
+            begin <= e["ts"] <= end for e in commands
+        )
+    return ret
+
+
+def _write_fake_cmake(bin_dir: Path) -> Path:
+    cmake = bin_dir / "cmake"
+    command = shlex.join((sys.executable, str(_FAKE_CMAKE)))
+    cmake.write_text(f'#!/bin/sh\nexec {command} "$@"\n')
+    cmake.chmod(0o755)
+    return cmake
+
+
+def _run_once(
+    case: tuple[int, int] | None, project_dir: Path, cmake: Path
+) -> Metrics:
+    arch_name = "MY_PROJECT_ARCH" if case is None else "AEDIFIX_PYTEST_ARCH"
+    arch_dir = project_dir / _ARCH
+    output = project_dir / "result.json"
+    spec = {
+        "case": case,
+        "project_dir": str(project_dir),
+        "output": str(output),
+        "argv": [
+            f"--{arch_name}={_ARCH}",
+            "--with-clean",
+            "--profile-configure",
+            f"--cmake-executable={cmake}",
+            "--cmake-generator=Unix Makefiles",
+        ],
+    }
+    env = dict(os.environ)
+    env["AEDIFIX_PYTEST_DIR"] = str(project_dir)
+    env["AEDIFIX_PYTEST_ARCH"] = _ARCH
+    env["XDG_CACHE_HOME"] = str(project_dir.parent / "cache")
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "tests.benchmarks.bench_configure",
+            "--child",
+            json.dumps(spec),
+        ],
+        cwd=_ROOT_DIR,
+        env=env,
+        check=False,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if proc.returncode or not output.exists():
+        msg = f"{_case_name(case)} failed to configure:\n{proc.stderr}"
+        raise RuntimeError(msg)
+    result = json.loads(output.read_text())
+    if result["returncode"]:
+        msg = (
+            f"{_case_name(case)} failed to configure, see "
+            f"{arch_dir / 'configure.log'}"
+        )
+        raise RuntimeError(msg)
+    metrics: Metrics = {
+        "import_time": result["import_time"],
+        "wall": result["wall"],
+        "peak_rss": result["peak_rss"],
+    }
+    metrics.update(_phase_metrics(arch_dir / "aedifix_trace.json"))
+    metrics["subprocesses"] = sum(
+        metrics.get(f"{phase}.subprocesses", 0) for phase in _PHASES
+    )
+    return metrics
+
+
+def _run_case(
+    case: tuple[int, int] | None, tmp_dir: Path, cmake: Path, repeat: int
+) -> Metrics:
+    project_dir = tmp_dir / _case_name(case) / "project"
+    project_dir.mkdir(parents=True)
+    if case is None:
+        package_dir = project_dir / "my_main_package"
+        package_dir.mkdir()
+        (package_dir / "__init__.py").write_text(_EXAMPLE_MAIN_PACKAGE)
+
+    # Warm up, e.g. the probe cache
+    _run_once(case, project_dir, cmake)
+    runs = [_run_once(case, project_dir, cmake) for _ in range(repeat)]
+    return {key: median(run[key] for run in runs) for key in runs[0]}
+
+
+def _format_metric(key: str, value: float) -> str:
+    if key.endswith("subprocesses"):
+        return f"{value:g}"
+    if key.endswith("rss"):
+        return f"{value / (1 << 20):.1f} MiB"
+    return f"{value * 1e3:.1f} ms"
+
+
+def _check(
+    name: str, metrics: Metrics, thresholds: Metrics, scale: float
+) -> list[str]:
+    failures = []
+    for key, limit in sorted(thresholds.items()):
+        if key not in metrics:
+            continue
+        scaled = limit if key.endswith("subprocesses") else limit * scale
+        if metrics[key] > scaled:
+            failures.append(
+                f"{name} {key}: {_format_metric(key, metrics[key])} exceeds "
+                f"{_format_metric(key, scaled)}"
+            )
+    return failures
+
+
+def _thresholds_from(metrics: Metrics) -> Metrics:
+    ret = {}
+    for key, value in metrics.items():
+        if key.endswith("subprocesses"):
+            ret[key] = value
+        elif key.endswith("rss"):
+            ret[key] = round(value * _RSS_MARGIN)
+        else:
+            ret[key] = round(value * _TIME_MARGIN, 3)
+    return ret
+
+
+def _parse_args(argv: Sequence[str] | None = None) -> Namespace:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--synthetic",
+        nargs=2,
+        type=int,
+        action="append",
+        metavar=("N", "M"),
+        help="Benchmark a synthetic main package with N packages of M "
+        "arguments each. May be given multiple times (default: "
+        f"{' and '.join(f'{n} {m}' for n, m in _DEFAULT_SYNTHETIC)})",
+    )
+    parser.add_argument(
+        "--no-example",
+        action="store_true",
+        help="Do not benchmark the example configure script",
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=Path,
+        default=_THRESHOLDS,
+        help="The thresholds to check against (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--threshold-scale",
+        type=float,
+        default=1.0,
+        help="Scale the time and memory thresholds, e.g. for slower "
+        "machines (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--update-thresholds",
+        action="store_true",
+        help="Store the measured values (with some headroom) as the new "
+        "thresholds instead of checking them",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Also write the results to this JSON file"
+    )
+    # Internal, used to run each configuration in a fresh interpreter
+    parser.add_argument("--child", help=SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main() -> int:
+    args = _parse_args()
+    if args.child is not None:
+        _child(json.loads(args.child))
+        return 0
+
+    cases: list[tuple[int, int] | None] = [
+        tuple(case) for case in (args.synthetic or _DEFAULT_SYNTHETIC)
+    ]
+    if not args.no_example:
+        cases.insert(0, None)
+
+    thresholds: dict[str, Metrics] = {}
+    if args.thresholds.exists():
+        thresholds = json.loads(args.thresholds.read_text())
+
+    results: dict[str, Metrics] = {}
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        cmake = _write_fake_cmake(tmp_dir)
+        for case in cases:
+            name = _case_name(case)
+            metrics = _run_case(case, tmp_dir, cmake, args.repeat)
+            results[name] = metrics
+            print(f"{name}:")  # noqa: T201
+            for key, value in metrics.items():
+                limit = thresholds.get(name, {}).get(key)
+                limit_str = (
+                    ""
+                    if limit is None
+                    else f" (max {_format_metric(key, limit)})"
+                )
+                print(  # noqa: T201
+                    f"  {key:<24} {_format_metric(key, value):>12}{limit_str}"
+                )
+            if not args.update_thresholds:
+                failures.extend(
+                    _check(
+                        name,
+                        metrics,
+                        thresholds.get(name, {}),
+                        args.threshold_scale,
+                    )
+                )
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2))
+    if args.update_thresholds:
+        thresholds.update(
+            (name, _thresholds_from(metrics))
+            for name, metrics in results.items()
+        )
+        args.thresholds.write_text(
+            json.dumps(thresholds, indent=2, sort_keys=True) + "\n"
+        )
+        print(f"Updated {args.thresholds}")  # noqa: T201
+        return 0
+    for failure in failures:
+        print(f"FAILED: {failure}")  # noqa: T201
+    return int(bool(failures))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Measure the wall-clock time of ``import aedifix`` and ``configure --help``.
+
+Each measurement is taken in a fresh interpreter. Use ``--path-dirs`` to
+prepend additional (empty) directories to ``PATH``, to emulate the long
+``PATH`` typically found on clusters.
+
+Run as ``python -m tests.benchmarks.bench_import``.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+from argparse import ArgumentParser
+from pathlib import Path
+from statistics import median
+
+_ROOT_DIR = Path(__file__).resolve().parents[2]
+
+_IMPORT_SCRIPT = "import aedifix"
+_HELP_SCRIPT = """
+import contextlib, io
+from aedifix.main import basic_configure
+from tests.fixtures.dummy_main_module import DummyMainModule
+
+with contextlib.redirect_stdout(io.StringIO()):
+    basic_configure(("--help",), DummyMainModule)
+"""
+
+
+def _time_script(script: str, env: dict[str, str], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", script],
+            env=env,
+            cwd=_ROOT_DIR,
+            check=False,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        times.append(time.perf_counter() - start)
+    return median(times)
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--path-dirs", type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_path = Path(tmp_dir)
+        extra_dirs = []
+        for i in range(args.path_dirs):
+            extra_dir = tmp_path / "path" / str(i)
+            extra_dir.mkdir(parents=True)
+            extra_dirs.append(str(extra_dir))
+
+        env = dict(os.environ)
+        env["PATH"] = os.pathsep.join([*extra_dirs, env.get("PATH", "")])
+        env["AEDIFIX_PYTEST_DIR"] = str(tmp_path)
+        env["AEDIFIX_PYTEST_ARCH"] = "arch-bench"
+        env["XDG_CACHE_HOME"] = str(tmp_path / "cache")
+
+        cases = {
+            "python -c pass": "pass",
+            "import aedifix": _IMPORT_SCRIPT,
+            "configure --help": _HELP_SCRIPT,
+        }
+        for name, script in cases.items():
+            sec = _time_script(script, env, args.repeat)
+            print(f"{name:<20} {sec * 1e3:10.2f} ms")  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
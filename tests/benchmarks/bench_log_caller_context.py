@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Measure the per-call cost of ConfigurationManager.log().
+
+Each case is measured both with the on-disk log written synchronously, and
+from within an active logger, where it is written by a background thread.
+
+Run as ``python -m tests.benchmarks.bench_log_caller_context``.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from aedifix.logger import Logger, LogLevel
+
+from ._common import make_manager, time_per_call
+
+if TYPE_CHECKING:
+    from aedifix.manager import ConfigurationManager
+
+
+class _Caller:
+    def __init__(self, manager: ConfigurationManager) -> None:
+        self.manager = manager
+
+    @Logger.log_passthrough
+    def passthrough(self, msg: str) -> None:
+        self.manager.log(msg)
+
+    def log_direct(self) -> None:
+        self.manager.log("direct")
+
+    def log_via_passthrough(self) -> None:
+        self.passthrough("via passthrough")
+
+    def log_no_context(self) -> None:
+        self.manager.log("no context", caller_context=False)
+
+    def log_debug(self) -> None:
+        self.manager.log("debug %s", self.manager, level=LogLevel.DEBUG)
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--number", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        manager = make_manager(Path(tmp_dir))
+        caller = _Caller(manager)
+        cases = {
+            "log(caller_context=False)": caller.log_no_context,
+            "log(caller_context=True)": caller.log_direct,
+            "log() via passthrough": caller.log_via_passthrough,
+            "log(level=DEBUG), filtered": caller.log_debug,
+        }
+        logger = manager._logger
+        for mode in ("sync", "async"):
+            if mode == "async":
+                logger.__enter__()
+            for name, fn in cases.items():
+                sec = time_per_call(fn, number=args.number, repeat=args.repeat)
+                print(  # noqa: T201
+                    f"{mode:<6} {name:<28} {sec * 1e6:10.2f} us/call"
+                )
+        logger.__exit__(None, None, None)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Measure the throughput of live output sent through
+``Logger.log_screen()``.
+
+Live output is rendered to an in-memory terminal, so that the cost of drawing
+the live display is included without flooding the real one. Headless output
+is written to an in-memory stdout.
+
+Run as ``python -m tests.benchmarks.bench_log_screen``.
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+import time
+import tempfile
+import contextlib
+from argparse import ArgumentParser
+from pathlib import Path
+
+from rich.console import Console
+
+from aedifix.logger import Logger
+
+_LINE: str = "-- Looking for pthread_create in pthreads - not found " * 2
+
+
+def _run(
+    num_lines: int, refresh_per_second: float, *, headless: bool
+) -> tuple[float, float, int]:
+    console = Console(
+        file=io.StringIO(), force_terminal=True, width=120, height=50
+    )
+    stdout = io.StringIO()
+    with (
+        tempfile.TemporaryDirectory() as tmp_dir,
+        contextlib.redirect_stdout(stdout),
+    ):
+        logger = Logger(
+            Path(tmp_dir) / "configure.log",
+            refresh_per_second=refresh_per_second,
+            console=console,
+            headless=headless,
+        )
+        start = time.perf_counter()
+        start_cpu = time.process_time()
+        with logger:
+            for _ in range(num_lines):
+                logger.log_screen(_LINE)
+        end_cpu = time.process_time()
+        end = time.perf_counter()
+    out = stdout if headless else console.file
+    nbytes = len(out.getvalue())  # type: ignore[attr-defined]
+    return end - start, end_cpu - start_cpu, nbytes
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument(
+        "--refresh-per-second",
+        type=float,
+        default=10,
+        help="The maximum frame rate of the live output",
+    )
+    args = parser.parse_args()
+
+    for headless in (False, True):
+        total, cpu, nbytes = _run(
+            args.lines, args.refresh_per_second, headless=headless
+        )
+        mode = "headless" if headless else "live"
+        lines_per_sec = args.lines / total
+        print(f"{mode}:")  # noqa: T201
+        print(f"  total wall time  {total:10.2f} s")  # noqa: T201
+        print(f"  total CPU time   {cpu:10.2f} s")  # noqa: T201
+        print(f"  throughput       {lines_per_sec:10.0f} lines/s")  # noqa: T201
+        print(f"  output           {nbytes / 1e6:10.2f} MB")  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,428 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Micro-benchmarks of the hot utilities and the logging path.
+
+Every benchmark is timed ``--repeat`` times, and the results written as JSON
+(with the Python version, platform and git commit they were measured with),
+so that they can be compared across commits and Python versions::
+
+    python -m tests.benchmarks.bench_micro --output base.json
+    # ... switch commits or interpreters ...
+    python -m tests.benchmarks.bench_micro --compare base.json
+
+Run as ``python -m tests.benchmarks.bench_micro``.
+"""
+
+from __future__ import annotations
+
+import io
+import sys
+import json
+import platform
+import tempfile
+import contextlib
+import subprocess
+from argparse import ArgumentParser
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from statistics import median
+from typing import TYPE_CHECKING, Any, Final
+
+from ._common import make_manager, times_per_call
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from aedifix.logger import Logger
+
+_ROOT_DIR: Final = Path(__file__).resolve().parents[2]
+_NUM_ARGS: Final = 1_000
+_NUM_CACHE_ENTRIES: Final = 10_000
+_NUM_FLAGS: Final = 5_000
+_LINE: Final = "-- Looking for pthread_create in pthreads - not found"
+
+Setup = Callable[[Path], contextlib.AbstractContextManager[Callable[[], Any]]]
+
+
+@dataclass(slots=True, frozen=True)
+class _Benchmark:
+    name: str
+    """The name of the benchmark."""
+
+    setup: Setup
+    """Given a scratch directory, returns a context yielding the function to
+    time."""
+
+    number: int
+    """The number of calls per measurement."""
+
+    items: int = 1
+    """The number of items processed per call."""
+
+    unit: str = "calls"
+    """The name of the items."""
+
+
+@contextlib.contextmanager
+def _detaching(logger: Logger) -> Iterator[Logger]:
+    # The loggers are global (by name), so the handler of every Logger must be
+    # removed once done, lest later benchmarks also write to its (deleted)
+    # file
+    try:
+        yield logger
+    finally:
+        logger._file_logger.removeHandler(logger._file_handler)
+        logger._file_handler.close()
+
+
+def _argv() -> list[str]:
+    # Flags repeat every 100 arguments, some with separate values
+    argv: list[str] = []
+    for i in range(_NUM_ARGS // 2):
+        argv.extend((f"--flag-{i % 100}", f"value-{i}"))
+    return argv
+
+
+@contextlib.contextmanager
+def _partition_argv(_tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+    from aedifix.util.utility import partition_argv
+
+    argv = _argv()
+    argv.insert(len(argv) // 2, "--")
+    yield lambda: partition_argv(argv)
+
+
+@contextlib.contextmanager
+def _prune_argv(_tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+    from aedifix.util.utility import prune_command_line_args
+
+    argv = _argv()
+    remove = {f"--flag-{i}" for i in range(0, 100, 10)}
+    yield lambda: prune_command_line_args(argv, remove)
+
+
+@contextlib.contextmanager
+def _deduplicate_argv(_tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+    from aedifix.util.utility import deduplicate_command_line_args
+
+    argv = _argv()
+    yield lambda: deduplicate_command_line_args(argv)
+
+
+@contextlib.contextmanager
+def _read_cmake_cache(tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+    manager = make_manager(tmp_dir)
+    cache = tmp_dir / "CMakeCache.txt"
+    cache.write_text(
+        "".join(
+            f"//Help for variable {i}\nVARIABLE_{i}:STRING=value {i}\n\n"
+            for i in range(_NUM_CACHE_ENTRIES)
+        )
+    )
+    config = manager._config
+    with _detaching(manager._logger):
+        yield lambda: config._read_entire_cmake_cache(cache)
+
+
+@contextlib.contextmanager
+def _to_command_line(tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+    from aedifix.cmake.cmake_flags import (
+        CMakeBool,
+        CMakeFlagBase,
+        CMakeInt,
+        CMakeList,
+        CMakePath,
+        CMakeString,
+    )
+
+    flags: list[CMakeFlagBase] = []
+    for i in range(_NUM_FLAGS // 5):
+        flags.extend(
+            (
+                CMakeString(f"STRING_{i}", f"some value {i}"),
+                CMakeList(f"LIST_{i}", ["-O2", "-g", f"-DFOO={i}"]),
+                CMakeBool(f"BOOL_{i}", i % 2),
+                CMakeInt(f"INT_{i}", i),
+                CMakePath(f"PATH_{i}", tmp_dir),
+            )
+        )
+
+    def to_command_line() -> None:
+        for flag in flags:
+            flag.to_command_line(quote=False)
+            flag.to_command_line(quote=True)
+
+    yield to_command_line
+
+
+def _caller() -> Any:
+    from aedifix.util.callables import get_calling_function
+
+    return get_calling_function()
+
+
+class _Callee:
+    def method(self) -> Any:
+        return _caller()
+
+
+@contextlib.contextmanager
+def _get_calling_function(_tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+    yield _Callee().method
+
+
+@contextlib.contextmanager
+def _classify_callable(_tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+    from aedifix.util.callables import classify_callable
+
+    method = _Callee().method
+    yield lambda: classify_callable(method)
+
+
+def _log_file(*, background: bool) -> Setup:
+    @contextlib.contextmanager
+    def setup(tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+        from aedifix.logger import Logger
+
+        logger = Logger(tmp_dir / "configure.log")
+        with (
+            _detaching(logger),
+            logger if background else contextlib.nullcontext(),
+        ):
+            yield lambda: logger.log_file(_LINE)
+
+    return setup
+
+
+def _log_screen(*, headless: bool) -> Setup:
+    @contextlib.contextmanager
+    def setup(tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+        from rich.console import Console
+
+        from aedifix.logger import Logger
+
+        console = Console(
+            file=io.StringIO(), force_terminal=True, width=120, height=50
+        )
+        logger = Logger(
+            tmp_dir / "configure.log", console=console, headless=headless
+        )
+        with (
+            _detaching(logger),
+            contextlib.redirect_stdout(io.StringIO()),
+            logger,
+        ):
+            yield lambda: logger.log_screen(_LINE)
+
+    return setup
+
+
+def _subprocess_live(num_bytes: int) -> Setup:
+    @contextlib.contextmanager
+    def setup(_tmp_dir: Path) -> Iterator[Callable[[], Any]]:
+        from aedifix.util.utility import subprocess_capture_output_live
+
+        line = "x" * 99 + "\n"
+        code = (
+            "import sys\n"
+            f"chunk = {line!r} * 10_000\n"
+            f"for _ in range({num_bytes // (len(line) * 10_000)}):\n"
+            "    sys.stdout.write(chunk)\n"
+        )
+
+        def callback(_stdout: str, _stderr: str) -> None:
+            pass
+
+        yield lambda: subprocess_capture_output_live(
+            [sys.executable, "-c", code], callback=callback, tail_lines=1000
+        )
+
+    return setup
+
+
+def _benchmarks(subprocess_mb: int) -> list[_Benchmark]:
+    num_bytes = subprocess_mb * 1_000_000
+    return [
+        _Benchmark(
+            "partition_argv", _partition_argv, 2_000, _NUM_ARGS, "args"
+        ),
+        _Benchmark(
+            "prune_command_line_args", _prune_argv, 2_000, _NUM_ARGS, "args"
+        ),
+        _Benchmark(
+            "deduplicate_command_line_args",
+            _deduplicate_argv,
+            2_000,
+            _NUM_ARGS,
+            "args",
+        ),
+        _Benchmark(
+            "ConfigFile._read_entire_cmake_cache",
+            _read_cmake_cache,
+            10,
+            _NUM_CACHE_ENTRIES,
+            "entries",
+        ),
+        _Benchmark(
+            "CMakeFlagBase.to_command_line",
+            _to_command_line,
+            5,
+            2 * _NUM_FLAGS,
+            "flags",
+        ),
+        _Benchmark("get_calling_function", _get_calling_function, 20_000),
+        _Benchmark("classify_callable", _classify_callable, 20_000),
+        _Benchmark(
+            "Logger.log_file[sync]",
+            _log_file(background=False),
+            20_000,
+            unit="lines",
+        ),
+        _Benchmark(
+            "Logger.log_file[background]",
+            _log_file(background=True),
+            20_000,
+            unit="lines",
+        ),
+        _Benchmark(
+            "Logger.log_screen[live]",
+            _log_screen(headless=False),
+            20_000,
+            unit="lines",
+        ),
+        _Benchmark(
+            "Logger.log_screen[headless]",
+            _log_screen(headless=True),
+            20_000,
+            unit="lines",
+        ),
+        _Benchmark(
+            "subprocess_capture_output_live",
+            _subprocess_live(num_bytes),
+            1,
+            num_bytes,
+            "bytes",
+        ),
+    ]
+
+
+def _git_commit() -> str | None:
+    try:
+        ret = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=_ROOT_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return ret.stdout.strip()
+
+
+def _metadata() -> dict[str, Any]:
+    try:
+        aedifix_version = version("aedifix")
+    except PackageNotFoundError:
+        aedifix_version = None
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "aedifix": aedifix_version,
+        "commit": _git_commit(),
+        "date": datetime.now(UTC).isoformat(timespec="seconds"),
+    }
+
+
+def _run(bench: _Benchmark, repeat: int) -> dict[str, Any]:
+    with (
+        tempfile.TemporaryDirectory() as tmp_dir,
+        bench.setup(Path(tmp_dir)) as fn,
+    ):
+        times = times_per_call(fn, number=bench.number, repeat=repeat)
+    best = min(times)
+    return {
+        "best": best,
+        "median": median(times),
+        "times": times,
+        "number": bench.number,
+        "items": bench.items,
+        "unit": bench.unit,
+        "throughput": bench.items / best,
+    }
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def _format_result(
+    name: str, result: dict[str, Any], base: dict[str, Any] | None
+) -> str:
+    line = (
+        f"{name:<38} {_format_time(result['best']):>10}/call "
+        f"{result['throughput']:>14,.0f} {result['unit']}/s"
+    )
+    if base is not None:
+        line += f"  {result['best'] / base['best']:6.2f}x base"
+    return line
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--filter",
+        help="Only run the benchmarks whose name contains this string",
+    )
+    parser.add_argument(
+        "--subprocess-mb",
+        type=int,
+        default=100,
+        help="The output of the subprocess benchmark, in MB (default: "
+        "%(default)s)",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write the results to this JSON file"
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        help="Compare the results to those of a previous --output",
+    )
+    args = parser.parse_args()
+
+    base: dict[str, dict[str, Any]] = {}
+    if args.compare:
+        base = json.loads(args.compare.read_text())["benchmarks"]
+
+    results = {}
+    for bench in _benchmarks(args.subprocess_mb):
+        if args.filter and args.filter not in bench.name:
+            continue
+        result = results[bench.name] = _run(bench, args.repeat)
+        print(  # noqa: T201
+            _format_result(bench.name, result, base.get(bench.name))
+        )
+
+    if args.output:
+        args.output.write_text(
+            json.dumps(
+                {"metadata": _metadata(), "benchmarks": results}, indent=2
+            )
+            + "\n"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
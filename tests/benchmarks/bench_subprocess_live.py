@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""Measure the throughput and latency of live subprocess output capture.
+
+Run as ``python -m tests.benchmarks.bench_subprocess_live``.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import resource
+from argparse import ArgumentParser
+
+from aedifix.util.utility import subprocess_capture_output_live
+
+_LINE: str = "x" * 100
+
+
+def _run(num_lines: int, tail_lines: int | None) -> tuple[float, float, int]:
+    code = (
+        "import sys, time\n"
+        "print('first', flush=True)\n"
+        "time.sleep(0.5)\n"
+        f"sys.stdout.write(({_LINE!r} + '\\n') * {num_lines})\n"
+    )
+    first: list[float] = []
+    nbytes = 0
+
+    def callback(stdout: str, _stderr: str) -> None:
+        nonlocal nbytes
+        if not first:
+            first.append(time.perf_counter())
+        nbytes += len(stdout)
+
+    start = time.perf_counter()
+    subprocess_capture_output_live(
+        [sys.executable, "-c", code], callback=callback, tail_lines=tail_lines
+    )
+    end = time.perf_counter()
+    return first[0] - start, end - start, nbytes
+
+
+def main() -> int:
+    parser = ArgumentParser(description=__doc__)
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    parser.add_argument(
+        "--tail-lines",
+        type=int,
+        default=None,
+        help="Retain only this many lines of output (default: all)",
+    )
+    args = parser.parse_args()
+
+    latency, total, nbytes = _run(args.lines, args.tail_lines)
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"first line latency {latency * 1e3:10.1f} ms")  # noqa: T201
+    print(f"total wall time    {total:10.2f} s")  # noqa: T201
+    print(f"throughput         {nbytes / total / 1e6:10.1f} MB/s")  # noqa: T201
+    print(f"peak RSS           {rss:10.1f} MB")  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
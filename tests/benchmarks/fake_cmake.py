@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+r"""A stand-in for ``cmake`` which configures instantly.
+
+It understands just enough of the command line (and the ``-C`` initial-cache
+script) passed by aedifix to write a realistic ``CMakeCache.txt`` (every
+variable, followed by a number of internal entries) and the aedifix export
+JSON, so that configure can be benchmarked without measuring CMake itself.
+Like CMake, it keeps the entries of an existing cache unless they are
+redefined or removed (``-U``).
+
+The following environment variables tune its behavior:
+
+- ``AEDIFIX_FAKE_CMAKE_LINES``: the number of lines of output to print
+  (default 200).
+- ``AEDIFIX_FAKE_CMAKE_CACHE_ENTRIES``: the number of internal cache entries
+  to write (default 500).
+- ``AEDIFIX_FAKE_CMAKE_DELAY``: the time to sleep, in seconds (default 0).
+
+Must not import aedifix, since it runs as a separate executable.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import json
+import time
+from pathlib import Path
+
+_VERSION = "3.30.2"
+_CACHE_HEADER = """\
+# This is the CMakeCache file.
+# For build in directory: {build_dir}
+# It was generated by CMake: {cmake}
+# You can edit this file to change values found and used by cmake.
+# If you do not want to change any of the values, simply exit the editor.
+# If you do want to change a value, simply edit, save, and exit the editor.
+# The syntax for the file is as follows:
+# KEY:TYPE=VALUE
+# KEY is the name of a variable in the cache.
+# TYPE is a hint to GUIs for the type of VALUE, DO NOT EDIT TYPE!.
+# VALUE is the current value for the KEY.
+
+########################
+# EXTERNAL cache entries
+########################
+
+"""
+_SET_CACHE = re.compile(r'^set\((\w+) "((?:[^"\\]|\\.)*)" CACHE (\w+) ')
+_FILE_STRINGS = re.compile(r'^file\(STRINGS "((?:[^"\\]|\\.)*)" ')
+_ESCAPE = re.compile(r"\\(.)")
+_CACHE_ENTRY = re.compile(r"^(\w+):(\w+)=(.*)$")
+_INTERNAL_HEADER = """
+########################
+# INTERNAL cache entries
+########################
+
+"""
+
+
+def _env_number(name: str, default: float) -> float:
+    return float(os.environ.get(name, default))
+
+
+def _unquote(value: str) -> str:
+    # Like CMake, strip one level of quotes
+    if len(value) > 1 and value[0] == value[-1] and value[0] in "'\"":
+        return value[1:-1]
+    return value
+
+
+def _read_initial_cache(script: Path, cache: dict[str, str]) -> None:
+    # Only understands the scripts written by aedifix
+    for line in script.read_text().splitlines():
+        if match := _SET_CACHE.match(line):
+            name, value, var_type = match.groups()
+            value = _ESCAPE.sub(r"\1", value)
+            cache[name] = f"{var_type}={value}"
+        elif match := _FILE_STRINGS.match(line):
+            path = Path(_ESCAPE.sub(r"\1", match.group(1)))
+            export_vars = ";".join(path.read_text().split())
+            cache["AEDIFIX_EXPORT_VARIABLES"] = f"STRING={export_vars}"
+
+
+def _read_cache(build_dir: Path) -> dict[str, str]:
+    # Only the external entries, the internal ones are always regenerated
+    try:
+        text = (build_dir / "CMakeCache.txt").read_text()
+    except FileNotFoundError:
+        return {}
+    text = text.partition(_INTERNAL_HEADER)[0]
+    return {
+        match.group(1): f"{match.group(2)}={match.group(3)}"
+        for match in map(_CACHE_ENTRY.match, text.splitlines())
+        if match
+    }
+
+
+def _parse_opts(argv: list[str]) -> dict[str, str]:
+    opts: dict[str, str] = {}
+    it = iter(argv)
+    for arg in it:
+        if arg in {"-S", "-B", "-G"}:
+            opts[arg] = next(it)
+        elif arg.startswith("--profiling-output="):
+            opts["--profiling-output"] = arg.partition("=")[2]
+    return opts
+
+
+def _parse_cache_args(argv: list[str], cache: dict[str, str]) -> None:
+    it = iter(argv)
+    for arg in it:
+        if arg in {"-S", "-B", "-G"}:
+            next(it)
+        elif arg.startswith("-U"):
+            cache.pop(arg[2:] or next(it), None)
+        elif arg.startswith("-C"):
+            _read_initial_cache(Path(arg[2:] or next(it)), cache)
+        elif arg.startswith("-D"):
+            name_type, _, value = (arg[2:] or next(it)).partition("=")
+            name, _, var_type = name_type.partition(":")
+            cache[name] = f"{var_type or 'UNINITIALIZED'}={_unquote(value)}"
+
+
+def _write_cache(build_dir: Path, cache: dict[str, str]) -> None:
+    num_internal = int(_env_number("AEDIFIX_FAKE_CMAKE_CACHE_ENTRIES", 500))
+    lines = [_CACHE_HEADER.format(build_dir=build_dir, cmake=sys.argv[0])]
+    lines.extend(
+        "//No help, variable specified on the command line.\n"
+        f"{name}:{entry}\n\n"
+        for name, entry in sorted(cache.items())
+    )
+    lines.append(_INTERNAL_HEADER)
+    lines.append(f"CMAKE_CACHEFILE_DIR:INTERNAL={build_dir}\n")
+    lines.extend(
+        f"//Details about finding package {i}\n"
+        f"FIND_PACKAGE_MESSAGE_DETAILS_Fake{i}:INTERNAL="
+        f"[/opt/fake{i}/lib/libfake{i}.so][/opt/fake{i}/include][v{i}.0]\n"
+        for i in range(num_internal)
+    )
+    (build_dir / "CMakeCache.txt").write_text("".join(lines))
+
+
+def _write_export(cache: dict[str, str]) -> None:
+    values = {name: entry.partition("=")[2] for name, entry in cache.items()}
+    if not (export_path := values.get("AEDIFIX_EXPORT_CONFIG_PATH")):
+        return
+    export_vars = values.get("AEDIFIX_EXPORT_VARIABLES", "").split(";")
+    export = {var: values.get(var, "") for var in export_vars if var}
+    Path(export_path).write_text(json.dumps(export, indent=2))
+
+
+def main() -> int:
+    argv = sys.argv[1:]
+    if argv == ["--version"]:
+        print(f"cmake version {_VERSION}")  # noqa: T201
+        print()  # noqa: T201
+        print(  # noqa: T201
+            "CMake suite maintained and supported by Kitware "
+            "(kitware.com/cmake)."
+        )
+        return 0
+
+    opts = _parse_opts(argv)
+    build_dir = Path(opts.get("-B", ".")).resolve()
+    build_dir.mkdir(parents=True, exist_ok=True)
+    cache = _read_cache(build_dir)
+    _parse_cache_args(argv, cache)
+    cache.setdefault("CMAKE_COMMAND", f"INTERNAL={sys.argv[0]}")
+    cache.setdefault("CMAKE_GENERATOR", f"INTERNAL={opts.get('-G', '')}")
+
+    num_lines = int(_env_number("AEDIFIX_FAKE_CMAKE_LINES", 200))
+    for i in range(num_lines):
+        print(f"-- [fake {i}] Looking for fake_symbol_{i} - found")  # noqa: T201
+    time.sleep(_env_number("AEDIFIX_FAKE_CMAKE_DELAY", 0))
+
+    _write_cache(build_dir, cache)
+    _write_export(cache)
+    if profile := opts.get("--profiling-output"):
+        Path(profile).write_text("[]")
+    print(f"-- Build files have been written to: {build_dir}")  # noqa: T201
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
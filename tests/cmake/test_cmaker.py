@@ -3,7 +3,9 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import os
 import sys
+import json
 from typing import TYPE_CHECKING
 
 import pytest
@@ -14,10 +16,26 @@ from aedifix.cmake.cmake_flags import (
     CMakeList,
     CMakeString,
 )
-from aedifix.cmake.cmaker import CMaker
-from aedifix.util.exception import WrongOrderError
+from aedifix.cmake.cmaker import (
+    CMakeCacheDelta,
+    CMakeCommandSpec,
+    CMaker,
+    diff_cmake_cache,
+    make_initial_cache,
+    merge_cmake_commands,
+)
+from aedifix.manager import ConfigurationManager
+from aedifix.package.main_package import DRY_RUN_FLAG, FORCE_FLAG
+from aedifix.util.exception import (
+    UnsatisfiableConfigurationError,
+    WrongOrderError,
+)
+
+from ..fixtures.dummy_main_module import DummyMainModule
 
 if TYPE_CHECKING:
+    from pathlib import Path
+
     from ..fixtures.dummy_manager import DummyManager
 
 
@@ -143,5 +161,326 @@ class TestCMaker:
             cmaker.append_value(manager, "foo", [1, 2])
 
 
+class TestMergeCMakeCommands:
+    @pytest.mark.parametrize(
+        ("old", "new", "expected"),
+        (
+            ([], ["-DFOO=1"], ["-DFOO=1"]),
+            (["-DFOO:STRING=1"], ["-DFOO:STRING=2"], ["-DFOO:STRING=2"]),
+            # The type may change too
+            (["-DFOO:STRING=1"], ["-DFOO:BOOL=ON"], ["-DFOO:BOOL=ON"]),
+            (["-DFOO=1"], ["-UFOO"], ["-UFOO"]),
+            (
+                ["-DFOO=1", "-DBAR=1", "--trace"],
+                ["-DBAZ=1", "-DFOO=2"],
+                ["-DBAR=1", "--trace", "-DBAZ=1", "-DFOO=2"],
+            ),
+            (
+                ["--log-level=DEBUG", "--log-context"],
+                ["--log-level=TRACE", "--log-context"],
+                ["--log-level=TRACE", "--log-context"],
+            ),
+            # Separate values are joined
+            (["-D", "FOO=1"], ["-D", "FOO=2"], ["-DFOO=2"]),
+            # The last of duplicates wins
+            (["-DFOO=1", "-DBAR=1", "-DFOO=2"], [], ["-DBAR=1", "-DFOO=2"]),
+            (["-DFOO=1"], ["-DFOO=2", "-DFOO=3"], ["-DFOO=3"]),
+        ),
+    )
+    def test_merge(
+        self, old: list[str], new: list[str], expected: list[str]
+    ) -> None:
+        assert merge_cmake_commands(old, new) == expected
+
+    def test_max_size(self) -> None:
+        old = [f"-DOLD_{i}=1" for i in range(10)]
+        new = [f"-DNEW_{i}=1" for i in range(3)]
+        assert merge_cmake_commands(old, new, max_size=5) == [
+            "-DOLD_8=1",
+            "-DOLD_9=1",
+            *new,
+        ]
+        # The new commands are always kept
+        assert merge_cmake_commands(old, new, max_size=1) == new
+
+    def test_bounded(self) -> None:
+        cmds: list[str] = []
+        for i in range(100):
+            cmds = merge_cmake_commands(
+                cmds, ["--log-context", f"-DFOO:STRING={i}", f"-DBAR={i}"]
+            )
+        assert cmds == ["--log-context", "-DFOO:STRING=99", "-DBAR=99"]
+
+
+class TestDumpCMakeCommandSpec:
+    @staticmethod
+    def make_spec(commands: list[str]) -> CMakeCommandSpec:
+        return {
+            "CMAKE_EXECUTABLE": "cmake",
+            "CMAKE_GENERATOR": "Ninja",
+            "SOURCE_DIR": "/src",
+            "BUILD_DIR": "/build",
+            "CMAKE_COMMANDS": commands,
+        }
+
+    def test_merge(self, manager: DummyManager, tmp_path: Path) -> None:
+        cmd_file = tmp_path / "aedifix_cmake_command_spec.json"
+        CMaker._dump_cmake_command_spec(
+            manager, self.make_spec(["-DFOO=1", "-DBAR=1"]), cmd_file
+        )
+        CMaker._dump_cmake_command_spec(
+            manager, self.make_spec(["-DFOO=2"]), cmd_file
+        )
+        spec = json.loads(cmd_file.read_text())
+        assert spec == self.make_spec(["-DBAR=1", "-DFOO=2"])
+        assert list(tmp_path.iterdir()) == [cmd_file]
+
+    def test_unchanged(self, manager: DummyManager, tmp_path: Path) -> None:
+        cmd_file = tmp_path / "aedifix_cmake_command_spec.json"
+        spec = self.make_spec(["-DFOO=1"])
+        CMaker._dump_cmake_command_spec(manager, spec, cmd_file)
+        mtime = cmd_file.stat().st_mtime_ns - 10**9
+        os.utime(cmd_file, ns=(mtime, mtime))
+        CMaker._dump_cmake_command_spec(manager, spec, cmd_file)
+        assert cmd_file.stat().st_mtime_ns == mtime
+
+    @pytest.mark.parametrize("content", ("", "[]", "{}", "{"))
+    def test_unreadable(
+        self, manager: DummyManager, tmp_path: Path, content: str
+    ) -> None:
+        cmd_file = tmp_path / "aedifix_cmake_command_spec.json"
+        cmd_file.write_text(content)
+        CMaker._dump_cmake_command_spec(
+            manager, self.make_spec(["-DFOO=1"]), cmd_file
+        )
+        spec = json.loads(cmd_file.read_text())
+        assert spec["CMAKE_COMMANDS"] == ["-DFOO=1"]
+
+
+class TestInitialCache:
+    def test_make_initial_cache(self, tmp_path: Path) -> None:
+        export_vars_file = tmp_path / "aedifix_export_variables.txt"
+        script = make_initial_cache(
+            [
+                "-DFOO:BOOL=ON",
+                "-DBAR:PATH='/some path'",
+                '-DBAZ:STRING=a "b" $ENV{c} \\d;e',
+                "-DUNTYPED=1",
+                "-DAEDIFIX_EXPORT_VARIABLES:STRING='FOO;BAR'",
+            ],
+            export_vars_file,
+        )
+        lines = script.splitlines()
+        assert lines[0].startswith("# Generated by aedifix")
+        assert [line for line in lines if line.startswith("set(")] == [
+            'set(FOO "ON" CACHE BOOL "" FORCE)',
+            'set(BAR "/some path" CACHE PATH "" FORCE)',
+            'set(BAZ "a \\"b\\" \\$ENV{c} \\\\d;e" CACHE STRING "" FORCE)',
+            'set(UNTYPED "1" CACHE STRING "" FORCE)',
+            'set(AEDIFIX_EXPORT_VARIABLES "${_aedifix_export_vars}" CACHE '
+            'STRING "" FORCE)',
+        ]
+        assert (
+            f'file(STRINGS "{export_vars_file}" _aedifix_export_vars)' in lines
+        )
+        assert script.endswith("\n")
+
+    def test_make_initial_cache_bad(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Not a cache definition"):
+            make_initial_cache(["--trace"], tmp_path / "vars.txt")
+
+    def test_write_initial_cache(
+        self, manager: DummyManager, tmp_path: Path
+    ) -> None:
+        initial_cache = CMaker._write_initial_cache(
+            manager, tmp_path, ["-DFOO:BOOL=ON"], ["FOO", "BAR"]
+        )
+        assert initial_cache == tmp_path / "aedifix_initial_cache.cmake"
+        assert 'set(FOO "ON" CACHE BOOL "" FORCE)' in (
+            initial_cache.read_text()
+        )
+        export_vars_file = tmp_path / "aedifix_export_variables.txt"
+        assert export_vars_file.read_text() == "FOO\nBAR\n"
+
+
+class TestDiffCMakeCache:
+    def test_diff(self) -> None:
+        delta = diff_cmake_cache(
+            [
+                "-DSAME:STRING='same'",
+                "-DCHANGED:STRING=-O3",
+                "-DNEW:BOOL=ON",
+                "-DLATER:STRING=1",
+                "-DLATER:STRING=2",
+            ],
+            {
+                "SAME": "same",
+                "CHANGED": "-O2",
+                "LATER": "2",
+                "GONE": "x",
+                "FROM_CMAKE": "y",
+            },
+            ["SAME", "CHANGED", "GONE", "NOT_IN_CACHE"],
+        )
+        assert delta.definitions == ["-DCHANGED:STRING=-O3", "-DNEW:BOOL=ON"]
+        assert delta.changed == {
+            "CHANGED": ("-O2", "-O3"),
+            "NEW": (None, "ON"),
+        }
+        assert delta.removed == ["GONE"]
+        assert delta.unchanged == 2
+        assert delta.summary() == (
+            "Changed: CHANGED\n"
+            "New: NEW\n"
+            "Removed: GONE\n"
+            "(2 unchanged, not passed to CMake)"
+        )
+
+    def test_diff_empty_cache(self) -> None:
+        definitions = ["-DFOO:BOOL=ON", "-DBAR:STRING="]
+        delta = diff_cmake_cache(definitions, {}, ["BAZ"])
+        assert delta.definitions == definitions
+        assert not delta.removed
+        assert delta.unchanged == 0
+
+    def test_diff_no_changes(self) -> None:
+        delta = diff_cmake_cache(["-DFOO:BOOL=ON"], {"FOO": "ON"})
+        assert not delta.definitions
+        assert delta.summary() == (
+            "No changes\n(1 unchanged, not passed to CMake)"
+        )
+
+    def test_diff_cmake_cache(
+        self, manager: DummyManager, tmp_path: Path
+    ) -> None:
+        owned_file = tmp_path / "aedifix_cache_variables.txt"
+        initial_cache = str(tmp_path / "aedifix_initial_cache.cmake")
+        definitions = ["-DFOO:BOOL=ON", "-DBAR:STRING=bar"]
+        delta, reconfiguring = CMaker._diff_cmake_cache(
+            manager, tmp_path, definitions
+        )
+        assert not reconfiguring
+        assert delta.definitions == definitions
+        assert not owned_file.exists()
+        args = CMaker._apply_cmake_cache_delta(
+            manager, tmp_path, delta, definitions, ["FOO", "BAR"]
+        )
+        assert args == ["-C", initial_cache]
+        assert owned_file.read_text() == "FOO\nBAR\n"
+
+        (tmp_path / "CMakeCache.txt").write_text(
+            "# comment\n"
+            "//Help\n"
+            "FOO:BOOL=ON\n"
+            "BAR:STRING=bar\n"
+            "CMAKE_CXX_COMPILER:FILEPATH=/usr/bin/c++\n"
+        )
+        definitions = ["-DFOO:BOOL=OFF"]
+        delta, reconfiguring = CMaker._diff_cmake_cache(
+            manager, tmp_path, definitions
+        )
+        assert reconfiguring
+        assert delta.definitions == definitions
+        assert delta.removed == ["BAR"]
+        args = CMaker._apply_cmake_cache_delta(
+            manager, tmp_path, delta, definitions, ["FOO"]
+        )
+        assert args == ["-U", "BAR", "-C", initial_cache]
+        assert owned_file.read_text() == "FOO\n"
+
+
+def make_setup_manager(*argv: str) -> ConfigurationManager:
+    manager = ConfigurationManager(argv, DummyMainModule)
+    manager.setup()
+    return manager
+
+
+def make_delta(*changed: str) -> CMakeCacheDelta:
+    return CMakeCacheDelta(
+        definitions=[f"-D{name}:STRING=new" for name in changed],
+        changed=dict.fromkeys(changed, ("old", "new")),
+        removed=[],
+        unchanged=0,
+    )
+
+
+class TestCheckRebuildImpact:
+    @pytest.fixture
+    def build_dir(self, tmp_path: Path) -> Path:
+        (tmp_path / "a.o").touch()
+        (tmp_path / "compile_commands.json").write_text(
+            json.dumps(
+                [{"directory": str(tmp_path), "file": "a.cc", "output": "a.o"}]
+            )
+        )
+        return tmp_path
+
+    def test_fresh(self, build_dir: Path) -> None:
+        delta = make_delta("CMAKE_CXX_FLAGS")
+        manager = make_setup_manager()
+        assert CMaker._check_rebuild_impact(
+            manager, build_dir, delta, reconfiguring=False
+        )
+        manager = make_setup_manager(DRY_RUN_FLAG)
+        assert not CMaker._check_rebuild_impact(
+            manager, build_dir, delta, reconfiguring=False
+        )
+
+    def test_dry_run(self, build_dir: Path) -> None:
+        manager = make_setup_manager(DRY_RUN_FLAG)
+        for changed in ("CMAKE_INSTALL_PREFIX", "CMAKE_CXX_FLAGS"):
+            assert not CMaker._check_rebuild_impact(
+                manager, build_dir, make_delta(changed), reconfiguring=True
+            )
+
+    def test_cheap(self, build_dir: Path) -> None:
+        manager = make_setup_manager()
+        for changed in ("CMAKE_INSTALL_PREFIX", "MY_PROJECT_USE_FOO"):
+            assert CMaker._check_rebuild_impact(
+                manager, build_dir, make_delta(changed), reconfiguring=True
+            )
+
+    def test_full(
+        self, build_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        delta = make_delta("CMAKE_BUILD_TYPE")
+        answers = []
+
+        def confirm(_self: ConfigurationManager, question: str) -> bool:
+            answers.append(question)
+            return len(answers) == 1
+
+        monkeypatch.setattr(ConfigurationManager, "confirm", confirm)
+        manager = make_setup_manager()
+        # Confirmed
+        assert CMaker._check_rebuild_impact(
+            manager, build_dir, delta, reconfiguring=True
+        )
+        # Declined
+        with pytest.raises(
+            UnsatisfiableConfigurationError, match="recompile all 1 built"
+        ):
+            CMaker._check_rebuild_impact(
+                manager, build_dir, delta, reconfiguring=True
+            )
+        assert len(answers) == 2
+
+        manager = make_setup_manager(FORCE_FLAG)
+        assert CMaker._check_rebuild_impact(
+            manager, build_dir, delta, reconfiguring=True
+        )
+        assert len(answers) == 2
+
+    def test_full_nothing_built(self, build_dir: Path) -> None:
+        (build_dir / "a.o").unlink()
+        manager = make_setup_manager()
+        assert CMaker._check_rebuild_impact(
+            manager,
+            build_dir,
+            make_delta("CMAKE_BUILD_TYPE"),
+            reconfiguring=True,
+        )
+
+
 if __name__ == "__main__":
     sys.exit(pytest.main())
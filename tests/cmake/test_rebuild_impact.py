@@ -0,0 +1,150 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import sys
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from aedifix.cmake.rebuild_impact import (
+    RebuildEstimate,
+    RebuildImpact,
+    classify_variable,
+    count_built_translation_units,
+    estimate_rebuild,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def write_compile_commands(
+    build_dir: Path, entries: list[dict[str, Any]]
+) -> Path:
+    compile_commands = build_dir / "compile_commands.json"
+    compile_commands.write_text(json.dumps(entries))
+    return compile_commands
+
+
+class TestClassifyVariable:
+    @pytest.mark.parametrize(
+        ("name", "impact"),
+        (
+            ("CMAKE_INSTALL_PREFIX", RebuildImpact.NONE),
+            ("CMAKE_INSTALL_LIBDIR", RebuildImpact.NONE),
+            ("AEDIFIX_EXPORT_VARIABLES", RebuildImpact.NONE),
+            ("CMAKE_EXE_LINKER_FLAGS", RebuildImpact.RELINK),
+            ("CMAKE_SHARED_LINKER_FLAGS_RELEASE", RebuildImpact.RELINK),
+            ("CMAKE_BUILD_TYPE", RebuildImpact.FULL),
+            ("CMAKE_CXX_FLAGS", RebuildImpact.FULL),
+            ("CMAKE_CUDA_FLAGS_DEBUG", RebuildImpact.FULL),
+            ("CMAKE_C_COMPILER", RebuildImpact.FULL),
+            ("CMAKE_CXX_COMPILER_LAUNCHER", RebuildImpact.FULL),
+            ("CMAKE_CUDA_HOST_COMPILER", RebuildImpact.FULL),
+            ("CMAKE_CUDA_ARCHITECTURES", RebuildImpact.FULL),
+            ("CMAKE_CXX_STANDARD", RebuildImpact.FULL),
+            ("MY_PROJECT_USE_FOO", RebuildImpact.UNKNOWN),
+        ),
+    )
+    def test_classify(self, name: str, impact: RebuildImpact) -> None:
+        assert classify_variable(name) == impact
+
+    def test_classify_inert(self) -> None:
+        assert (
+            classify_variable("MY_ARCH", inert={"MY_ARCH"})
+            == RebuildImpact.NONE
+        )
+
+
+class TestCountBuiltTranslationUnits:
+    def test_count(self, tmp_path: Path) -> None:
+        (tmp_path / "a.o").touch()
+        (tmp_path / "b.o").touch()
+        compile_commands = write_compile_commands(
+            tmp_path,
+            [
+                {"directory": str(tmp_path), "file": "a.cc", "output": "a.o"},
+                {
+                    "directory": str(tmp_path),
+                    "file": "b.cc",
+                    "arguments": ["c++", "-c", "b.cc", "-o", "b.o"],
+                },
+                {
+                    "directory": str(tmp_path),
+                    "file": "c.cc",
+                    "command": "c++ -c c.cc -oc.o",
+                },
+                # Unknown object file, counted as built
+                {"directory": str(tmp_path), "file": "d.cc", "command": ""},
+            ],
+        )
+        assert count_built_translation_units(compile_commands) == (3, 4)
+
+    def test_count_missing(self, tmp_path: Path) -> None:
+        compile_commands = tmp_path / "compile_commands.json"
+        assert count_built_translation_units(compile_commands) is None
+        compile_commands.write_text("{}")
+        assert count_built_translation_units(compile_commands) is None
+
+
+class TestRebuildEstimate:
+    def test_estimate(self, tmp_path: Path) -> None:
+        (tmp_path / "a.o").touch()
+        compile_commands = write_compile_commands(
+            tmp_path,
+            [
+                {"directory": str(tmp_path), "file": "a.cc", "output": "a.o"},
+                {"directory": str(tmp_path), "file": "b.cc", "output": "b.o"},
+            ],
+        )
+        estimate = estimate_rebuild(
+            ["CMAKE_INSTALL_PREFIX", "CMAKE_CXX_FLAGS", "MY_OPTS"],
+            compile_commands,
+            inert={"MY_OPTS"},
+        )
+        assert estimate.impacts == {
+            "CMAKE_INSTALL_PREFIX": RebuildImpact.NONE,
+            "CMAKE_CXX_FLAGS": RebuildImpact.FULL,
+            "MY_OPTS": RebuildImpact.NONE,
+        }
+        assert estimate.impact == RebuildImpact.FULL
+        assert (estimate.built, estimate.total) == (1, 2)
+        assert estimate.rebuilt == 1
+        assert estimate.summary() == (
+            "full: CMAKE_CXX_FLAGS\n"
+            "none: CMAKE_INSTALL_PREFIX, MY_OPTS\n"
+            "Recompiles 1 of the 1 built (of 2) translation units"
+        )
+
+    @pytest.mark.parametrize(
+        ("impacts", "rebuilt"),
+        (
+            ({}, 0),
+            ({"A": RebuildImpact.RELINK}, 0),
+            ({"A": RebuildImpact.RELINK, "B": RebuildImpact.UNKNOWN}, None),
+            ({"A": RebuildImpact.FULL, "B": RebuildImpact.UNKNOWN}, 10),
+        ),
+    )
+    def test_rebuilt(
+        self, impacts: dict[str, RebuildImpact], rebuilt: int | None
+    ) -> None:
+        estimate = RebuildEstimate(impacts=impacts, built=10, total=20)
+        assert estimate.rebuilt == rebuilt
+
+    def test_summary_unknown(self, tmp_path: Path) -> None:
+        estimate = estimate_rebuild(
+            ["MY_PROJECT_USE_FOO"], tmp_path / "compile_commands.json"
+        )
+        assert estimate.built is None
+        assert estimate.summary() == (
+            "unknown: MY_PROJECT_USE_FOO\n"
+            "Number of built translation units unknown (no "
+            "compile_commands.json)"
+        )
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -25,6 +25,12 @@ def setup_env() -> None:
     environ["__AEDIFIX_TESTING_DO_NOT_USE_OR_YOU_WILL_BE_FIRED__"] = "1"
 
 
+@pytest.fixture(scope="session", autouse=True)
+def setup_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> None:
+    # Don't pollute (or use) the user's cache, e.g. the probe cache
+    environ["XDG_CACHE_HOME"] = str(tmp_path_factory.mktemp("xdg_cache"))
+
+
 @pytest.fixture(autouse=True)
 def setup_project_dir(tmp_path_factory: pytest.TempPathFactory) -> None:
     tmp_path = tmp_path_factory.mktemp(_id_generator(size=16))
@@ -13,6 +13,7 @@ from .dummy_main_module import DummyMainModule
 
 if TYPE_CHECKING:
     from collections.abc import Callable, Sequence
+    from pathlib import Path
 
 _T = TypeVar("_T")
 _P = ParamSpec("_P")
@@ -32,10 +33,17 @@ class DummyManager(ConfigurationManager):
         pass
 
     def log_execute_command(
-        self, command: Sequence[_T], *, live: bool = False
+        self,
+        command: Sequence[_T],
+        *,
+        live: bool = False,
+        outputs: Sequence[Path] = (),
     ) -> Any:
         pass
 
+    def log_execute_probe(self, command: Sequence[_T]) -> Any:
+        pass
+
     def log_execute_func(  # type: ignore[override]
         self, func: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs
     ) -> _T:
@@ -4,15 +4,21 @@
 from __future__ import annotations
 
 import sys
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
 
+from aedifix.logger import LogLevel
 from aedifix.package.main_package import DebugConfigureValue
+from aedifix.util.log_file import LogCompression
+from aedifix.util.utility import ValueProvenance
 
 if TYPE_CHECKING:
     from collections.abc import Iterator
 
+    from ..fixtures.dummy_manager import DummyManager
+
 ALL_DEBUG_CONFIGURE_FLAGS = (
     DebugConfigureValue.NONE,
     DebugConfigureValue.DEBUG_FIND,
@@ -62,5 +68,176 @@ class TestDebugConfigureValue:
         assert val.to_flags() == expected
 
 
+class TestPreparse:
+    def test_command_line(self, manager: DummyManager) -> None:
+        main_package = manager._main_package
+        argv = (
+            "--AEDIFIX_PYTEST_ARCH=foo",
+            "--with-cuda",
+            "--with-python",
+            "0",
+            "--build-type",
+            "release",
+            "--",
+            "--with-python",
+            "-DFOO=1",
+        )
+        preparsed = main_package.preparse(argv)
+        assert preparsed.argv == argv[:6]
+        assert preparsed.arch == "foo"
+        assert preparsed.arch_provenance == ValueProvenance.COMMAND_LINE
+        assert preparsed.with_cuda is True
+        assert preparsed.with_python is False
+        assert preparsed.build_type == "release"
+        assert preparsed.flags == {
+            "--AEDIFIX_PYTEST_ARCH",
+            "--with-cuda",
+            "--with-python",
+            "--build-type",
+        }
+
+    def test_environment(
+        self, manager: DummyManager, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("AEDIFIX_PYTEST_ARCH", "bar")
+        monkeypatch.setenv("CMAKE_BUILD_TYPE", "Debug")
+        main_package = manager._main_package
+        # The manager has already pre-parsed the (empty) command line
+        main_package._preparsed = None
+        preparsed = main_package.preparse(())
+        assert preparsed.arch == "bar"
+        assert preparsed.arch_provenance == ValueProvenance.ENVIRONMENT
+        assert preparsed.with_cuda is None
+        assert preparsed.with_python is None
+        assert preparsed.build_type == "Debug"
+        assert preparsed.flags == frozenset()
+
+    def test_cached(self, manager: DummyManager) -> None:
+        main_package = manager._main_package
+        argv = ["--with-cuda", "--", "-DFOO=1"]
+        preparsed = main_package.preparse(argv)
+        # Both the full and the partitioned command line must hit the cache
+        assert main_package.preparse(argv) is preparsed
+        assert main_package.preparse(argv[:1]) is preparsed
+        assert main_package.preparse(["--with-python"]) is not preparsed
+
+    @pytest.mark.parametrize(
+        ("argv", "debug_configure", "log_level", "file_log_level"),
+        (
+            ((), None, None, LogLevel.INFO),
+            (
+                ("--debug-configure",),
+                DebugConfigureValue.DEBUG_FIND,
+                None,
+                LogLevel.DEBUG,
+            ),
+            (
+                ("--debug-configure=2", "--log-level", "error"),
+                DebugConfigureValue.TRACE,
+                LogLevel.ERROR,
+                LogLevel.ERROR,
+            ),
+            # Invalid values are left for the full parse to diagnose
+            (
+                ("--debug-configure=foo", "--log-level", "bar"),
+                None,
+                None,
+                LogLevel.INFO,
+            ),
+        ),
+    )
+    def test_log_level(
+        self,
+        manager: DummyManager,
+        argv: tuple[str, ...],
+        debug_configure: DebugConfigureValue | None,
+        log_level: LogLevel | None,
+        file_log_level: LogLevel,
+    ) -> None:
+        preparsed = manager._main_package.preparse(argv)
+        assert preparsed.debug_configure == debug_configure
+        assert preparsed.log_level == log_level
+        assert preparsed.file_log_level == file_log_level
+
+    @pytest.mark.parametrize(
+        ("argv", "compression", "max_size"),
+        (
+            ((), None, None),
+            (
+                ("--log-compression=xz", "--log-max-size", "2K"),
+                LogCompression.XZ,
+                2048,
+            ),
+            (("--log-compression=zip", "--log-max-size=0"), None, None),
+        ),
+    )
+    def test_log_file(
+        self,
+        manager: DummyManager,
+        argv: tuple[str, ...],
+        compression: LogCompression | None,
+        max_size: int | None,
+    ) -> None:
+        preparsed = manager._main_package.preparse(argv)
+        assert preparsed.log_compression == compression
+        assert preparsed.log_max_size == max_size
+
+    @pytest.mark.parametrize(
+        ("argv", "record", "replay"),
+        (
+            ((), None, None),
+            (("--record-commands", "foo.json"), Path("foo.json"), None),
+            (("--replay-commands=/bar.json",), None, Path("/bar.json")),
+        ),
+    )
+    def test_commands(
+        self,
+        manager: DummyManager,
+        argv: tuple[str, ...],
+        record: Path | None,
+        replay: Path | None,
+    ) -> None:
+        preparsed = manager._main_package.preparse(argv)
+        assert preparsed.record_commands == record
+        assert preparsed.replay_commands == replay
+
+    @pytest.mark.parametrize(
+        ("argv", "dry_run"),
+        (((), None), (("--dry-run",), True), (("--dry-run=0",), False)),
+    )
+    def test_dry_run(
+        self,
+        manager: DummyManager,
+        argv: tuple[str, ...],
+        dry_run: bool | None,
+    ) -> None:
+        assert manager._main_package.preparse(argv).dry_run is dry_run
+
+    @pytest.mark.parametrize(
+        ("argv", "suffix"),
+        (
+            ((), "-release"),
+            (("--with-cuda",), "-cuda-release"),
+            (("--with-python", "--with-cuda=0"), "-py-release"),
+            (("--build-type=debug",), "-debug"),
+        ),
+    )
+    def test_generated_arch(
+        self,
+        manager: DummyManager,
+        monkeypatch: pytest.MonkeyPatch,
+        argv: tuple[str, ...],
+        suffix: str,
+    ) -> None:
+        monkeypatch.delenv("AEDIFIX_PYTEST_ARCH")
+        monkeypatch.delenv("CMAKE_BUILD_TYPE", raising=False)
+        main_package = manager._main_package
+        main_package._preparsed = None
+        arch, provenance = main_package.preparse_arch_value(argv)
+        assert provenance == ValueProvenance.GENERATED
+        assert arch.startswith("arch-")
+        assert arch.endswith(suffix)
+
+
 if __name__ == "__main__":
     sys.exit(pytest.main())
@@ -0,0 +1,83 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import sys
+from typing import Final
+
+import pytest
+
+from aedifix.cmake import CMAKE_VARIABLE, CMakeString
+from aedifix.package import Package
+from aedifix.packages.cuda import CUDA
+from aedifix.util.argument_parser import (
+    ArgSpec,
+    ConfigArgument,
+    ExclusiveArgumentGroup,
+)
+
+WITH_FOO = ConfigArgument(
+    name="--with-foo",
+    spec=ArgSpec(dest="with_foo", type=bool),
+    enables_package=True,
+    primary=True,
+)
+FOO_DIR = ConfigArgument(
+    name="--foo-dir", spec=ArgSpec(dest="foo_dir"), enables_package=True
+)
+FOO_VAR = CMAKE_VARIABLE("FOO_VAR", CMakeString)
+FOO_GROUP = ExclusiveArgumentGroup(
+    A=ConfigArgument(name="--foo-a", spec=ArgSpec(dest="foo_a")),
+    B=ConfigArgument(name="--foo-b", spec=ArgSpec(dest="foo_b")),
+)
+
+
+class Foo(Package):
+    name = "Foo"
+
+    With_Foo: Final = WITH_FOO
+    Foo_Group: Final = FOO_GROUP
+    A_Foo_Dir: Final = FOO_DIR
+
+    @property
+    def broken(self) -> ConfigArgument:
+        raise AssertionError
+
+
+class Bar(Foo):
+    name = "Bar"
+
+    FOO_VAR: Final = FOO_VAR
+    # Shadows the parent's option
+    A_Foo_Dir = None  # type: ignore[misc, assignment]
+
+
+class TestPackageOptions:
+    def test_base(self) -> None:
+        assert Package.__package_options__ == ()
+
+    def test_registry(self) -> None:
+        assert Foo.__package_options__ == (
+            ("A_Foo_Dir", FOO_DIR),
+            ("Foo_Group", FOO_GROUP),
+            ("With_Foo", WITH_FOO),
+        )
+
+    def test_inherited(self) -> None:
+        assert Bar.__package_options__ == (
+            ("FOO_VAR", FOO_VAR),
+            ("Foo_Group", FOO_GROUP),
+            ("With_Foo", WITH_FOO),
+        )
+
+    def test_default_package(self) -> None:
+        names = [name for name, _ in CUDA.__package_options__]
+        assert names == sorted(names)
+        assert "With_CUDA" in names
+        assert "CMAKE_CUDA_COMPILER" in names
+        assert "state" not in names
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import sys
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aedifix.fingerprint import Fingerprint
+from aedifix.manager import ConfigurationManager
+
+from .fixtures.dummy_main_module import DummyMainModule
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .fixtures.dummy_manager import DummyManager
+
+
+@pytest.fixture
+def fingerprint(manager: DummyManager) -> Fingerprint:
+    manager.project_arch_dir.mkdir(parents=True)
+    return Fingerprint(manager, manager._main_package)
+
+
+ARGV = ("--AEDIFIX_PYTEST_ARCH=arch-pytest", "--foo", "bar")
+
+
+class TestFingerprint:
+    def test_create(self, fingerprint: Fingerprint) -> None:
+        assert fingerprint.fingerprint_file == (
+            fingerprint.project_arch_dir / "aedifix_fingerprint.json"
+        )
+        assert not fingerprint.fingerprint_file.exists()
+
+    def test_no_fingerprint(self, fingerprint: Fingerprint) -> None:
+        assert fingerprint.changed_inputs(ARGV) == [
+            "no previous configuration fingerprint"
+        ]
+
+    def test_up_to_date(
+        self, fingerprint: Fingerprint, tmp_path: Path
+    ) -> None:
+        tool = tmp_path / "cc"
+        tool.touch()
+        output = tmp_path / "output.txt"
+        output.touch()
+        fingerprint.finalize(argv=ARGV, toolchain=[tool], outputs=[output])
+        assert fingerprint.fingerprint_file.exists()
+        data = json.loads(fingerprint.fingerprint_file.read_text())
+        assert data["ARGV"] == list(ARGV)
+        assert data["TOOLCHAIN"] == [str(tool)]
+        assert data["OUTPUTS"] == [str(output)]
+        assert fingerprint.changed_inputs(ARGV) == []
+
+    def test_recorded_digest(self, fingerprint: Fingerprint) -> None:
+        assert fingerprint.recorded_digest() is None
+        fingerprint.finalize(argv=ARGV, toolchain=[], outputs=[])
+        digest = fingerprint.recorded_digest()
+        assert digest is not None
+        assert len(digest) == 64
+        fingerprint.finalize(argv=ARGV, toolchain=[], outputs=[])
+        assert fingerprint.recorded_digest() == digest
+        fingerprint.finalize(argv=(*ARGV, "--baz"), toolchain=[], outputs=[])
+        assert fingerprint.recorded_digest() != digest
+
+    def test_changed_argv(self, fingerprint: Fingerprint) -> None:
+        fingerprint.finalize(argv=ARGV, toolchain=[], outputs=[])
+        assert fingerprint.changed_inputs((*ARGV, "--baz")) == [
+            "command-line arguments"
+        ]
+
+    def test_changed_environ(
+        self,
+        manager: DummyManager,
+        fingerprint: Fingerprint,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setenv("AEDIFIX_FINGERPRINT_TEST_VAR", "1")
+        monkeypatch.delenv("AEDIFIX_FINGERPRINT_TEST_VAR_2", raising=False)
+        fingerprint = Fingerprint(manager, manager._main_package)
+        fingerprint.finalize(argv=ARGV, toolchain=[], outputs=[])
+
+        monkeypatch.setenv("AEDIFIX_FINGERPRINT_TEST_VAR", "2")
+        monkeypatch.setenv("AEDIFIX_FINGERPRINT_TEST_VAR_2", "2")
+        # Ignored variable
+        monkeypatch.setenv("OLDPWD", "/some/where/else")
+        fingerprint = Fingerprint(manager, manager._main_package)
+        assert fingerprint.changed_inputs(ARGV) == [
+            "environment variable AEDIFIX_FINGERPRINT_TEST_VAR",
+            "environment variable AEDIFIX_FINGERPRINT_TEST_VAR_2 (added)",
+        ]
+
+    def test_changed_toolchain(
+        self, fingerprint: Fingerprint, tmp_path: Path
+    ) -> None:
+        tool = tmp_path / "cc"
+        tool.write_text("foo")
+        fingerprint.finalize(argv=ARGV, toolchain=[tool], outputs=[])
+        assert fingerprint.changed_inputs(ARGV) == []
+
+        st = tool.stat()
+        os.utime(tool, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert fingerprint.changed_inputs(ARGV) == [
+            f"toolchain executable {tool}"
+        ]
+
+    def test_missing_output(
+        self, fingerprint: Fingerprint, tmp_path: Path
+    ) -> None:
+        output = tmp_path / "output.txt"
+        output.touch()
+        fingerprint.finalize(argv=ARGV, toolchain=[], outputs=[output])
+        output.unlink()
+        assert fingerprint.changed_inputs(ARGV) == [
+            f"output {output} (missing)"
+        ]
+
+    def test_bad_version(self, fingerprint: Fingerprint) -> None:
+        fingerprint.finalize(argv=ARGV, toolchain=[], outputs=[])
+        data = json.loads(fingerprint.fingerprint_file.read_text())
+        data["VERSION"] = -1
+        fingerprint.fingerprint_file.write_text(json.dumps(data))
+        assert fingerprint.changed_inputs(ARGV) == [
+            "no previous configuration fingerprint"
+        ]
+
+    def test_invalidate(self, fingerprint: Fingerprint) -> None:
+        fingerprint.invalidate()
+        fingerprint.finalize(argv=ARGV, toolchain=[], outputs=[])
+        assert fingerprint.fingerprint_file.exists()
+        fingerprint.invalidate()
+        assert not fingerprint.fingerprint_file.exists()
+
+
+class TestManagerFastPath:
+    def test_up_to_date(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        manager = ConfigurationManager(ARGV, DummyMainModule)
+        manager.project_arch_dir.mkdir(parents=True)
+        manager._fingerprint.finalize(argv=ARGV, toolchain=[], outputs=[])
+        monkeypatch.setattr(
+            sys, "argv", [str(manager._reconfigure.reconfigure_file)]
+        )
+
+        def setup(_self: ConfigurationManager) -> None:
+            pytest.fail("setup() should not have been called")
+
+        monkeypatch.setattr(ConfigurationManager, "setup", setup)
+        manager.main()
+        assert manager._fingerprint.fingerprint_file.exists()
+
+    def test_not_reconfigure(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        manager = ConfigurationManager(ARGV, DummyMainModule)
+        manager.project_arch_dir.mkdir(parents=True)
+        manager._fingerprint.finalize(argv=ARGV, toolchain=[], outputs=[])
+
+        class Called(Exception):
+            pass
+
+        def setup(_self: ConfigurationManager) -> None:
+            raise Called
+
+        monkeypatch.setattr(ConfigurationManager, "setup", setup)
+        with pytest.raises(Called):
+            manager.main()
+        # Any prior fingerprint must be removed before reconfiguring
+        assert not manager._fingerprint.fingerprint_file.exists()
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -3,12 +3,17 @@
 # SPDX-License-Identifier: Apache-2.0
 from __future__ import annotations
 
+import io
 import sys
+import threading
 from typing import TYPE_CHECKING
 
 import pytest
+from rich.console import Console
+from rich.live import Live
 
-from aedifix.logger import Logger
+from aedifix.logger import HEADLESS_ENV_VAR, LiveRows, Logger, LogLevel
+from aedifix.util.log_file import LogCompression
 
 if TYPE_CHECKING:
     from pathlib import Path
@@ -21,17 +26,24 @@ def tmp_configure_log(AEDIFIX_PYTEST_DIR: Path) -> Path:
 
 @pytest.fixture
 def logger(tmp_configure_log: Path) -> Logger:
-    return Logger(tmp_configure_log)
+    return Logger(tmp_configure_log, headless=False)
+
+
+@pytest.fixture
+def headless_logger(tmp_configure_log: Path) -> Logger:
+    return Logger(tmp_configure_log, headless=True)
 
 
 class TestLogger:
     def test_create(self, tmp_configure_log: Path) -> None:
         import logging
 
-        logger = Logger(tmp_configure_log)
+        logger = Logger(tmp_configure_log, headless=False)
         assert isinstance(logger._file_logger, logging.Logger)
         assert logger.file_path == tmp_configure_log
-        assert len(logger._row_data) == 0
+        assert len(logger._rows) == 0
+        assert not logger.headless
+        assert logger._live is not None
         assert not logger._live.is_started
 
     def test_flush(self, logger: Logger) -> None:
@@ -48,39 +60,57 @@ class TestLogger:
         assert captured.err == ""
 
     def test_logger_context(self, logger: Logger) -> None:
+        assert logger._live is not None
         assert logger._live.is_started is False
         with logger as lg:
             # Need to use alias lg since otherwise mypy says the final line is
             # unreachable, since I guess it assumes the lifetime of the
             # variable "logger" is tied to the with statement?
             assert lg is logger
+            assert lg._live is not None
             assert lg._live.is_started is True
         assert logger._live.is_started is False
 
-    def test_append_live_message(self, logger: Logger) -> None:
-        row_data = logger._row_data
-        # make sure that the above access doesn't return a copy or something
-        # like that
-        assert row_data is logger._row_data
-        assert row_data.maxlen is not None
-        assert len(row_data) == 0
-        logger._append_live_message("foo", keep=True)
-        assert len(row_data) == 1
-        assert row_data[0] == ("foo", True)
-        for i in range(row_data.maxlen - len(row_data)):
-            row_data.append((f"bar_{i}", False))
-        assert len(row_data) == row_data.maxlen
-        assert row_data[0] == ("foo", True)
-        logger._append_live_message("new_foo", keep=True)
-        assert len(row_data) == row_data.maxlen
-        assert row_data[0] == ("foo", True)
-        # The last non-kept entry should now be next
-        assert row_data[1] == ("bar_1", False)
-
-    def test_append_live_message_full(self, logger: Logger) -> None:
-        assert logger._row_data.maxlen is not None
-        for i in range(logger._row_data.maxlen):
-            logger._row_data.append((f"foo_{i}", True))
+    def test_log_screen_coalesced(
+        self, tmp_configure_log: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        logger = Logger(
+            tmp_configure_log, refresh_per_second=1, headless=False
+        )
+        refreshes = 0
+        orig_refresh = Live.refresh
+
+        def refresh(self: Live) -> None:
+            nonlocal refreshes
+            refreshes += 1
+            orig_refresh(self)
+
+        monkeypatch.setattr(Live, "refresh", refresh)
+        with logger:
+            for i in range(100):
+                logger.log_screen(f"foo_{i}")
+        # Once on start, possibly once from the refresh thread, once on
+        # flush, and once on stop.
+        assert refreshes <= 4
+        assert len(logger._rows) == logger._rows.max_rows
+
+    def test_log_screen_rendered(self, tmp_configure_log: Path) -> None:
+        console = Console(file=io.StringIO(), width=80)
+        logger = Logger(
+            tmp_configure_log,
+            max_live_lines=3,
+            console=console,
+            headless=False,
+        )
+        with logger:
+            logger.log_screen(["foo", "bar", "baz", "qux"])
+        out = console.file.getvalue()  # type: ignore[attr-defined]
+        assert "foo" not in out
+        for mess in ("bar", "baz", "qux"):
+            assert mess in out
+
+    def test_log_screen_all_persistent(self, tmp_configure_log: Path) -> None:
+        logger = Logger(tmp_configure_log, max_live_lines=2, headless=False)
         with pytest.raises(
             ValueError,
             match=(
@@ -88,7 +118,7 @@ class TestLogger:
                 "persistent"
             ),
         ):
-            logger._append_live_message("oh no", keep=True)
+            logger.log_screen(["foo", "bar", "baz"], keep=True)
 
     def test_log_file(self, logger: Logger) -> None:
         mess = "foo bar baz"
@@ -117,6 +147,289 @@ class TestLogger:
         assert orig_log.is_file()
         assert orig_log.read_text() == full_mess
 
+    def test_copy_log_compressed(self, tmp_configure_log: Path) -> None:
+        import gzip
+
+        logger = Logger(
+            tmp_configure_log,
+            headless=True,
+            file_compression=LogCompression.GZIP,
+        )
+        logger.log_file("foo")
+        orig_log = logger.file_path
+        assert orig_log.name == "configure.log.gz"
+        dest = logger.copy_log(orig_log.parent / "backup_log.log")
+        assert dest == orig_log.parent / "backup_log.log.gz"
+        full_mess = f"foo\nCopying file log from {orig_log} to {dest}\n"
+        with gzip.open(dest, "rt") as fd:
+            assert fd.read() == full_mess
+        # Logging continues after the copy
+        logger.log_file("bar")
+        logger._file_handler.close()
+        with gzip.open(orig_log, "rt") as fd:
+            assert fd.read() == full_mess + "bar\n"
+
+    def test_buffered(self, logger: Logger) -> None:
+        logger.log_file("first")
+        with logger.buffered() as buffer:
+            logger.log_file("second")
+            logger.log_divider(tee=False)
+        assert len(buffer) == 2
+        assert logger.file_path.read_text() == "first\n"
+        logger.log_file("third")
+        logger.replay(buffer)
+        assert not buffer
+        lines = logger.file_path.read_text().splitlines()
+        assert lines[:3] == ["first", "third", "second"]
+
+    def test_buffered_thread_local(self, logger: Logger) -> None:
+        def target() -> None:
+            logger.log_file("from thread")
+
+        with logger.buffered() as buffer:
+            thread = threading.Thread(target=target)
+            thread.start()
+            thread.join()
+        assert not buffer
+        assert logger.file_path.read_text() == "from thread\n"
+
+
+class TestLoggerFile:
+    def test_file_level(self, logger: Logger) -> None:
+        assert logger.file_level == LogLevel.INFO
+        assert logger.is_enabled_for(LogLevel.INFO)
+        assert not logger.is_enabled_for(LogLevel.DEBUG)
+        logger.log_file("foo", level=LogLevel.DEBUG)
+        logger.log_file("bar")
+        assert logger.file_path.read_text() == "bar\n"
+
+        logger.file_level = LogLevel.DEBUG
+        assert logger.is_enabled_for(LogLevel.DEBUG)
+        logger.log_file("baz", level=LogLevel.DEBUG)
+        assert logger.file_path.read_text() == "bar\nbaz\n"
+
+    def test_file_level_warning(self, tmp_configure_log: Path) -> None:
+        logger = Logger(tmp_configure_log, file_level=LogLevel.WARNING)
+        logger.log_file("foo")
+        logger.log_boxed("bar", title="BAR")
+        logger.log_warning("baz")
+        text = logger.file_path.read_text()
+        assert "foo" not in text
+        assert "bar" not in text
+        assert "baz" in text
+        assert "WARNING" in text
+
+    def test_background_writer(self, headless_logger: Logger) -> None:
+        logger = headless_logger
+        assert logger._file_writer is None
+        lines = [f"foo_{i}" for i in range(1_000)]
+        with logger as lg:
+            # Need to use alias lg, see test_logger_context()
+            assert lg._file_writer is not None
+            for line in lines:
+                lg.log_file(line)
+            lg.flush()
+            assert lg.file_path.read_text().splitlines() == lines
+            lg.log_file("bar")
+        # Everything written by the time the context exits
+        assert logger._file_writer is None
+        assert logger.file_path.read_text().splitlines() == [*lines, "bar"]
+        # Synchronous again
+        logger.log_file("baz")
+        assert logger.file_path.read_text().splitlines()[-1] == "baz"
+
+    @pytest.mark.parametrize(
+        ("str_val", "expected"),
+        (
+            ("debug", LogLevel.DEBUG),
+            ("INFO", LogLevel.INFO),
+            (" Warning ", LogLevel.WARNING),
+            ("error", LogLevel.ERROR),
+        ),
+    )
+    def test_log_level_from_string(
+        self, str_val: str, expected: LogLevel
+    ) -> None:
+        assert LogLevel.from_string(str_val) == expected
+        assert LogLevel.from_string(str(expected)) == expected
+
+    def test_log_level_from_string_bad(self) -> None:
+        with pytest.raises(ValueError, match="Unknown log level: 'foo'"):
+            LogLevel.from_string("foo")
+
+
+class TestLoggerHeadless:
+    @pytest.mark.parametrize(
+        ("env_val", "expected"),
+        (("1", True), ("yes", True), ("0", False), ("off", False)),
+    )
+    def test_detect_from_environ(
+        self,
+        tmp_configure_log: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        env_val: str,
+        expected: bool,
+    ) -> None:
+        monkeypatch.setenv(HEADLESS_ENV_VAR, env_val)
+        logger = Logger(tmp_configure_log)
+        assert logger.headless == expected
+        assert (logger._live is None) == expected
+
+    def test_detect_from_stdout(
+        self, tmp_configure_log: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv(HEADLESS_ENV_VAR, raising=False)
+        # pytest captures stdout, so it is never a terminal
+        assert Logger(tmp_configure_log).headless
+        monkeypatch.setattr(sys.stdout, "isatty", lambda: True)
+        assert not Logger(tmp_configure_log).headless
+
+    def test_log_screen(
+        self, headless_logger: Logger, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        with headless_logger:
+            headless_logger.log_screen("foo")
+            headless_logger.log_screen(["bar", "baz"], keep=True)
+        captured = capsys.readouterr()
+        assert captured.out == "foo\nbar\nbaz\n"
+        assert captured.err == ""
+
+    def test_log_screen_outside_context(
+        self, headless_logger: Logger, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        headless_logger.log_screen("foo")
+        assert capsys.readouterr().out == "foo\n"
+
+    def test_log_boxed(
+        self, headless_logger: Logger, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        headless_logger.log_warning("something [bold]bad[/] happened")
+        out = capsys.readouterr().out
+        lines = out.splitlines()
+        assert lines[0] == "=" * (headless_logger.width - 1)
+        assert lines[-1] == lines[0]
+        assert "***** WARNING *****" in out
+        assert "something [bold]bad[/] happened" in out
+        assert out in headless_logger.file_path.read_text()
+
+    def test_log_divider(
+        self, headless_logger: Logger, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        headless_logger.log_divider(tee=True)
+        divider = "=" * (headless_logger.width - 1)
+        assert capsys.readouterr().out == divider + "\n"
+        assert headless_logger.file_path.read_text() == divider + "\n"
+
+    @pytest.mark.parametrize(
+        ("answer", "expected"),
+        (("y", True), (" YES ", True), ("", False), ("nope", False)),
+    )
+    def test_confirm(
+        self,
+        headless_logger: Logger,
+        monkeypatch: pytest.MonkeyPatch,
+        answer: str,
+        expected: bool,
+    ) -> None:
+        questions = []
+
+        def fake_input(prompt: str) -> str:
+            questions.append(prompt)
+            return answer
+
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: True)
+        monkeypatch.setattr("builtins.input", fake_input)
+        assert headless_logger.confirm("Continue?") == expected
+        assert questions == ["Continue? [y/N] "]
+
+    def test_confirm_not_interactive(
+        self, headless_logger: Logger, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def fake_input(prompt: str) -> str:
+            raise AssertionError(prompt)
+
+        monkeypatch.setattr(sys.stdin, "isatty", lambda: False)
+        monkeypatch.setattr("builtins.input", fake_input)
+        assert not headless_logger.confirm("Continue?")
+
+    def test_escape_markup(
+        self, logger: Logger, headless_logger: Logger
+    ) -> None:
+        text = "[bold]foo[/]"
+        assert headless_logger.escape_markup(text) == text
+        assert logger.escape_markup(text) == "\\[bold]foo\\[/]"
+
+
+class TestLiveRows:
+    def test_create(self) -> None:
+        rows = LiveRows(10)
+        assert len(rows) == 0
+        assert rows.max_rows == 10
+        assert rows.rows() == []
+
+    @pytest.mark.parametrize("max_rows", (0, -1))
+    def test_create_bad(self, max_rows: int) -> None:
+        with pytest.raises(
+            ValueError, match="Maximum number of rows must be positive"
+        ):
+            LiveRows(max_rows)
+
+    def test_append(self) -> None:
+        rows = LiveRows(4)
+        rows.append("foo", keep=True)
+        assert rows.rows() == [("foo", True)]
+        for i in range(3):
+            rows.append(f"bar_{i}", keep=False)
+        assert len(rows) == rows.max_rows
+        rows.append("new_foo", keep=True)
+        # The oldest non-kept entry should have been evicted
+        assert rows.rows() == [
+            ("foo", True),
+            ("bar_1", False),
+            ("bar_2", False),
+            ("new_foo", True),
+        ]
+        rows.append("baz", keep=False)
+        assert rows.rows() == [
+            ("foo", True),
+            ("bar_2", False),
+            ("new_foo", True),
+            ("baz", False),
+        ]
+
+    def test_append_full(self) -> None:
+        rows = LiveRows(4)
+        for i in range(rows.max_rows):
+            rows.append(f"foo_{i}", keep=True)
+        with pytest.raises(
+            ValueError,
+            match=(
+                "Could not prune row data, every entry was marked as "
+                "persistent"
+            ),
+        ):
+            rows.append("oh no", keep=True)
+        assert len(rows) == rows.max_rows
+
+    def test_render(self) -> None:
+        rows = LiveRows(2)
+        console = Console(file=io.StringIO(), width=40)
+        rows.append("foo", keep=False)
+        table = rows._make_table()
+        # Appending without evicting extends the existing table
+        rows.append("bar", keep=False)
+        assert rows._make_table() is table
+        assert table.row_count == 2
+        # Evicting rebuilds it
+        rows.append("baz", keep=False)
+        table = rows._make_table()
+        assert table.row_count == 2
+        console.print(rows)
+        out = console.file.getvalue()  # type: ignore[attr-defined]
+        assert "foo" not in out
+        assert "bar" in out
+        assert "baz" in out
+
 
 if __name__ == "__main__":
     sys.exit(pytest.main())
@@ -6,27 +6,45 @@ from __future__ import annotations
 import os
 import re
 import sys
+import json
+import time
 import textwrap
 from copy import deepcopy
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import Any
 
 import pytest
 
+from aedifix.cmake.cmake_flags import CMakeList, CMakeString
+from aedifix.logger import LogLevel
 from aedifix.manager import ConfigurationManager
 from aedifix.package.main_package import (
+    CONFIGURE_JOBS_FLAG,
     DEBUG_CONFIGURE_FLAG,
+    DRY_RUN_FLAG,
     FORCE_FLAG,
+    HEADLESS_FLAG,
+    LOG_COMPRESSION_FLAG,
+    LOG_LEVEL_FLAG,
+    LOG_MAX_SIZE_FLAG,
+    NO_PROBE_CACHE_FLAG,
+    NO_TIMING_DB_FLAG,
     ON_ERROR_DEBUGGER_FLAG,
+    PROFILE_CONFIGURE_FLAG,
+    RECORD_COMMANDS_FLAG,
+    REPLAY_COMMANDS_FLAG,
     WITH_CLEAN_FLAG,
 )
 from aedifix.util.cl_arg import CLArg
-from aedifix.util.exception import WrongOrderError
+from aedifix.util.exception import (
+    CommandError,
+    ReplayError,
+    UnsatisfiableConfigurationError,
+    WrongOrderError,
+)
 
 from .fixtures.dummy_main_module import DummyMainModule
 
-if TYPE_CHECKING:
-    from pathlib import Path
-
 
 class TestConfigurationManager:
     @pytest.mark.parametrize(
@@ -95,8 +113,19 @@ class TestConfigurationManager:
         assert manager._ephemeral_args == {
             WITH_CLEAN_FLAG,
             FORCE_FLAG,
+            DRY_RUN_FLAG,
             ON_ERROR_DEBUGGER_FLAG,
             DEBUG_CONFIGURE_FLAG,
+            NO_PROBE_CACHE_FLAG,
+            HEADLESS_FLAG,
+            LOG_LEVEL_FLAG,
+            LOG_COMPRESSION_FLAG,
+            LOG_MAX_SIZE_FLAG,
+            PROFILE_CONFIGURE_FLAG,
+            RECORD_COMMANDS_FLAG,
+            REPLAY_COMMANDS_FLAG,
+            NO_TIMING_DB_FLAG,
+            CONFIGURE_JOBS_FLAG,
         }
         assert manager.project_dir.exists()
         assert manager.project_dir.is_dir()
@@ -171,5 +200,371 @@ class TestConfigurationManager:
         assert var == "foo-bar-baz"
 
 
+LIST_VAR = "AEDIFIX_TEST_LIST"
+STRING_VAR = "AEDIFIX_TEST_STRING"
+
+
+class SlowPackage:
+    def __init__(
+        self, manager: ConfigurationManager, name: str, delay: float
+    ) -> None:
+        self.manager = manager
+        self.name = name
+        self.delay = delay
+
+    def configure(self) -> None:
+        time.sleep(self.delay)
+        self.manager.append_cmake_variable(LIST_VAR, [self.name])
+        self.manager.set_cmake_variable(STRING_VAR, self.name)
+        self.manager.log(f"Configured slow package {self.name}")
+
+
+class FailingPackage(SlowPackage):
+    def configure(self) -> None:
+        super().configure()
+        msg = f"Package {self.name} failed"
+        raise RuntimeError(msg)
+
+
+class TestExecuteModules:
+    def run_configure(
+        self, jobs: int, pkg_type: type[SlowPackage] = SlowPackage
+    ) -> ConfigurationManager:
+        manager = ConfigurationManager(
+            (f"{CONFIGURE_JOBS_FLAG}={jobs}",), DummyMainModule
+        )
+        manager.setup()
+        assert manager.cl_args.configure_jobs.value == jobs
+        manager.register_cmake_variable(CMakeList(LIST_VAR))
+        manager.register_cmake_variable(CMakeString(STRING_VAR))
+        # The earlier packages take the longest, so when run concurrently,
+        # they finish last.
+        a = SlowPackage(manager, "a", 0.2)
+        b = SlowPackage(manager, "b", 0.1)
+        c = pkg_type(manager, "c", 0)
+        d = SlowPackage(manager, "d", 0)
+        manager._modules = [a, b, c, d]  # type: ignore[list-item]
+        dependencies: dict[Any, set[Any]] = {
+            a: set(),
+            b: set(),
+            c: {a},
+            d: set(),
+        }
+        manager._dependencies = dependencies
+        manager._execute_modules("configure")
+        return manager
+
+    @staticmethod
+    def command_line(manager: ConfigurationManager) -> list[str]:
+        return [
+            arg.to_command_line()
+            for arg in manager._cmaker._canonical_args().values()
+        ]
+
+    def test_serial_and_concurrent_identical(self) -> None:
+        serial = self.run_configure(jobs=1)
+        concurrent = self.run_configure(jobs=4)
+
+        assert serial._cmaker._args[LIST_VAR].value == ["a", "b", "c", "d"]
+        assert serial._cmaker._args[STRING_VAR].value == "d"
+        assert self.command_line(serial) == self.command_line(concurrent)
+
+    def test_concurrent_log_order(self) -> None:
+        manager = self.run_configure(jobs=4)
+        manager._logger.flush()
+        log = manager._logger.file_path.read_text()
+        positions = [
+            log.index(f"Configured slow package {name}")
+            for name in ("a", "b", "c", "d")
+        ]
+        assert positions == sorted(positions)
+
+    def test_concurrent_error(self) -> None:
+        with pytest.raises(RuntimeError, match="Package c failed"):
+            self.run_configure(jobs=4, pkg_type=FailingPackage)
+
+    def test_jobs_without_value(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        # The CPU count is only determined when the value is read
+        monkeypatch.setenv("CMAKE_BUILD_PARALLEL_LEVEL", "3")
+        manager = ConfigurationManager((CONFIGURE_JOBS_FLAG,), DummyMainModule)
+        manager.setup()
+        assert manager.cl_args.configure_jobs.value == 3
+
+
+class CountingStr:
+    def __init__(self, value: str) -> None:
+        self.value = value
+        self.count = 0
+
+    def __str__(self) -> str:
+        self.count += 1
+        return self.value
+
+
+class TestLog:
+    def make_manager(self, *argv: str) -> ConfigurationManager:
+        return ConfigurationManager(argv, DummyMainModule)
+
+    def read_log(self, manager: ConfigurationManager) -> str:
+        manager._logger.flush()
+        path = manager._logger.file_path
+        # The log file is only created once something is written to it
+        return path.read_text() if path.exists() else ""
+
+    def test_default_level(self) -> None:
+        manager = self.make_manager()
+        assert manager._logger.file_level == LogLevel.INFO
+
+    @pytest.mark.parametrize(
+        ("argv", "expected"),
+        (
+            ((f"{LOG_LEVEL_FLAG}=warning",), LogLevel.WARNING),
+            ((DEBUG_CONFIGURE_FLAG,), LogLevel.DEBUG),
+            ((DEBUG_CONFIGURE_FLAG, "0"), LogLevel.INFO),
+            ((DEBUG_CONFIGURE_FLAG, LOG_LEVEL_FLAG, "info"), LogLevel.INFO),
+        ),
+    )
+    def test_level_from_argv(
+        self, argv: tuple[str, ...], expected: LogLevel
+    ) -> None:
+        manager = self.make_manager(*argv)
+        assert manager._logger.file_level == expected
+
+    def test_format_args(self) -> None:
+        manager = self.make_manager()
+        value = CountingStr("bar")
+        manager.log("foo %s baz", value)
+        assert value.count == 1
+        assert "test_format_args(): foo bar baz" in self.read_log(manager)
+
+    def test_format_args_disabled(self) -> None:
+        manager = self.make_manager()
+        value = CountingStr("bar")
+        manager.log("foo %s baz", value, level=LogLevel.DEBUG)
+        # Never formatted, since it is never written
+        assert value.count == 0
+        assert "foo bar baz" not in self.read_log(manager)
+
+    def test_format_args_debug(self) -> None:
+        manager = self.make_manager(DEBUG_CONFIGURE_FLAG)
+        value = CountingStr("bar")
+        manager.log("foo %s baz", value, level=LogLevel.DEBUG)
+        assert value.count == 1
+        assert "foo bar baz" in self.read_log(manager)
+
+    def test_format_args_tee(self, capsys: pytest.CaptureFixture[str]) -> None:
+        manager = self.make_manager()
+        manager.log("foo %s baz", "bar", level=LogLevel.DEBUG, tee=True)
+        assert "foo bar baz" in capsys.readouterr().out
+        assert "foo bar baz" not in self.read_log(manager)
+
+    def test_format_args_bad(self) -> None:
+        manager = self.make_manager()
+        with pytest.raises(
+            TypeError, match="Formatting arguments require a str message"
+        ):
+            manager.log(["foo %s"], "bar")
+
+
+class TestTrace:
+    def test_not_written(self) -> None:
+        manager = ConfigurationManager((), DummyMainModule)
+        manager.setup()
+        # Always recorded, but only written to disk if asked to
+        assert manager.tracer.spans
+        manager._write_trace()
+        assert not (manager.project_arch_dir / "aedifix_trace.json").exists()
+
+    def test_spans(self) -> None:
+        manager = ConfigurationManager((), DummyMainModule)
+
+        def traced_func() -> None:
+            manager.log_execute_command([sys.executable, "-c", "pass"])
+
+        manager.log_execute_func(traced_func)
+        spans = [e for e in manager.tracer.events if e["ph"] == "X"]
+        # The command finishes first
+        assert [(e["name"], e["cat"]) for e in spans] == [
+            (Path(sys.executable).name, "command"),
+            (
+                "tests.test_manager.TestTrace.test_spans.<locals>.traced_func",
+                "function",
+            ),
+        ]
+        command, func = spans
+        assert command["args"]["command"] == f"{sys.executable} -c pass"
+        assert command["args"]["cpu"] >= 0
+        assert command["args"]["max_rss"] > 0
+        assert func["ts"] <= command["ts"]
+        assert command["ts"] + command["dur"] <= func["ts"] + func["dur"]
+
+    def test_write(self) -> None:
+        manager = ConfigurationManager(
+            (PROFILE_CONFIGURE_FLAG,), DummyMainModule
+        )
+        manager.setup()
+        manager._write_trace()
+        trace_path = manager.project_arch_dir / "aedifix_trace.json"
+        trace = json.loads(trace_path.read_text())
+        names = {e["name"] for e in trace["traceEvents"]}
+        assert "aedifix.manager.ConfigurationManager._parse_args" in names
+        assert "thread_name" in names
+
+
+class TestResourceUsage:
+    def test_command_usage(self) -> None:
+        manager = ConfigurationManager((), DummyMainModule)
+        assert manager._summarize_resource_usage() == ""
+        manager.log_execute_command([sys.executable, "-c", "pass"])
+        ((name, command, usage),) = manager._command_usage
+        assert name == Path(sys.executable).name
+        assert command == f"{sys.executable} -c pass"
+        assert usage.max_rss > 0
+
+        summary = manager._summarize_resource_usage()
+        assert summary.startswith("Resource Usage:\n")
+        assert "Commands:" in summary
+        assert f"Slowest command: {name} ({usage.wall:.2f} s)" in summary
+
+    def test_write(self) -> None:
+        manager = ConfigurationManager((), DummyMainModule)
+        manager.setup()
+        manager.log_execute_command([sys.executable, "-c", "pass"])
+        manager._write_resource_usage()
+        usage_path = manager.project_arch_dir / "aedifix_resources.json"
+        usage = json.loads(usage_path.read_text())
+        assert len(usage["commands"]) == len(manager._command_usage)
+        assert usage["commands"][-1]["name"] == Path(sys.executable).name
+        assert usage["commands"][-1]["command"] == f"{sys.executable} -c pass"
+        assert usage["total"]["wall"] == pytest.approx(
+            sum(c["wall"] for c in usage["commands"])
+        )
+        assert usage["total"]["max_rss"] == max(
+            c["max_rss"] for c in usage["commands"]
+        )
+
+
+class TestTimings:
+    def test_record(self) -> None:
+        manager = ConfigurationManager((), DummyMainModule)
+        assert manager._timing_db is not None
+        # Nothing recorded if the arguments were never parsed
+        manager._record_timings(started=0, wall=1, success=False)
+        assert not manager._timing_db.path.exists()
+        manager.setup()
+        manager._record_timings(started=0, wall=1, success=True)
+        assert manager._timing_db.configurations() == [
+            (manager.project_name, manager.project_arch)
+        ]
+        parse_args = manager.estimate_duration(
+            "function", "aedifix.manager.ConfigurationManager._parse_args"
+        )
+        assert parse_args is not None
+        assert parse_args >= 0
+        assert manager.estimate_duration("function", "foo") is None
+
+    def test_disabled(self) -> None:
+        manager = ConfigurationManager((NO_TIMING_DB_FLAG,), DummyMainModule)
+        assert manager._timing_db is None
+        manager.setup()
+        manager._record_timings(started=0, wall=1, success=True)
+        assert manager.estimate_duration("phase", "setup") is None
+
+
+class TestCassette:
+    def test_record_replay(self, tmp_path: Path) -> None:
+        cassette_path = tmp_path / "cassette.json"
+        output = tmp_path / "output.txt"
+        code = (
+            "import sys, pathlib; "
+            f"pathlib.Path({str(output)!r}).write_text('hello'); "
+            "print('\\n'.join(map(str, range(2000)))); sys.exit(3)"
+        )
+        command = [sys.executable, "-c", code]
+        manager = ConfigurationManager(
+            (f"{RECORD_COMMANDS_FLAG}={cassette_path}",), DummyMainModule
+        )
+        assert not manager._probe_cache.enabled
+        with pytest.raises(CommandError):
+            manager.log_execute_command(command, live=True, outputs=(output,))
+        manager._write_cassette()
+        assert cassette_path.exists()
+
+        output.unlink()
+        manager = ConfigurationManager(
+            (REPLAY_COMMANDS_FLAG, str(cassette_path)), DummyMainModule
+        )
+        assert not manager._probe_cache.enabled
+        with pytest.raises(CommandError) as exc_info:
+            manager.log_execute_command(command, live=True, outputs=(output,))
+        assert exc_info.value.return_code == 3
+        # The full output was recorded, not just the tail kept in memory
+        assert exc_info.value.stdout.splitlines() == [
+            str(i) for i in range(2000)
+        ]
+        assert output.read_text() == "hello"
+        # Nothing was executed
+        assert not manager._command_usage
+        (span,) = (e for e in manager.tracer.spans if e["cat"] == "command")
+        assert span["args"]["replayed"]
+        with pytest.raises(ReplayError):
+            manager.log_execute_command(command)
+
+    def test_mutually_exclusive(self, tmp_path: Path) -> None:
+        with pytest.raises(
+            UnsatisfiableConfigurationError, match="mutually exclusive"
+        ):
+            ConfigurationManager(
+                (
+                    f"{RECORD_COMMANDS_FLAG}={tmp_path / 'a.json'}",
+                    f"{REPLAY_COMMANDS_FLAG}={tmp_path / 'b.json'}",
+                ),
+                DummyMainModule,
+            )
+
+
+class TestDryRun:
+    def test_timing_db_disabled(self) -> None:
+        manager = ConfigurationManager((DRY_RUN_FLAG,), DummyMainModule)
+        assert manager._timing_db is None
+
+    def test_with_clean(self) -> None:
+        manager = ConfigurationManager(
+            (DRY_RUN_FLAG, WITH_CLEAN_FLAG), DummyMainModule
+        )
+        with pytest.raises(
+            UnsatisfiableConfigurationError, match="cannot be combined"
+        ):
+            manager.setup()
+
+    @staticmethod
+    def snapshot(path: Path) -> dict[Path, tuple[int, bytes]]:
+        return {
+            p: (p.stat().st_mtime_ns, p.read_bytes())
+            for p in sorted(path.rglob("*"))
+            if p.is_file()
+        }
+
+    def test_existing_arch_untouched(self) -> None:
+        manager = ConfigurationManager((DRY_RUN_FLAG,), DummyMainModule)
+        arch_dir = manager.project_arch_dir
+        # A previous configuration
+        manager.project_cmake_dir.mkdir(parents=True)
+        (manager.project_cmake_dir / "CMakeCache.txt").write_text(
+            "CMAKE_BUILD_TYPE:STRING=Release\n"
+        )
+        (arch_dir / "configure.log").write_text("previous log\n")
+        before = self.snapshot(arch_dir)
+
+        manager.main()
+
+        assert self.snapshot(arch_dir) == before
+
+    def test_new_arch_not_created(self) -> None:
+        manager = ConfigurationManager((DRY_RUN_FLAG,), DummyMainModule)
+        manager.main()
+        assert not manager.project_arch_dir.exists()
+
+
 if __name__ == "__main__":
     sys.exit(pytest.main())
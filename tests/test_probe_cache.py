@@ -0,0 +1,152 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aedifix.manager import ConfigurationManager
+from aedifix.probe_cache import ProbeCache, default_probe_cache_dir
+from aedifix.util.exception import CommandError
+
+from .fixtures.dummy_main_module import DummyMainModule
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from subprocess import CompletedProcess
+
+
+class CountingManager(ConfigurationManager):
+    __slots__ = ("commands",)
+
+    def __init__(self) -> None:
+        super().__init__((), DummyMainModule)
+        self.commands: list[list[str]] = []
+
+    def log_execute_command(  # type: ignore[override]
+        self,
+        command: Sequence[str],
+        *,
+        live: bool = False,
+        outputs: Sequence[Path] = (),
+    ) -> CompletedProcess[str]:
+        self.commands.append(list(command))
+        return super().log_execute_command(command, live=live, outputs=outputs)
+
+
+@pytest.fixture
+def manager() -> CountingManager:
+    return CountingManager()
+
+
+@pytest.fixture
+def probe_cache(manager: CountingManager, tmp_path: Path) -> ProbeCache:
+    return ProbeCache(manager, cache_dir=tmp_path / "probes")
+
+
+@pytest.fixture
+def probe_exe(tmp_path: Path) -> Path:
+    exe = tmp_path / "probe.sh"
+    exe.write_text('#!/bin/sh\necho "probe version $1"\n')
+    exe.chmod(0o755)
+    return exe
+
+
+class TestProbeCache:
+    def test_create(self, manager: CountingManager) -> None:
+        probe_cache = ProbeCache(manager)
+        assert probe_cache.cache_dir == default_probe_cache_dir()
+        assert probe_cache.enabled
+        probe_cache.disable()
+        assert not probe_cache.enabled
+
+    def test_default_dir(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("XDG_CACHE_HOME", "/foo/bar")
+        assert default_probe_cache_dir() == Path("/foo/bar/aedifix/probes")
+        monkeypatch.delenv("XDG_CACHE_HOME")
+        assert default_probe_cache_dir() == (
+            Path.home() / ".cache" / "aedifix" / "probes"
+        )
+
+    def test_run_cached(
+        self,
+        manager: CountingManager,
+        probe_cache: ProbeCache,
+        probe_exe: Path,
+    ) -> None:
+        ret = probe_cache.run([probe_exe, "1"])
+        assert ret.stdout == "probe version 1\n"
+        assert len(manager.commands) == 1
+        assert len(list(probe_cache.cache_dir.glob("*.json"))) == 1
+
+        ret = probe_cache.run([probe_exe, "1"])
+        assert ret.stdout == "probe version 1\n"
+        assert ret.returncode == 0
+        assert ret.args == [str(probe_exe), "1"]
+        assert len(manager.commands) == 1
+
+        # Different arguments are a different probe
+        ret = probe_cache.run([probe_exe, "2"])
+        assert ret.stdout == "probe version 2\n"
+        assert len(manager.commands) == 2
+
+    def test_run_executable_changed(
+        self,
+        manager: CountingManager,
+        probe_cache: ProbeCache,
+        probe_exe: Path,
+    ) -> None:
+        probe_cache.run([probe_exe, "1"])
+        assert len(manager.commands) == 1
+
+        probe_exe.write_text('#!/bin/sh\necho "new probe version $1"\n')
+        ret = probe_cache.run([probe_exe, "1"])
+        assert ret.stdout == "new probe version 1\n"
+        assert len(manager.commands) == 2
+
+    def test_run_disabled(
+        self,
+        manager: CountingManager,
+        probe_cache: ProbeCache,
+        probe_exe: Path,
+    ) -> None:
+        probe_cache.disable()
+        probe_cache.run([probe_exe, "1"])
+        probe_cache.run([probe_exe, "1"])
+        assert len(manager.commands) == 2
+        assert not probe_cache.cache_dir.exists()
+
+    def test_run_failed_not_cached(
+        self, manager: CountingManager, probe_cache: ProbeCache, tmp_path: Path
+    ) -> None:
+        exe = tmp_path / "fail.sh"
+        exe.write_text("#!/bin/sh\nexit 1\n")
+        exe.chmod(0o755)
+        for _ in range(2):
+            with pytest.raises(CommandError):
+                probe_cache.run([exe])
+        assert len(manager.commands) == 2
+        assert not list(probe_cache.cache_dir.glob("*.json"))
+
+    def test_evict(self, probe_cache: ProbeCache, probe_exe: Path) -> None:
+        for i in range(4):
+            probe_cache.run([probe_exe, str(i)])
+        entries = sorted(probe_cache.cache_dir.glob("*.json"))
+        assert len(entries) == 4
+        now = time.time()
+        for i, entry in enumerate(entries):
+            os.utime(entry, (now - i * 100, now - i * 100))
+
+        assert probe_cache.evict(max_age=250) == [entries[3]]
+        assert probe_cache.evict(max_entries=2) == [entries[2]]
+        assert sorted(probe_cache.cache_dir.glob("*.json")) == entries[:2]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -7,13 +7,11 @@ import os
 import sys
 import random
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING
 
 import pytest
 
-from aedifix.cmake.cmake_flags import CMakeString
 from aedifix.reconfigure import Reconfigure
-from aedifix.util.utility import subprocess_capture_output
 
 from .fixtures.dummy_main_module import DummyMainModule
 
@@ -192,24 +190,12 @@ class TestReconfigure:
         assert ret == expected
 
     def test_finalize(
-        self,
-        reconf: Reconfigure,
-        AEDIFIX_PYTEST_DIR: Path,
-        monkeypatch: pytest.MonkeyPatch,
+        self, reconf: Reconfigure, AEDIFIX_PYTEST_DIR: Path
     ) -> None:
         reconf_file = reconf.reconfigure_file
         assert not reconf_file.exists()
         reconf_file.parent.mkdir(exist_ok=False)
 
-        def log_execute_command(cmd: list[Any], **kwargs: Any) -> None:
-            subprocess_capture_output(list(map(str, cmd)))
-
-        monkeypatch.setattr(
-            reconf.manager, "log_execute_command", log_execute_command
-        )
-        reconf.manager.register_cmake_variable(CMakeString("CMAKE_COMMAND"))
-        reconf.manager.set_cmake_variable("CMAKE_COMMAND", "cmake")
-
         reconf.finalize(DummyMainModule, set())
 
         assert reconf_file.exists()
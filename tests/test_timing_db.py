@@ -0,0 +1,168 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import sys
+import json
+import sqlite3
+import contextlib
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aedifix.timing_db import (
+    Regression,
+    TimingDB,
+    default_timing_db_path,
+    format_duration,
+)
+
+if TYPE_CHECKING:
+    from aedifix.util.trace import TraceEvent
+
+
+def span(
+    name: str,
+    seconds: float,
+    category: str = "phase",
+    cpu: float | None = None,
+) -> TraceEvent:
+    event: TraceEvent = {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": 0,
+        "dur": int(seconds * 1e6),
+        "pid": 1,
+        "tid": 1,
+    }
+    if cpu is not None:
+        event["args"] = {"cpu": cpu}
+    return event
+
+
+def record(
+    db: TimingDB,
+    *spans: TraceEvent,
+    arch: str = "arch-foo",
+    success: bool = True,
+) -> int:
+    return db.record(
+        "Foo",
+        arch,
+        argv=["--foo"],
+        fingerprint="abc",
+        started=1_000.0,
+        wall=sum(s["dur"] for s in spans) / 1e6,
+        success=success,
+        spans=spans,
+    )
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> TimingDB:
+    return TimingDB(tmp_path / "timings" / "timings.sqlite3")
+
+
+class TestTimingDB:
+    def test_create(self, tmp_path: Path) -> None:
+        db = TimingDB()
+        assert db.path == default_timing_db_path()
+        db = TimingDB(tmp_path / "timings.sqlite3")
+        assert db.path == tmp_path / "timings.sqlite3"
+        assert not db.path.exists()
+
+    def test_default_path(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("XDG_CACHE_HOME", "/foo/bar")
+        assert default_timing_db_path() == Path(
+            "/foo/bar/aedifix/timings.sqlite3"
+        )
+
+    def test_record(self, db: TimingDB) -> None:
+        run_id = record(
+            db, span("setup", 1.5), span("cmake", 2, "command", cpu=1.25)
+        )
+        assert db.path.exists()
+        assert db.configurations() == [("Foo", "arch-foo")]
+        with contextlib.closing(sqlite3.connect(db.path)) as conn:
+            run = conn.execute(
+                "SELECT project, arch, wall, success, argv, fingerprint "
+                "FROM runs WHERE id = ?",
+                (run_id,),
+            ).fetchone()
+            timings = conn.execute(
+                "SELECT category, name, wall, cpu FROM timings "
+                "WHERE run_id = ? ORDER BY name",
+                (run_id,),
+            ).fetchall()
+        assert run == ("Foo", "arch-foo", 3.5, 1, json.dumps(["--foo"]), "abc")
+        assert timings == [
+            ("command", "cmake", 2.0, 1.25),
+            ("phase", "setup", 1.5, None),
+        ]
+
+    def test_estimate(self, db: TimingDB) -> None:
+        assert db.estimate("Foo", "arch-foo", "phase", "setup") is None
+        for seconds in (10, 30, 20):
+            record(db, span("setup", seconds))
+        # Failed runs, and other arches, are ignored
+        record(db, span("setup", 1_000), success=False)
+        record(db, span("setup", 1_000), arch="arch-bar")
+        assert db.estimate("Foo", "arch-foo", "phase", "setup") == 20
+        assert db.estimate("Foo", "arch-foo", "phase", "setup", window=1) == 20
+        assert db.estimate("Foo", "arch-foo", "phase", "setup", window=2) == 25
+        assert db.estimate("Foo", "arch-foo", "phase", "bar") is None
+
+    def test_estimate_sums_spans(self, db: TimingDB) -> None:
+        record(db, span("git", 1, "command"), span("git", 2, "command"))
+        assert db.estimate("Foo", "arch-foo", "command", "git") == 3
+
+    def test_regressions(self, db: TimingDB) -> None:
+        for seconds in (10, 12, 11, 100):
+            record(db, span("setup", seconds), span("fast", 0.1))
+        record(db, span("setup", 20), span("fast", 0.5), span("new", 100))
+        # The 100 s run is outside of the default window of 5, and "new" has
+        # no history.
+        assert db.regressions("Foo", "arch-foo") == [
+            Regression("phase", "setup", latest=20, median=11.5)
+        ]
+        assert db.regressions("Foo", "arch-foo", window=3) == [
+            Regression("phase", "setup", latest=20, median=12)
+        ]
+        assert db.regressions("Foo", "arch-foo", threshold=2) == []
+        assert db.regressions("Foo", "arch-foo", min_seconds=0.1) == [
+            Regression("phase", "setup", latest=20, median=11.5),
+            Regression("phase", "fast", latest=0.5, median=0.1),
+        ]
+
+    def test_regressions_too_few_runs(self, db: TimingDB) -> None:
+        assert db.regressions("Foo", "arch-foo") == []
+        for seconds in (10, 10, 100):
+            record(db, span("setup", seconds))
+        assert db.regressions("Foo", "arch-foo") == []
+
+    def test_regression_ratio(self) -> None:
+        assert Regression("phase", "setup", latest=3, median=2).ratio == 1.5
+        regression = Regression("phase", "setup", latest=3, median=0)
+        assert regression.ratio == float("inf")
+
+
+class TestFormatDuration:
+    @pytest.mark.parametrize(
+        ("seconds", "expected"),
+        (
+            (0, "< 1 s"),
+            (0.6, "1 s"),
+            (59.4, "59 s"),
+            (60, "1 min 0 s"),
+            (200.2, "3 min 20 s"),
+        ),
+    )
+    def test_format_duration(self, seconds: float, expected: str) -> None:
+        assert format_duration(seconds) == expected
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
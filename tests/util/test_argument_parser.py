@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import sys
 from argparse import ArgumentParser
+from pathlib import Path
 from typing import Any
 
 import pytest
@@ -13,6 +14,7 @@ from aedifix.cmake.cmake_flags import CMAKE_VARIABLE, CMakeString, _CMakeVar
 from aedifix.util.argument_parser import (
     ArgSpec,
     ConfigArgument,
+    DeferredDefault,
     ExclusiveArgumentGroup,
     Unset,
 )
@@ -117,6 +119,63 @@ class TestConfigArgument:
         assert action.help is None
 
 
+class TestDeferredDefault:
+    def test_resolve_once(self) -> None:
+        calls = []
+
+        def compute() -> int:
+            calls.append(1)
+            return 42
+
+        default = DeferredDefault(compute)
+        assert not calls
+        assert default.resolve() == 42
+        assert default.resolve() == 42
+        assert str(default) == "42"
+        assert len(calls) == 1
+
+    def test_converted(self) -> None:
+        assert DeferredDefault(lambda: "/foo").converted(Path).resolve() == (
+            Path("/foo")
+        )
+        assert DeferredDefault(lambda: None).converted(Path).resolve() is None
+
+    @pytest.mark.parametrize(
+        ("ty", "argv", "expected"),
+        (
+            (Path, [], Path("/foo")),
+            (Path, ["--foo", "/bar"], Path("/bar")),
+            (None, [], "/foo"),
+            (str, ["--foo", "bar"], "bar"),
+        ),
+    )
+    def test_add_to_argparser(
+        self, ty: type | None, argv: list[str], expected: Any
+    ) -> None:
+        calls = []
+
+        def compute() -> str:
+            calls.append(1)
+            return "/foo"
+
+        parser = ArgumentParser()
+        arg = ConfigArgument(
+            name="--foo",
+            spec=ArgSpec(
+                dest="bar",
+                type=Unset if ty is None else ty,
+                default=DeferredDefault(compute),
+            ),
+        )
+        arg.add_to_argparser(parser)
+        args = parser.parse_args(argv)
+        assert not calls
+        value = args.bar
+        if isinstance(value, DeferredDefault):
+            value = value.resolve()
+        assert value == expected
+
+
 class TestExclusiveArgumentGroup:
     @pytest.mark.parametrize("required", (True, False))
     def test_create(self, required: bool) -> None:
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any
 
 import pytest
 
+from aedifix.logger import Logger
 from aedifix.util.callables import classify_callable, get_calling_function
 
 if TYPE_CHECKING:
@@ -61,28 +62,55 @@ class TestClassifyCallable:
         qualname, path, lineno = classify_callable(foo)
         assert qualname == "tests.util.test_callables.foo"
         assert path == Path(__file__)
-        assert lineno == 18  # Unfortunately a brittle test...
+        assert lineno == 19  # Unfortunately a brittle test...
 
         qualname, path, lineno = classify_callable(Foo().method)
         assert qualname == "tests.util.test_callables.Foo.method"
         assert path == Path(__file__)
-        assert lineno == 25  # Unfortunately a brittle test...
+        assert lineno == 26  # Unfortunately a brittle test...
 
         qualname, path, lineno = classify_callable(Foo.class_method)
         assert qualname == "tests.util.test_callables.Foo.class_method"
         assert path == Path(__file__)
-        assert lineno == 28  # Unfortunately a brittle test...
+        assert lineno == 29  # Unfortunately a brittle test...
 
         prop_function = Foo.prop.fget  # type: ignore[attr-defined]
         qualname, path, lineno = classify_callable(prop_function)
         assert qualname == "tests.util.test_callables.Foo.prop"
         assert path == Path(__file__)
-        assert lineno == 32  # Unfortunately a brittle test...
+        assert lineno == 33  # Unfortunately a brittle test...
 
         qualname, path, lineno = classify_callable(Foo().__call__)
         assert qualname == "tests.util.test_callables.Foo.__call__"
         assert path == Path(__file__)
-        assert lineno == 36  # Unfortunately a brittle test...
+        assert lineno == 37  # Unfortunately a brittle test...
+
+
+class Bar:
+    @Logger.log_passthrough
+    def passthrough(self) -> Any:
+        return foo()
+
+    def method(self) -> Any:
+        return self.passthrough()
+
+
+class TestGetCallingFunctionPassthrough:
+    def test_passthrough(self) -> None:
+        inst = Bar()
+        assert inst.method() == inst.method
+
+    def test_passthrough_cached(self) -> None:
+        inst = Bar()
+        # Call multiple times to exercise the cached resolution paths as well
+        for _ in range(3):
+            assert inst.method() == inst.method
+            assert inst.passthrough() == self.test_passthrough_cached
+
+    def test_cached_across_instances(self) -> None:
+        for inst in (Foo(), Foo(), Foo()):
+            assert inst.method() == inst.method
+            assert inst.class_method() == inst.class_method
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import re
+import sys
+import json
+from subprocess import CompletedProcess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aedifix.util.cassette import Cassette
+from aedifix.util.exception import ReplayError, WrongOrderError
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def record(
+    tmp_path: Path,
+    commands: list[tuple[list[str], str]],
+    normalize: dict[str, str] | None = None,
+) -> Path:
+    path = tmp_path / "cassette.json"
+    cassette = Cassette(path, project_dir=tmp_path, normalize=normalize)
+    for command, stdout in commands:
+        cassette.record(
+            command, CompletedProcess(command, 0, stdout, ""), wall=1.0
+        )
+    cassette.write()
+    return path
+
+
+class TestCassette:
+    def test_record_replay(self, tmp_path: Path) -> None:
+        path = record(
+            tmp_path, [(["foo", "--bar"], "bar 1\n"), (["baz"], "baz\n")]
+        )
+        assert not path.with_suffix(".tmp").exists()
+
+        cassette = Cassette(path, project_dir=tmp_path, replay=True)
+        assert cassette.replaying
+        assert cassette.path == path
+        # Replayed out of order
+        ret = cassette.replay(["baz"])
+        assert ret.args == ["baz"]
+        assert ret.returncode == 0
+        assert ret.stdout == "baz\n"
+        assert cassette.replay(["foo", "--bar"]).stdout == "bar 1\n"
+
+    def test_repeated(self, tmp_path: Path) -> None:
+        path = record(tmp_path, [(["foo"], "1\n"), (["foo"], "2\n")])
+        cassette = Cassette(path, project_dir=tmp_path, replay=True)
+        assert cassette.replay(["foo"]).stdout == "1\n"
+        assert cassette.replay(["foo"]).stdout == "2\n"
+        with pytest.raises(
+            ReplayError, match="replayed more often than recorded"
+        ):
+            cassette.replay(["foo"])
+
+    def test_not_recorded(self, tmp_path: Path) -> None:
+        path = record(tmp_path, [(["foo"], "")])
+        cassette = Cassette(path, project_dir=tmp_path, replay=True)
+        with pytest.raises(
+            ReplayError, match=re.escape("was not recorded in")
+        ):
+            cassette.replay(["foo", "--bar"])
+
+    def test_failed(self, tmp_path: Path) -> None:
+        path = tmp_path / "cassette.json"
+        cassette = Cassette(path, project_dir=tmp_path)
+        cassette.record(
+            ["foo"], CompletedProcess(["foo"], 3, "", "oops"), wall=0.5
+        )
+        cassette.write()
+        ret = Cassette(path, project_dir=tmp_path, replay=True).replay(["foo"])
+        assert ret.returncode == 3
+        assert ret.stderr == "oops"
+
+    def test_environment(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("AEDIFIX_TEST_REMOVED", "1")
+        monkeypatch.delenv("AEDIFIX_TEST_ADDED", raising=False)
+        path = tmp_path / "cassette.json"
+        cassette = Cassette(path, project_dir=tmp_path)
+        monkeypatch.setenv("AEDIFIX_TEST_ADDED", "1")
+        monkeypatch.delenv("AEDIFIX_TEST_REMOVED")
+        cassette.record(["foo"], CompletedProcess(["foo"], 0, "", ""), wall=0)
+        cassette.write()
+        (entry,) = json.loads(path.read_text())["COMMANDS"]
+        assert entry["ENV"] == {
+            "AEDIFIX_TEST_ADDED": "1",
+            "AEDIFIX_TEST_REMOVED": None,
+        }
+
+        monkeypatch.delenv("AEDIFIX_TEST_ADDED")
+        monkeypatch.setenv("AEDIFIX_TEST_REMOVED", "1")
+        replay = Cassette(path, project_dir=tmp_path, replay=True)
+        with pytest.raises(
+            ReplayError,
+            match=re.escape(
+                "with a different environment (differing in "
+                "AEDIFIX_TEST_ADDED, AEDIFIX_TEST_REMOVED): foo"
+            ),
+        ):
+            replay.replay(["foo"])
+
+        monkeypatch.setenv("AEDIFIX_TEST_ADDED", "1")
+        monkeypatch.delenv("AEDIFIX_TEST_REMOVED")
+        assert replay.replay(["foo"]).returncode == 0
+
+    def test_outputs(self, tmp_path: Path) -> None:
+        project_dir = tmp_path / "project"
+        out = project_dir / "build" / "CMakeCache.txt"
+        out.parent.mkdir(parents=True)
+        out.write_text(f"FOO:PATH={project_dir}/foo\n")
+        path = tmp_path / "cassette.json"
+        cassette = Cassette(path, project_dir=project_dir)
+        command = ["cmake", "-S", str(project_dir)]
+        cassette.record(
+            command,
+            CompletedProcess(command, 0, f"{project_dir}\n", ""),
+            wall=0,
+            outputs=(out, project_dir / "does_not_exist"),
+        )
+        cassette.write()
+        assert str(project_dir) not in path.read_text()
+
+        # Replayed in a different project directory
+        other_dir = tmp_path / "other"
+        replay = Cassette(path, project_dir=other_dir, replay=True)
+        ret = replay.replay(["cmake", "-S", str(other_dir)])
+        assert ret.stdout == f"{other_dir}\n"
+        restored = other_dir / "build" / "CMakeCache.txt"
+        assert restored.read_text() == f"FOO:PATH={other_dir}/foo\n"
+        assert not (other_dir / "does_not_exist").exists()
+
+    def test_normalize(self, tmp_path: Path) -> None:
+        path = record(
+            tmp_path,
+            [(["foo", "-DOPTS=--record=x"], "")],
+            normalize={"--record=x": ""},
+        )
+        cassette = Cassette(
+            path,
+            project_dir=tmp_path,
+            replay=True,
+            normalize={"--replay=x": ""},
+        )
+        assert cassette.replay(["foo", "-DOPTS=--replay=x"]).returncode == 0
+
+    def test_record_while_replaying(self, tmp_path: Path) -> None:
+        path = record(tmp_path, [])
+        cassette = Cassette(path, project_dir=tmp_path, replay=True)
+        with pytest.raises(WrongOrderError):
+            cassette.record(
+                ["foo"], CompletedProcess(["foo"], 0, "", ""), wall=0
+            )
+
+    @pytest.mark.parametrize("content", ("", "{}", '{"VERSION": 0}'))
+    def test_bad_file(self, tmp_path: Path, content: str) -> None:
+        path = tmp_path / "cassette.json"
+        path.write_text(content)
+        with pytest.raises(ReplayError):
+            Cassette(path, project_dir=tmp_path, replay=True)
+
+    def test_missing_file(self, tmp_path: Path) -> None:
+        with pytest.raises(
+            ReplayError, match="Failed to read command recording"
+        ):
+            Cassette(
+                tmp_path / "cassette.json", project_dir=tmp_path, replay=True
+            )
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -8,6 +8,7 @@ from typing import TypeVar
 
 import pytest
 
+from aedifix.util.argument_parser import DeferredDefault
 from aedifix.util.cl_arg import CLArg
 
 _T = TypeVar("_T")
@@ -41,6 +42,21 @@ class TestCLArg:
         rhs = CLArg(name=name, value=value, cl_set=cl_set)
         assert lhs == rhs
 
+    def test_deferred(self) -> None:
+        calls = []
+
+        def compute() -> int:
+            calls.append(1)
+            return 3
+
+        clarg: CLArg[int] = CLArg(
+            name="foo", value=DeferredDefault(compute), cl_set=False
+        )
+        assert not calls
+        assert clarg.value == 3
+        assert clarg.value == 3
+        assert len(calls) == 1
+
 
 if __name__ == "__main__":
     sys.exit(pytest.main())
@@ -0,0 +1,162 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import re
+import sys
+import shutil
+import subprocess
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aedifix.util.configure_file import configure_file, configure_string
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CMAKE_EXE = shutil.which("cmake")
+
+TEMPLATES = (
+    "",
+    "no substitutions\n",
+    "no trailing newline @FOO@",
+    "@FOO@\n@BAR@\n",
+    "@FOO@@BAR@\n",
+    "@@FOO@@\n",
+    "@UNDEFINED@\n",
+    "${FOO} $FOO @FOO\n",
+    "email@example.com and @FOO@@example.com\n",
+    "@FOO BAR@ @FOO-BAR@ @a/b.c+d-e@\n",
+    "@FOO@ trailing whitespace  \n\n\n",
+    "windows line\r\nendings @FOO@\r\n",
+    "#cmakedefine FOO\n#cmakedefine OFF_VAR\n#cmakedefine UNDEFINED\n",
+    "#cmakedefine FOO @FOO@ and more\n",
+    "#  cmakedefine FOO indented\n  #cmakedefine BAR leading\n",
+    "#cmakedefine01 FOO\n#cmakedefine01 OFF_VAR\n#cmakedefine01 UNDEFINED\n",
+    "#cmakedefine01 NOTFOUND_VAR\n#cmakedefine NOTFOUND_VAR\n",
+    "#cmakedefine01 ZERO\n#cmakedefine01 NUMBER\n",
+    "#cmakedefine01 IGNORE_VAR\n#cmakedefine01 EMPTY\n",
+    "quotes \"@FOO@\" '@BAR@' \\@FOO\\@\n",
+    "semicolons @LIST@\n",
+    "special @SPECIAL@\n",
+    "unicode éè @UNICODE@\n",
+)
+
+DEFS = {
+    "FOO": "foo",
+    "BAR": "bar value",
+    "OFF_VAR": "OFF",
+    "NOTFOUND_VAR": "SOMETHING-NOTFOUND",
+    "ZERO": "0",
+    "NUMBER": "42",
+    "IGNORE_VAR": "ignore",
+    "EMPTY": "",
+    "FOO-BAR": "dashed",
+    "a/b.c+d-e": "odd name",
+    "LIST": "a;b;c",
+    "SPECIAL": "$x ${FOO} \\ ' \" @FOO@ #",
+    "UNICODE": "ü",
+}
+
+
+def cmake_bracket(value: str) -> str:
+    eq = "="
+    while f"]{eq}]" in value:
+        eq += "="
+    return f"[{eq}[{value}]{eq}]"
+
+
+def cmake_configure_file(src: Path, dest: Path, defs: dict[str, str]) -> None:
+    assert CMAKE_EXE is not None
+    script = dest.parent / f"{dest.name}.cmake"
+    lines = [
+        f"set({cmake_bracket(k)} {cmake_bracket(v)})" for k, v in defs.items()
+    ]
+    lines.append(
+        f"configure_file({cmake_bracket(str(src))} {cmake_bracket(str(dest))} "
+        "USE_SOURCE_PERMISSIONS @ONLY)"
+    )
+    script.write_text("\n".join(lines) + "\n")
+    subprocess.run([CMAKE_EXE, "-P", str(script)], check=True)
+
+
+class TestConfigureString:
+    def test_basic(self) -> None:
+        assert configure_string("@FOO@ ${FOO}", {"FOO": "x"}) == "x ${FOO}\n"
+
+    def test_undefined(self) -> None:
+        assert configure_string("a@FOO@b", {}) == "ab\n"
+
+    def test_cmakedefine(self) -> None:
+        text = "#cmakedefine FOO 1\n#cmakedefine BAR 1\n"
+        expected = "#define FOO 1\n/* #undef BAR */\n"
+        assert configure_string(text, {"FOO": "ON", "BAR": "NO"}) == expected
+
+    def test_cmakedefine01(self) -> None:
+        text = "#cmakedefine01 FOO\n#cmakedefine01 BAR\n"
+        expected = "#define FOO 1\n#define BAR 0\n"
+        assert configure_string(text, {"FOO": "ON"}) == expected
+
+
+class TestConfigureFile:
+    def test_permissions(self, tmp_path: Path) -> None:
+        src = tmp_path / "src.in"
+        src.write_text("@FOO@\n")
+        src.chmod(0o750)
+        dest = tmp_path / "sub" / "dir" / "dest"
+        assert configure_file(src, dest, {"FOO": "bar"})
+        assert dest.read_text() == "bar\n"
+        assert dest.stat().st_mode & 0o777 == 0o750
+
+    def test_unchanged(self, tmp_path: Path) -> None:
+        src = tmp_path / "src.in"
+        src.write_text("@FOO@\n")
+        dest = tmp_path / "dest"
+        assert configure_file(src, dest, {"FOO": "bar"})
+        mtime = dest.stat().st_mtime_ns
+        os.utime(dest, ns=(mtime - 10**9, mtime - 10**9))
+        assert not configure_file(src, dest, {"FOO": "bar"})
+        assert dest.stat().st_mtime_ns == mtime - 10**9
+        assert configure_file(src, dest, {"FOO": "baz"})
+        assert dest.read_text() == "baz\n"
+
+
+@pytest.mark.skipif(CMAKE_EXE is None, reason="Requires cmake")
+class TestConformance:
+    @pytest.mark.parametrize("template", TEMPLATES)
+    def test_conformance(self, tmp_path: Path, template: str) -> None:
+        src = tmp_path / "template.in"
+        src.write_bytes(template.encode())
+        src.chmod(0o751)
+        expected = tmp_path / "cmake_out"
+        cmake_configure_file(src, expected, DEFS)
+
+        dest = tmp_path / "aedifix_out"
+        configure_file(src, dest, DEFS)
+        assert dest.read_bytes() == expected.read_bytes()
+        assert dest.stat().st_mode == expected.stat().st_mode
+
+    def test_templates(self, tmp_path: Path) -> None:
+        from aedifix.util.utility import CMAKE_TEMPLATES_DIR
+
+        for src in CMAKE_TEMPLATES_DIR.iterdir():
+            # Define every referenced variable, otherwise CMake would
+            # substitute its builtin values for e.g. CMAKE_COMMAND.
+            defs = {
+                var: f"value of {var}"
+                for var in re.findall(r"@(\w+)@", src.read_text())
+            }
+            expected = tmp_path / f"cmake_{src.name}"
+            cmake_configure_file(src, expected, defs)
+
+            dest = tmp_path / f"aedifix_{src.name}"
+            configure_file(src, dest, defs)
+            assert dest.read_bytes() == expected.read_bytes()
+            assert dest.stat().st_mode == expected.stat().st_mode
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -0,0 +1,177 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import sys
+import gzip
+import lzma
+import logging
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aedifix.util.log_file import (
+    LogCompression,
+    LogFileHandler,
+    clone_file,
+    parse_size,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def emit(handler: LogFileHandler, *messages: str) -> None:
+    for msg in messages:
+        handler.emit(logging.makeLogRecord({"msg": msg}))
+
+
+def read(path: Path) -> str:
+    match path.suffix:
+        case ".gz":
+            with gzip.open(path, "rt") as fd:
+                return fd.read()
+        case ".xz":
+            with lzma.open(path, "rt") as fd:
+                return fd.read()
+        case _:
+            return path.read_text()
+
+
+class TestLogCompression:
+    @pytest.mark.parametrize("compression", tuple(LogCompression))
+    def test_from_string(self, compression: LogCompression) -> None:
+        assert LogCompression.from_string(str(compression)) == compression
+        assert (
+            LogCompression.from_string(str(compression).upper()) == compression
+        )
+
+    def test_from_string_bad(self) -> None:
+        with pytest.raises(ValueError, match="Unknown log compression: 'zip'"):
+            LogCompression.from_string("zip")
+
+
+class TestParseSize:
+    @pytest.mark.parametrize(
+        ("str_val", "expected"),
+        (
+            ("1", 1),
+            ("4096", 4096),
+            ("2k", 2048),
+            ("512M", 512 << 20),
+            ("3 GiB", 3 << 30),
+            ("1TB", 1 << 40),
+        ),
+    )
+    def test_parse_size(self, str_val: str, expected: int) -> None:
+        assert parse_size(str_val) == expected
+
+    @pytest.mark.parametrize("str_val", ("", "foo", "1.5G", "-1", "12Q"))
+    def test_parse_size_bad(self, str_val: str) -> None:
+        with pytest.raises(ValueError, match="Invalid size"):
+            parse_size(str_val)
+
+    def test_parse_size_zero(self) -> None:
+        with pytest.raises(ValueError, match="Size must be positive"):
+            parse_size("0K")
+
+
+class TestLogFileHandler:
+    @pytest.mark.parametrize("compression", tuple(LogCompression))
+    def test_compression(
+        self, tmp_path: Path, compression: LogCompression
+    ) -> None:
+        handler = LogFileHandler(
+            tmp_path / "configure.log", compression=compression
+        )
+        path = tmp_path / f"configure.log{compression.suffix}"
+        assert handler.baseFilename == str(path)
+        assert handler.compression == compression
+        assert not path.exists()
+        emit(handler, "foo", "bar")
+        handler.close()
+        assert read(path) == "foo\nbar\n"
+        # Reopened, and appended to, after closing
+        emit(handler, "baz")
+        handler.close()
+        assert read(path) == "foo\nbar\nbaz\n"
+
+    def test_replaces_existing(self, tmp_path: Path) -> None:
+        path = tmp_path / "configure.log"
+        path.write_text("old log\n")
+        link = tmp_path / "link.log"
+        link.hardlink_to(path)
+        handler = LogFileHandler(path)
+        emit(handler, "new log")
+        handler.close()
+        assert path.read_text() == "new log\n"
+        # The old log is left untouched
+        assert link.read_text() == "old log\n"
+
+    def test_max_size(self, tmp_path: Path) -> None:
+        handler = LogFileHandler(tmp_path / "configure.log", max_size=20)
+        assert handler.max_size == 20
+        # Each message is 4 bytes, so the head (10 bytes) fits 2 messages,
+        # and the tail (10 bytes) fits the last 2
+        emit(handler, *(f"{i:03}" for i in range(10)))
+        handler.flush()
+        assert read(tmp_path / "configure.log") == "000\n001\n"
+        handler.close()
+        assert read(tmp_path / "configure.log") == (
+            "000\n001\n"
+            "[... 24 bytes omitted, the log is capped at 20 bytes ...]\n"
+            "008\n009\n"
+        )
+
+    def test_max_size_not_reached(self, tmp_path: Path) -> None:
+        handler = LogFileHandler(
+            tmp_path / "configure.log",
+            compression=LogCompression.GZIP,
+            max_size=1 << 20,
+        )
+        emit(handler, "foo", "bar")
+        handler.close()
+        assert read(tmp_path / "configure.log.gz") == "foo\nbar\n"
+
+    @pytest.mark.parametrize("max_size", (0, -1))
+    def test_max_size_bad(self, tmp_path: Path, max_size: int) -> None:
+        with pytest.raises(
+            ValueError, match="Maximum log size must be positive"
+        ):
+            LogFileHandler(tmp_path / "configure.log", max_size=max_size)
+
+
+class TestCloneFile:
+    def test_clone(self, tmp_path: Path) -> None:
+        src = tmp_path / "src.log"
+        src.write_text("foo\n")
+        dest = tmp_path / "dest.log"
+        dest.write_text("old\n")
+        assert clone_file(src, dest) == dest
+        assert dest.read_text() == "foo\n"
+        assert src.read_text() == "foo\n"
+        # No temporaries left behind
+        assert sorted(tmp_path.iterdir()) == [dest, src]
+
+    def test_clone_no_link(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def no_link(*args: object) -> None:
+            raise OSError
+
+        monkeypatch.setattr("os.link", no_link)
+        src = tmp_path / "src.log"
+        src.write_text("foo\n")
+        dest = clone_file(src, tmp_path / "dest.log")
+        assert dest.read_text() == "foo\n"
+        assert not dest.samefile(src)
+
+    def test_clone_missing(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            clone_file(tmp_path / "src.log", tmp_path / "dest.log")
+        assert list(tmp_path.iterdir()) == []
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -0,0 +1,105 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import sys
+import shutil
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aedifix.util.path_index import PathIndex, path_index, which
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def make_exe(path: Path, *, executable: bool = True) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("#!/bin/sh\n")
+    path.chmod(0o755 if executable else 0o644)
+    return path
+
+
+@pytest.fixture
+def search_path(tmp_path: Path) -> str:
+    make_exe(tmp_path / "bin1" / "foo")
+    make_exe(tmp_path / "bin1" / "not_exe", executable=False)
+    make_exe(tmp_path / "bin2" / "foo")
+    make_exe(tmp_path / "bin2" / "bar")
+    make_exe(tmp_path / "bin2" / "not_exe")
+    (tmp_path / "bin2" / "a_dir").mkdir()
+    return os.pathsep.join(
+        [
+            str(tmp_path / "bin1"),
+            str(tmp_path / "does_not_exist"),
+            str(tmp_path / "bin2"),
+        ]
+    )
+
+
+class TestPathIndex:
+    @pytest.mark.parametrize(
+        "name", ("foo", "bar", "not_exe", "a_dir", "baz", "bin1/foo")
+    )
+    def test_matches_shutil_which(self, search_path: str, name: str) -> None:
+        index = PathIndex(search_path)
+        assert index.which(name) == shutil.which(name, path=search_path)
+
+    def test_absolute_path(self, search_path: str, tmp_path: Path) -> None:
+        index = PathIndex(search_path)
+        exe = tmp_path / "bin2" / "bar"
+        assert index.which(exe) == str(exe)
+        assert index.which(tmp_path / "bin1" / "not_exe") is None
+
+    def test_listed_once(
+        self, search_path: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        scanned = []
+        orig_scandir = os.scandir
+
+        def scandir(path: str) -> os._ScandirIterator[str]:
+            scanned.append(path)
+            return orig_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", scandir)
+        index = PathIndex(search_path)
+        # Found in the first directory, so the others are never listed
+        assert index.which("foo") == str(tmp_path / "bin1" / "foo")
+        assert scanned == [str(tmp_path / "bin1")]
+        for name in ("foo", "bar", "baz", "bar", "baz"):
+            index.which(name)
+        assert scanned == [
+            str(tmp_path / "bin1"),
+            str(tmp_path / "does_not_exist"),
+            str(tmp_path / "bin2"),
+        ]
+
+    def test_invalidate(self, search_path: str, tmp_path: Path) -> None:
+        index = PathIndex(search_path)
+        assert index.which("baz") is None
+        make_exe(tmp_path / "bin2" / "baz")
+        assert index.which("baz") is None
+        index.invalidate()
+        assert index.which("baz") == str(tmp_path / "bin2" / "baz")
+
+
+class TestWhich:
+    def test_follows_path(
+        self, search_path: str, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("PATH", search_path)
+        index = path_index()
+        assert index.path == search_path
+        assert path_index() is index
+        assert which("bar") == str(tmp_path / "bin2" / "bar")
+
+        monkeypatch.setenv("PATH", str(tmp_path / "bin1"))
+        assert path_index() is not index
+        assert which("bar") is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -0,0 +1,172 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import signal
+import subprocess
+
+import pytest
+
+from aedifix.util.resource_usage import (
+    ProcSampler,
+    ResourceUsage,
+    format_bytes,
+)
+
+
+def make_usage(**kwargs: float | None) -> ResourceUsage:
+    fields: dict[str, float | None] = {
+        "wall": 2.0,
+        "user": 1.0,
+        "system": 0.5,
+        "max_rss": 1 << 20,
+        "read_bytes": 1024,
+        "write_bytes": 2048,
+    }
+    fields.update(kwargs)
+    return ResourceUsage(**fields)  # type: ignore[arg-type]
+
+
+class TestFormatBytes:
+    @pytest.mark.parametrize(
+        ("size", "expected"),
+        (
+            (0, "0 B"),
+            (1023, "1023 B"),
+            (1024, "1.0 KiB"),
+            (3 << 19, "1.5 MiB"),
+            (5 << 30, "5.0 GiB"),
+            (2 << 40, "2.0 TiB"),
+        ),
+    )
+    def test_format_bytes(self, size: int, expected: str) -> None:
+        assert format_bytes(size) == expected
+
+
+class TestResourceUsage:
+    def test_from_rusage(self) -> None:
+        proc = subprocess.Popen([sys.executable, "-c", "pass"])
+        _, _, rusage = os.wait4(proc.pid, 0)
+        proc.returncode = 0
+        usage = ResourceUsage.from_rusage(rusage, wall=1.5)
+        assert usage.wall == 1.5
+        assert usage.user == rusage.ru_utime
+        assert usage.system == rusage.ru_stime
+        assert usage.cpu == usage.user + usage.system
+        assert usage.max_rss >= rusage.ru_maxrss
+        if sys.platform == "linux":
+            assert usage.read_bytes == rusage.ru_inblock * 512
+            assert usage.write_bytes == rusage.ru_oublock * 512
+
+        sampled = ResourceUsage.from_rusage(
+            rusage, wall=1.5, sampled_rss=1 << 40
+        )
+        assert sampled.max_rss == 1 << 40
+
+    def test_total(self) -> None:
+        total = ResourceUsage.total(
+            [make_usage(), make_usage(wall=1.0, max_rss=1 << 30)]
+        )
+        assert total == ResourceUsage(
+            wall=3.0,
+            user=2.0,
+            system=1.0,
+            max_rss=1 << 30,
+            read_bytes=2048,
+            write_bytes=4096,
+        )
+
+    def test_total_unknown_io(self) -> None:
+        total = ResourceUsage.total(
+            [make_usage(), make_usage(read_bytes=None)]
+        )
+        assert total.read_bytes is None
+        assert total.write_bytes == 4096
+
+    def test_total_empty(self) -> None:
+        total = ResourceUsage.total([])
+        assert total == ResourceUsage(
+            wall=0, user=0, system=0, max_rss=0, read_bytes=0, write_bytes=0
+        )
+
+    def test_to_dict(self) -> None:
+        usage = make_usage(read_bytes=None)
+        as_dict = usage.to_dict()
+        assert as_dict == {
+            "wall": 2.0,
+            "user": 1.0,
+            "system": 0.5,
+            "max_rss": 1 << 20,
+            "read_bytes": None,
+            "write_bytes": 2048,
+        }
+        assert json.loads(json.dumps(as_dict)) == as_dict
+
+    def test_str(self) -> None:
+        assert str(make_usage()) == (
+            "wall 2.00 s, user 1.00 s, sys 0.50 s, max RSS 1.0 MiB, "
+            "read 1.0 KiB, written 2.0 KiB"
+        )
+        assert str(make_usage(read_bytes=None, write_bytes=None)) == (
+            "wall 2.00 s, user 1.00 s, sys 0.50 s, max RSS 1.0 MiB"
+        )
+
+
+@pytest.mark.skipif(
+    not ProcSampler.supported(), reason="Requires /proc to sample"
+)
+class TestProcSampler:
+    def test_tree(self) -> None:
+        # The child and grandchild each hold 64 MiB, so the tree holds more
+        # than the largest single process
+        size = 64 << 20
+        grandchild = (
+            f"import time; x = b'1' * {size}; print(flush=True); "
+            "time.sleep(10)"
+        )
+        child = (
+            "import subprocess, sys, time\n"
+            f"x = b'1' * {size}\n"
+            f"p = subprocess.Popen([sys.executable, '-c', {grandchild!r}], "
+            "stdout=subprocess.PIPE)\n"
+            "p.stdout.readline()\n"
+            "print(flush=True)\n"
+            "time.sleep(10)\n"
+        )
+        proc = subprocess.Popen(
+            [sys.executable, "-c", child],
+            stdout=subprocess.PIPE,
+            start_new_session=True,
+        )
+        sampler = ProcSampler(proc.pid, interval=0.01)
+        try:
+            assert proc.stdout is not None
+            proc.stdout.readline()
+            sampler.start()
+            time.sleep(0.1)
+            peak_rss = sampler.stop()
+        finally:
+            os.killpg(proc.pid, signal.SIGKILL)
+            proc.wait()
+            assert proc.stdout is not None
+            proc.stdout.close()
+        assert peak_rss == sampler.peak_rss
+        assert peak_rss >= 2 * size
+
+    def test_exited(self) -> None:
+        proc = subprocess.Popen([sys.executable, "-c", "pass"])
+        proc.wait()
+        sampler = ProcSampler(proc.pid, interval=0.01)
+        sampler.start()
+        assert sampler.stop() == 0
+        # Stopping twice is harmless
+        assert sampler.stop() == 0
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -0,0 +1,141 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import sys
+import json
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aedifix.util.trace import TraceEvent, Tracer
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def spans(tracer: Tracer) -> list[TraceEvent]:
+    return [e for e in tracer.events if e["ph"] == "X"]
+
+
+def cmake_event(ts: int, dur: int) -> TraceEvent:
+    return {
+        "name": "project",
+        "cat": "cmake",
+        "ph": "X",
+        "ts": ts,
+        "dur": dur,
+        "pid": 1234,
+        "tid": 0,
+    }
+
+
+class TestTracer:
+    def test_create(self) -> None:
+        tracer = Tracer()
+        assert tracer.enabled
+        assert tracer.events == [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": os.getpid(),
+                "args": {"name": "aedifix"},
+            }
+        ]
+
+    def test_span(self) -> None:
+        tracer = Tracer()
+        start = Tracer.now()
+        with tracer.span("foo", category="phase", args={"bar": 1}):
+            pass
+        with tracer.span("baz", category="command"):
+            pass
+        foo, baz = spans(tracer)
+        assert foo["name"] == "foo"
+        assert foo["cat"] == "phase"
+        assert foo["args"] == {"bar": 1}
+        assert foo["ts"] >= start
+        assert foo["dur"] >= 0
+        assert foo["tid"] == threading.get_native_id()
+        assert "args" not in baz
+        assert baz["ts"] >= foo["ts"] + foo["dur"]
+
+    def test_span_exception(self) -> None:
+        tracer = Tracer()
+        with (
+            pytest.raises(RuntimeError, match="foo"),
+            tracer.span("foo", category="phase"),
+        ):
+            raise RuntimeError("foo")  # noqa: EM101
+        assert [e["name"] for e in spans(tracer)] == ["foo"]
+
+    def test_span_disabled(self) -> None:
+        tracer = Tracer(enabled=False)
+        with tracer.span("foo", category="phase"):
+            pass
+        assert spans(tracer) == []
+
+    def test_thread_names(self) -> None:
+        tracer = Tracer()
+
+        def work() -> None:
+            with tracer.span("foo", category="phase"):
+                pass
+
+        thread = threading.Thread(target=work, name="worker")
+        thread.start()
+        thread.join()
+        (span,) = spans(tracer)
+        names = {
+            e["tid"]: e["args"]["name"]
+            for e in tracer.events
+            if e["name"] == "thread_name"
+        }
+        # Still named after the thread has exited
+        assert names == {span["tid"]: "worker"}
+
+    def test_merge(self) -> None:
+        tracer = Tracer()
+        event = cmake_event(150, 10)
+        tracer.merge([event], process_name="cmake", start=100, end=200)
+        assert spans(tracer) == [event]
+        assert {
+            "name": "process_name",
+            "ph": "M",
+            "pid": 1234,
+            "args": {"name": "cmake"},
+        } in tracer.events
+
+    def test_merge_other_clock(self) -> None:
+        tracer = Tracer()
+        tracer.merge(
+            [cmake_event(5_000, 10), cmake_event(5_020, 10)],
+            process_name="cmake",
+            start=100,
+            end=200,
+        )
+        assert [e["ts"] for e in spans(tracer)] == [100, 120]
+
+    def test_merge_disabled(self) -> None:
+        tracer = Tracer(enabled=False)
+        tracer.merge(
+            [cmake_event(150, 10)], process_name="cmake", start=100, end=200
+        )
+        assert spans(tracer) == []
+
+    def test_write(self, tmp_path: Path) -> None:
+        tracer = Tracer()
+        with tracer.span("foo", category="phase"):
+            pass
+        path = tmp_path / "trace.json"
+        tracer.write(path)
+        trace = json.loads(path.read_text())
+        assert trace["traceEvents"] == tracer.events
+        assert trace["displayTimeUnit"] == "ms"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())
@@ -4,17 +4,28 @@
 from __future__ import annotations
 
 import sys
+import time
+import subprocess
+from typing import TYPE_CHECKING
 
 import pytest
 
+from aedifix.util.exception import CommandError
 from aedifix.util.utility import (
     deduplicate_command_line_args,
     dest_to_flag,
     flag_to_dest,
     partition_argv,
     prune_command_line_args,
+    read_cmake_cache,
+    subprocess_capture_output_live,
 )
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from aedifix.util.resource_usage import ResourceUsage
+
 
 class TestUtility:
     def test_prune_command_line_args_empty(self) -> None:
@@ -130,6 +141,157 @@ class TestUtility:
         assert main_ret == main_expected
         assert rest_ret == rest_expected
 
+    def test_read_cmake_cache(self, tmp_path: Path) -> None:
+        cmake_cache = tmp_path / "CMakeCache.txt"
+        cmake_cache.write_text(
+            "# This is the CMakeCache file.\n"
+            "\n"
+            "//Some help\n"
+            "FOO:BOOL=ON\n"
+            "BAR:STRING=a b;c\n"
+            "EMPTY:STRING=\n"
+            "  INDENTED:PATH=/some/path\n"
+            "not an entry\n"
+        )
+        assert read_cmake_cache(cmake_cache) == {
+            "FOO": "ON",
+            "BAR": "a b;c",
+            "EMPTY": "",
+            "INDENTED": "/some/path",
+        }
+
+
+def _python(code: str) -> list[str]:
+    return [sys.executable, "-c", code]
+
+
+class TestSubprocessCaptureOutputLive:
+    def test_basic(self) -> None:
+        stdout_chunks: list[str] = []
+        stderr_chunks: list[str] = []
+
+        def callback(stdout: str, stderr: str) -> None:
+            if stdout:
+                stdout_chunks.append(stdout)
+            if stderr:
+                stderr_chunks.append(stderr)
+
+        ret = subprocess_capture_output_live(
+            _python("print('foo'); print('bar')"), callback=callback
+        )
+        assert ret.returncode == 0
+        assert ret.stdout == "foo\nbar\n"
+        assert "".join(stdout_chunks) == ret.stdout
+        assert not stderr_chunks
+
+    def test_separate_stderr(self) -> None:
+        stderr_chunks: list[str] = []
+
+        def callback(_stdout: str, stderr: str) -> None:
+            stderr_chunks.append(stderr)
+
+        ret = subprocess_capture_output_live(
+            _python("import sys; print('err', file=sys.stderr); print('out')"),
+            callback=callback,
+            stderr=subprocess.PIPE,
+        )
+        assert ret.stdout == "out\n"
+        assert ret.stderr == "err\n"
+        assert "".join(stderr_chunks) == "err\n"
+
+    def test_complete_lines(self) -> None:
+        code = (
+            "import sys, time\n"
+            "sys.stdout.write('par'); sys.stdout.flush(); time.sleep(0.1)\n"
+            "sys.stdout.write('tial\\r\\nnext'); sys.stdout.flush()\n"
+        )
+        chunks: list[str] = []
+
+        def callback(stdout: str, _stderr: str) -> None:
+            chunks.append(stdout)
+
+        ret = subprocess_capture_output_live(_python(code), callback=callback)
+        # Partial lines are held back until completed, and the final
+        # unterminated line is flushed at EOF.
+        assert chunks == ["partial\n", "next"]
+        assert ret.stdout == "partial\nnext"
+
+    def test_delivered_immediately(self) -> None:
+        code = "import time; print('first', flush=True); time.sleep(2)"
+        arrival: list[float] = []
+
+        def callback(stdout: str, _stderr: str) -> None:
+            if stdout:
+                arrival.append(time.monotonic())
+
+        start = time.monotonic()
+        subprocess_capture_output_live(_python(code), callback=callback)
+        end = time.monotonic()
+        assert len(arrival) == 1
+        # Should arrive well before the process exits
+        assert arrival[0] - start < end - start - 1
+
+    def test_tail_lines(self) -> None:
+        lines: list[str] = []
+
+        def callback(stdout: str, _stderr: str) -> None:
+            lines.extend(stdout.splitlines())
+
+        ret = subprocess_capture_output_live(
+            _python("for i in range(1000): print(i)"),
+            callback=callback,
+            tail_lines=3,
+        )
+        assert lines == [str(i) for i in range(1000)]
+        assert ret.stdout == "997\n998\n999\n"
+
+    def test_error(self) -> None:
+        def callback(_stdout: str, _stderr: str) -> None:
+            pass
+
+        with pytest.raises(CommandError) as exc_info:
+            subprocess_capture_output_live(
+                _python("print('bad'); raise SystemExit(3)"),
+                callback=callback,
+                tail_lines=10,
+            )
+        assert exc_info.value.return_code == 3
+        assert exc_info.value.stdout == "bad\n"
+
+        ret = subprocess_capture_output_live(
+            _python("raise SystemExit(3)"), callback=callback, check=False
+        )
+        assert ret.returncode == 3
+
+    def test_usage_callback(self) -> None:
+        def callback(_stdout: str, _stderr: str) -> None:
+            pass
+
+        usages: list[ResourceUsage] = []
+        code = "import time; x = bytearray(32 << 20); time.sleep(0.5)"
+        ret = subprocess_capture_output_live(
+            _python(code), callback=callback, usage_callback=usages.append
+        )
+        assert ret.returncode == 0
+        (usage,) = usages
+        assert usage.wall >= 0.5
+        assert usage.user >= 0
+        assert usage.system >= 0
+        assert usage.max_rss >= 32 << 20
+
+    def test_usage_callback_error(self) -> None:
+        def callback(_stdout: str, _stderr: str) -> None:
+            pass
+
+        usages: list[ResourceUsage] = []
+        with pytest.raises(CommandError):
+            subprocess_capture_output_live(
+                _python("raise SystemExit(3)"),
+                callback=callback,
+                usage_callback=usages.append,
+            )
+        assert len(usages) == 1
+
 
 if __name__ == "__main__":
     sys.exit(pytest.main())
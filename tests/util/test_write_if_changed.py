@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES.
+#                         All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+from __future__ import annotations
+
+import os
+import sys
+import stat
+from typing import TYPE_CHECKING
+
+import pytest
+
+from aedifix.util.write_if_changed import write_if_changed
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+class TestWriteIfChanged:
+    def test_write(self, tmp_path: Path) -> None:
+        path = tmp_path / "foo.txt"
+        assert write_if_changed(path, "foo")
+        assert path.read_text() == "foo"
+        assert write_if_changed(path, "bar")
+        assert path.read_text() == "bar"
+        # No temporary files are left behind
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_unchanged(self, tmp_path: Path) -> None:
+        path = tmp_path / "foo.txt"
+        path.write_text("foo")
+        mtime = path.stat().st_mtime_ns - 10**9
+        os.utime(path, ns=(mtime, mtime))
+        assert not write_if_changed(path, "foo")
+        assert path.stat().st_mtime_ns == mtime
+
+    def test_replaced_atomically(self, tmp_path: Path) -> None:
+        path = tmp_path / "foo.txt"
+        path.write_text("foo")
+        # Readers holding the old file keep seeing its full content
+        with path.open() as fd:
+            assert write_if_changed(path, "bar")
+            assert fd.read() == "foo"
+        assert path.read_text() == "bar"
+
+    def test_permissions(self, tmp_path: Path) -> None:
+        path = tmp_path / "foo.sh"
+        path.write_text("foo")
+        path.chmod(0o750)
+        assert write_if_changed(path, "bar")
+        assert stat.S_IMODE(path.stat().st_mode) == 0o750
+
+        new_path = tmp_path / "bar.txt"
+        reference = tmp_path / "reference.txt"
+        reference.write_text("")
+        assert write_if_changed(new_path, "bar")
+        assert new_path.stat().st_mode == reference.stat().st_mode
+
+    def test_error(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            write_if_changed(tmp_path / "missing" / "foo.txt", "foo")
+        assert not list(tmp_path.iterdir())
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main())